@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Benchmark the per-redraw curve control updates, comparing the former widget tree searches with the PV controls
+registry kept by the Main Display.
+
+Run from the repository root, e.g.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_curve_controls_lookup.py
+"""
+
+import argparse
+import timeit
+
+from qtpy.QtWidgets import QCheckBox, QGroupBox, QLabel, QPushButton
+
+from pydm import PyDMApplication
+
+
+def find_child_update(display, curve):
+    """
+    The redraw handler as it was before the PV controls registry, looking up every widget by its object name.
+    """
+    pv_name = curve.address
+    min_y = curve.minY if curve.minY else 0
+    max_y = curve.maxY if curve.maxY else 0
+    current_y = curve.get_latest_y()
+
+    grb = display.findChild(QGroupBox, pv_name + "_grb")
+
+    lbl = grb.findChild(QLabel, pv_name + "_lbl")
+    lbl.setText("(yMin = {0:.3f}, yMax = {1:.3f}) y = {2:.3f}".format(
+        min_y, max_y, current_y))
+
+    chb = grb.findChild(QCheckBox, pv_name + "_chb")
+
+    connected = curve.connected
+    if connected and chb.isEnabled():
+        return
+
+    chb.setEnabled(connected)
+    btn_modify = grb.findChild(QPushButton, pv_name + "_btn_modify")
+    btn_modify.setEnabled(connected)
+    btn_focus = grb.findChild(QPushButton, pv_name + "_btn_focus")
+    btn_focus.setEnabled(connected)
+
+
+def run(curve_count, repeat):
+    from timechart.displays.main_display import TimeChartDisplay
+    from timechart.utilities.utils import random_color
+
+    display = TimeChartDisplay()
+    for i in range(curve_count):
+        display.add_y_channel(pv_name="loc://BENCH:{0}?type=float&init=0".format(i),
+                              curve_name="BENCH:{0}".format(i), color=random_color(curve_colors_only=True))
+    curves = list(display.channel_map.values())
+
+    def redraw_before():
+        for curve in curves:
+            find_child_update(display, curve)
+
+    def redraw_after():
+        for curve in curves:
+            display.refresh_curve_status(curve, display.pv_controls[curve.address])
+
+    before = min(timeit.repeat(redraw_before, number=1, repeat=repeat))
+    after = min(timeit.repeat(redraw_after, number=1, repeat=repeat))
+
+    for pv_name in list(display.channel_map):
+        display.remove_curve(pv_name)
+    display.deleteLater()
+
+    return before, after
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the curve control updates run on every chart redraw.")
+    parser.add_argument("--curves", type=int, nargs="*", default=[10, 100, 1000],
+                        help="The numbers of curves to benchmark with.")
+    parser.add_argument("--repeat", type=int, default=5, help="How many redraws to time, keeping the fastest.")
+    args = parser.parse_args()
+
+    app = PyDMApplication(hide_nav_bar=True, hide_menu_bar=True, hide_status_bar=True, use_main_window=False)
+
+    print("{0:>8} {1:>14} {2:>14} {3:>9}".format("curves", "findChild (ms)", "registry (ms)", "speedup"))
+    for curve_count in args.curves:
+        before, after = run(curve_count, args.repeat)
+        print("{0:>8} {1:>14.3f} {2:>14.3f} {3:>8.1f}x".format(curve_count, before * 1000, after * 1000,
+                                                                before / after))
+        app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Benchmark the time from creating the Main Display to its first paint, comparing the Data and Graph tabs built on
+first use with the tabs built along with the display, as they were before.
+
+Run from the repository root, e.g.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py
+
+The whole startup of the launcher, including the module imports, can be profiled with timechart --profile-startup.
+"""
+
+import argparse
+import time
+
+from pydm import PyDMApplication
+
+
+def time_to_first_paint(app, curve_count, build_tabs_eagerly):
+    from timechart.displays.main_display import TimeChartDisplay
+    from timechart.utilities.startup_profile import call_after_first_paint
+    from timechart.utilities.utils import random_color
+
+    painted = []
+    started_at = time.perf_counter()
+
+    display = TimeChartDisplay()
+    if build_tabs_eagerly:
+        display.build_settings_tabs()
+    for i in range(curve_count):
+        display.add_y_channel(pv_name="loc://BENCH:{0}?type=float&init=0".format(i),
+                              curve_name="BENCH:{0}".format(i), color=random_color(curve_colors_only=True))
+    call_after_first_paint(display, lambda: painted.append(time.perf_counter()))
+    display.show()
+    while not painted:
+        app.processEvents()
+
+    tabs_built = display._settings_tabs_built
+    for pv_name in list(display.channel_map):
+        display.remove_curve(pv_name)
+    display.close()
+    display.deleteLater()
+    app.processEvents()
+
+    return painted[0] - started_at, tabs_built
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the time from creating the display to its first paint.")
+    parser.add_argument("--curves", type=int, nargs="*", default=[0, 10],
+                        help="The numbers of curves to add before showing the display.")
+    parser.add_argument("--repeat", type=int, default=10, help="How many displays to time, keeping the fastest.")
+    args = parser.parse_args()
+
+    app = PyDMApplication(hide_nav_bar=True, hide_menu_bar=True, hide_status_bar=True, use_main_window=False)
+    # Warm up, so that the first timing doesn't include importing the modules, and creating the fonts and icons
+    time_to_first_paint(app, 0, True)
+
+    print("{0:>8} {1:>12} {2:>12} {3:>9}".format("curves", "eager (ms)", "lazy (ms)", "speedup"))
+    for curve_count in args.curves:
+        eager = min(time_to_first_paint(app, curve_count, True)[0] for _ in range(args.repeat))
+        lazy_timings = [time_to_first_paint(app, curve_count, False) for _ in range(args.repeat)]
+        lazy = min(timing for timing, _ in lazy_timings)
+        if any(tabs_built for _, tabs_built in lazy_timings):
+            print("The settings tabs were built before the first paint.")
+        print("{0:>8} {1:>12.1f} {2:>12.1f} {3:>8.2f}x".format(curve_count, eager * 1000, lazy * 1000, eager / lazy))
+
+
+if __name__ == "__main__":
+    main()
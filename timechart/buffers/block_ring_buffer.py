@@ -0,0 +1,295 @@
+"""
+A Circular Buffer Made of Fixed-Size Blocks
+"""
+
+from collections import deque
+
+import numpy as np
+
+from .ring_buffer import RingBuffer
+
+# The number of blocks a buffer is split into, unless the blocks would be smaller or larger than the bounds below
+BLOCK_COUNT = 16
+MIN_BLOCK_SIZE = 256
+MAX_BLOCK_SIZE = 65536
+
+
+def block_size(capacity):
+    """
+    Provide the number of samples of each block allocated for a buffer capacity.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of samples the buffer can hold
+
+    Returns
+    -------
+    int
+        The number of samples per block.
+    """
+    return min(max(-(-int(capacity) // BLOCK_COUNT), MIN_BLOCK_SIZE), MAX_BLOCK_SIZE)
+
+
+def max_allocated_samples(capacity):
+    """
+    Provide the largest number of samples the blocks of a full buffer can take, including the expired samples of the
+    oldest block and the unused samples of the newest block.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of samples the buffer can hold
+
+    Returns
+    -------
+    int
+        The number of samples allocated at most.
+    """
+    return int(capacity) + 2 * (block_size(capacity) - 1)
+
+
+class BlockRingBuffer(RingBuffer):
+    """
+    A ring buffer storing its samples in a deque of fixed-size blocks instead of a single preallocated array.
+
+    The blocks are only allocated as the samples arrive, and once the buffer is full, the block of the oldest samples
+    is reused for the newest samples. Changing the capacity never copies the samples: growing the buffer lets more
+    blocks be added, and shrinking it drops the blocks of the oldest samples. This keeps time span and sampling rate
+    changes cheap even for buffers of millions of samples, without briefly holding two copies of the data.
+
+    The samples are read through the segments of the blocks, gathered into a single array when copied out.
+    """
+    def __init__(self, capacity, dtype=float, rows=2, value_dtype=None):
+        """
+        Parameters
+        ----------
+        capacity : int
+            The maximum number of samples the buffer can hold.
+        dtype : numpy.dtype
+            The type of the stored timestamps, and of the values unless value_dtype is provided.
+        rows : int
+            The number of rows of each sample, including the timestamp row.
+        value_dtype : numpy.dtype, optional
+            The type of the stored values.
+        """
+        self._dtype = np.dtype(dtype)
+        self._value_dtype = np.dtype(value_dtype or dtype)
+        self._capacity = max(int(capacity), 1)
+        self._rows = rows
+        self._blocks = deque()
+        # The number of expired samples at the beginning of the oldest block, and of samples in the newest block
+        self._start = 0
+        self._fill = 0
+        self._count = 0
+        self._total_appended = 0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def nbytes(self):
+        """
+        The number of bytes allocated for the blocks.
+        """
+        return sum(timestamps.nbytes + values.nbytes for timestamps, values in self._blocks)
+
+    def _new_block(self):
+        size = block_size(self._capacity)
+        return self._allocate((size,), self._dtype), self._allocate((self._rows - 1, size), self._value_dtype)
+
+    def _drop_oldest(self, count):
+        """
+        Discard the oldest samples, releasing the blocks holding only discarded samples.
+
+        Returns
+        -------
+            A list of the released blocks.
+        """
+        count = min(count, self._count)
+        self._count -= count
+        self._start += count
+        released = []
+        # The newest block is kept, even once all its samples are discarded, as the next samples are written into it
+        while len(self._blocks) > 1 and self._start >= len(self._blocks[0][0]):
+            released.append(self._blocks.popleft())
+            self._start -= len(released[-1][0])
+        return released
+
+    def _reserve(self, spare_block=None):
+        """
+        Make room for one more sample in the newest block, expiring the oldest sample if the buffer is full, and
+        provide the index of the newest block to write at.
+
+        Parameters
+        ----------
+        spare_block : tuple, optional
+            A block released by the previous writes, to reuse if a new block is needed
+        """
+        expired = int(self._count == self._capacity)
+        if self._blocks and self._fill < len(self._blocks[-1][0]):
+            self._drop_oldest(expired)
+            return self._fill
+
+        oldest_block = self._blocks[0] if len(self._blocks) > 1 else None
+        if (expired and oldest_block is not None and self._start == len(oldest_block[0]) - 1 and
+                len(oldest_block[0]) == block_size(self._capacity)):
+            # The oldest block only holds the expiring sample, so it's reused for the newest samples
+            self._blocks.rotate(-1)
+            self._start = 0
+            self._count -= 1
+        else:
+            if spare_block is None or len(spare_block[0]) != block_size(self._capacity):
+                spare_block = self._new_block()
+            self._blocks.append(spare_block)
+            self._drop_oldest(expired)
+        self._fill = 0
+        return self._fill
+
+    def clear(self):
+        """
+        Discard all the samples, releasing the blocks.
+        """
+        self._blocks.clear()
+        self._start = 0
+        self._fill = 0
+        self._count = 0
+        self._total_appended = 0
+
+    def append(self, timestamp, value):
+        """
+        Write a new sample after the newest one, overwriting the oldest sample if the buffer is full.
+
+        Parameters
+        ----------
+        timestamp : float
+            The time the sample was recorded
+        value : float or sequence
+            The sample value, or a sequence of one value per row of values
+        """
+        index = self._reserve()
+        timestamps, values = self._blocks[-1]
+        timestamps[index] = timestamp
+        values[:, index] = value
+        self._fill += 1
+        self._count += 1
+        self._total_appended += 1
+
+    def extend(self, data):
+        """
+        Write several samples at once, overwriting the oldest samples if the buffer overflows.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            A (rows, N) array of samples in chronological order.
+        """
+        self._total_appended += data.shape[1]
+        data = data[:, -self._capacity:]
+        written = 0
+        spare_block = None
+        while written < data.shape[1]:
+            index = self._reserve(spare_block)
+            timestamps, values = self._blocks[-1]
+            count = min(len(timestamps) - index, data.shape[1] - written)
+            # Expire the oldest samples the rest of the chunk overwrites, as the first sample was expired already. The
+            # block released last is reused for the next chunk, if the chunk doesn't fit into the newest block.
+            released = self._drop_oldest(max(self._count + count - self._capacity, 0))
+            spare_block = released[-1] if released else None
+            timestamps[index:index + count] = data[0, written:written + count]
+            values[:, index:index + count] = data[1:, written:written + count]
+            self._fill += count
+            self._count += count
+            written += count
+
+    def resize(self, capacity):
+        """
+        Change the capacity of the buffer, keeping as many of the newest samples as fit, without copying any sample.
+
+        Parameters
+        ----------
+        capacity : int
+            The new maximum number of samples the buffer can hold.
+        """
+        self._capacity = max(int(capacity), 1)
+        self._drop_oldest(max(self._count - self._capacity, 0))
+
+    def load(self, data, total_appended=None):
+        """
+        Replace the buffer contents with the columns of a (rows, N) array, keeping the newest samples that fit.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The timestamps in the first row, and the values in the next rows, in chronological order.
+        total_appended : int, optional
+            The number of samples written since the buffer was last cleared, when moving the samples from another
+            buffer. The number of loaded samples by default.
+        """
+        self.clear()
+        self.extend(np.asarray(data))
+        if total_appended is not None:
+            self._total_appended = max(int(total_appended), self._count)
+
+    def truncate(self, count):
+        """
+        Keep only the newest samples.
+
+        Parameters
+        ----------
+        count : int
+            The number of the newest samples to keep. Nothing happens if the buffer holds fewer samples.
+        """
+        self._drop_oldest(max(self._count - max(int(count), 0), 0))
+
+    def first(self):
+        """
+        Provide the oldest sample in the buffer.
+
+        Returns
+        -------
+            A tuple of the timestamp and the values, or None if the buffer is empty.
+        """
+        if not self._count:
+            return None
+        timestamps, values = self._blocks[0]
+        return (timestamps[self._start],) + tuple(values[:, self._start])
+
+    def last(self):
+        """
+        Provide the newest sample in the buffer.
+
+        Returns
+        -------
+            A tuple of the timestamp and the values, or None if the buffer is empty.
+        """
+        if not self._count:
+            return None
+        timestamps, values = self._blocks[-1]
+        return (timestamps[self._fill - 1],) + tuple(values[:, self._fill - 1])
+
+    def segments(self):
+        """
+        Provide the buffer contents as contiguous views, without copying.
+
+        Returns
+        -------
+            A list of (timestamps, values) tuples of array views, one per block, which, concatenated in order, hold
+            the samples from the oldest to the newest. The timestamps are 1D arrays, and the values are (rows - 1, N)
+            arrays. The views are only valid until the next write into the buffer.
+        """
+        if not self._count:
+            return []
+
+        last_index = len(self._blocks) - 1
+        parts = []
+        for index, (timestamps, values) in enumerate(self._blocks):
+            start = self._start if index == 0 else 0
+            stop = self._fill if index == last_index else len(timestamps)
+            parts.append((timestamps[start:stop], values[:, start:stop]))
+        return parts
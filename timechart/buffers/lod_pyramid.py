@@ -0,0 +1,247 @@
+"""
+A Multi-Resolution History of Curve Data
+"""
+
+import numpy as np
+
+from .ring_buffer import RingBuffer
+from ..displays.defaults import LOD_MIN_BUCKET_SIZE
+from ..utilities.decimation import min_max_decimate
+
+# The timestamp, min, max, and mean value rows of each bucket
+LOD_ROWS = 4
+
+
+def level_layout(capacity):
+    """
+    Provide the layout of the levels of detail for a ring buffer.
+
+    Parameters
+    ----------
+    capacity : int
+        The capacity of the ring buffer holding the raw data.
+
+    Returns
+    -------
+        A list of (bucket size, number of buckets) tuples, one for each level, from the finest to the coarsest level.
+    """
+    layout = []
+    size = LOD_MIN_BUCKET_SIZE
+    while size <= capacity:
+        layout.append((size, capacity // size + 1))
+        size *= 2
+    return layout
+
+
+class LodPyramid(object):
+    """
+    Pre-aggregated levels of detail for the data of a ring buffer.
+
+    Each level is a ring buffer of buckets, with every bucket holding the timestamp of its first sample, and the min,
+    max, and mean values of the samples it aggregates. The finest level aggregates LOD_MIN_BUCKET_SIZE raw samples per
+    bucket, and every next level aggregates two buckets of the previous level, so that all the levels together take
+    less memory than the raw data.
+
+    The levels are built incrementally: only the buckets completed since the last update are aggregated, from the raw
+    samples for the finest level, and from the previous level for the coarser ones.
+    """
+    def __init__(self, capacity):
+        """
+        Parameters
+        ----------
+        capacity : int
+            The capacity of the ring buffer holding the raw data.
+        """
+        self._capacity = capacity
+        layout = level_layout(capacity)
+        self._bucket_sizes = [size for size, _ in layout]
+        self._levels = [RingBuffer(buckets, rows=LOD_ROWS) for _, buckets in layout]
+
+        # The sequence number of the next bucket to build, for each level
+        self._built = [0] * len(self._levels)
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def bucket_sizes(self):
+        return list(self._bucket_sizes)
+
+    @property
+    def nbytes(self):
+        """
+        The number of bytes allocated for all the levels.
+        """
+        return sum(level.nbytes for level in self._levels)
+
+    def level(self, index):
+        """
+        Provide a level of detail.
+
+        Parameters
+        ----------
+        index : int
+            The index of the level, 0 being the finest level.
+
+        Returns
+        -------
+        RingBuffer
+            The buckets of the level, with the timestamps, min, max, and mean values in rows.
+        """
+        return self._levels[index]
+
+    def resize(self, capacity):
+        """
+        Fit the levels to a new capacity of the raw ring buffer, keeping the newest buckets of the levels still needed.
+        The levels added for a larger capacity are built from the raw data at the next update.
+
+        Parameters
+        ----------
+        capacity : int
+            The new capacity of the ring buffer holding the raw data.
+        """
+        if capacity == self._capacity:
+            return
+
+        self._capacity = capacity
+        layout = level_layout(capacity)
+        del self._levels[len(layout):]
+        del self._built[len(layout):]
+        for level, (_, buckets) in zip(self._levels, layout):
+            level.resize(buckets)
+        for size, buckets in layout[len(self._levels):]:
+            self._levels.append(RingBuffer(buckets, rows=LOD_ROWS))
+            self._built.append(0)
+        self._bucket_sizes = [size for size, _ in layout]
+
+    def reset(self):
+        """
+        Discard all the buckets.
+        """
+        for level in self._levels:
+            level.clear()
+        self._built = [0] * len(self._levels)
+
+    def update(self, ring_buffer):
+        """
+        Aggregate the samples recorded into the raw ring buffer since the last update into new buckets, level by level.
+
+        Parameters
+        ----------
+        ring_buffer : RingBuffer
+            The ring buffer holding the raw (timestamp, value) samples.
+        """
+        source_total = ring_buffer.total_appended
+        source_count = len(ring_buffer)
+        factor = LOD_MIN_BUCKET_SIZE
+        source = ring_buffer
+
+        for index, level in enumerate(self._levels):
+            self._update_level(index, source, source_total, source_count, factor)
+
+            source = level
+            source_total = self._built[index]
+            source_count = len(level)
+            factor = 2
+
+    def _update_level(self, index, source, source_total, source_count, factor):
+        """
+        Build the buckets of a level from the entries of its source, i.e. the raw samples or the previous level.
+
+        Parameters
+        ----------
+        index : int
+            The index of the level to update
+        source : RingBuffer
+            The raw ring buffer, or the previous level
+        source_total : int
+            The sequence number of the next entry to be written into the source
+        source_count : int
+            The number of entries the source currently holds
+        factor : int
+            The number of source entries aggregated into each bucket
+        """
+        level = self._levels[index]
+        built = self._built[index]
+        oldest = source_total - source_count
+
+        if built * factor > source_total or built * factor < oldest:
+            # The source was cleared, or overwritten past the buckets built so far, so start again from the oldest
+            # complete bucket still available
+            level.clear()
+            built = -(-oldest // factor)
+
+        new_buckets = source_total // factor - built
+        if new_buckets > 0:
+            entries = source.newest(source_total - built * factor)[:, :new_buckets * factor]
+            entries = entries.reshape(entries.shape[0], new_buckets, factor)
+
+            buckets = np.empty((LOD_ROWS, new_buckets), dtype=float)
+            buckets[0] = entries[0, :, 0]
+            if index:
+                # Aggregate the buckets of the previous level
+                buckets[1] = np.fmin.reduce(entries[1], axis=1)
+                buckets[2] = np.fmax.reduce(entries[2], axis=1)
+                buckets[3] = entries[3].mean(axis=1)
+            else:
+                # Aggregate the raw samples
+                buckets[1] = np.fmin.reduce(entries[1], axis=1)
+                buckets[2] = np.fmax.reduce(entries[1], axis=1)
+                buckets[3] = entries[1].mean(axis=1)
+            level.extend(buckets)
+            built += new_buckets
+
+        self._built[index] = built
+
+    def render(self, ring_buffer, x_min, x_max, columns):
+        """
+        Provide the data to draw for a time range from the coarsest level still having at least one bucket per pixel
+        column, as the min and max values of each bucket. The raw samples not aggregated into a bucket of that level yet
+        are decimated and appended.
+
+        Parameters
+        ----------
+        ring_buffer : RingBuffer
+            The ring buffer holding the raw (timestamp, value) samples.
+        x_min : float
+            The timestamp at the left edge of the displayed range
+        x_max : float
+            The timestamp at the right edge of the displayed range
+        columns : int
+            The number of pixel columns the displayed range spans
+
+        Returns
+        -------
+            A tuple of the x-values and y-values to draw, or None if even the finest level has fewer buckets than pixel
+            columns within the time range, or if there is no pixel column to draw, in which case the raw data should be
+            drawn instead.
+        """
+        columns = int(columns)
+        if columns < 1:
+            return None
+        self.update(ring_buffer)
+
+        count = ring_buffer.count_between(x_min, x_max)
+        index = None
+        for i, size in enumerate(self._bucket_sizes):
+            if count // size < columns:
+                break
+            index = i
+        if index is None or not len(self._levels[index]):
+            return None
+
+        buckets = self._levels[index].between(x_min, x_max)
+        x = np.repeat(buckets[0], 2)
+        y = np.empty_like(x)
+        y[0::2] = buckets[1]
+        y[1::2] = buckets[2]
+
+        tail = ring_buffer.newest(ring_buffer.total_appended - self._built[index] * self._bucket_sizes[index])
+        if tail.shape[1] and tail[0, 0] <= x_max:
+            tail_x, tail_y = min_max_decimate(tail[0], tail[1], tail[0, 0], tail[0, -1],
+                                              columns * tail.shape[1] // max(count, 1) + 1)
+            x = np.concatenate((x, tail_x))
+            y = np.concatenate((y, tail_y))
+
+        return x, y
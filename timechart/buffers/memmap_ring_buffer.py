@@ -0,0 +1,88 @@
+"""
+A Disk-Backed Circular Buffer for Curve Data
+"""
+
+import logging
+import os
+import re
+import tempfile
+
+import numpy as np
+
+from .ring_buffer import RingBuffer
+
+logger = logging.getLogger(__name__)
+
+
+class MemmapRingBuffer(RingBuffer):
+    """
+    A ring buffer storing its samples in memory-mapped files instead of the process memory.
+
+    The operating system keeps the recently written and read pages of the files in memory, and writes the others back
+    to disk, so that a buffer much larger than the available memory can be kept. The segments and other views provided
+    by the buffer are slices of the mapped files, without any copy.
+
+    The timestamps and the values are mapped from two files created in a cache directory, and removed when the buffer
+    is closed. Where the platform allows it, each file is unlinked right after it is mapped, so that no file is left
+    behind if the application exits abruptly.
+    """
+    def __init__(self, capacity, cache_dir, name="curve", dtype=float, rows=2, value_dtype=None):
+        """
+        Parameters
+        ----------
+        capacity : int
+            The maximum number of samples the buffer can hold.
+        cache_dir : str
+            The directory to create the memory-mapped files in. The directory is created if it doesn't exist.
+        name : str
+            A name to include in the file name, e.g. the name of the PV recorded into the buffer.
+        dtype : numpy.dtype
+            The type of the stored timestamps, and of the values unless value_dtype is provided.
+        rows : int
+            The number of rows of each sample, including the timestamp row.
+        value_dtype : numpy.dtype, optional
+            The type of the stored values.
+        """
+        self._cache_dir = cache_dir
+        self._name = re.sub(r"[^\w.-]+", "_", name)[:64]
+        self._file_paths = []
+        super(MemmapRingBuffer, self).__init__(capacity, dtype=dtype, rows=rows, value_dtype=value_dtype)
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir
+
+    def _allocate(self, shape, dtype):
+        if not np.prod(shape):
+            # An empty file cannot be mapped
+            return np.zeros(shape, dtype=dtype)
+        if not os.path.isdir(self._cache_dir):
+            os.makedirs(self._cache_dir)
+
+        fd, file_path = tempfile.mkstemp(prefix=self._name + "_", suffix=".ring", dir=self._cache_dir)
+        os.close(fd)
+        data = np.memmap(file_path, dtype=dtype, mode="w+", shape=shape)
+
+        try:
+            os.remove(file_path)
+        except OSError:
+            # The file is still in use on this platform, so remove it once the buffer is closed
+            self._file_paths.append(file_path)
+        return data
+
+    def close(self):
+        """
+        Drop the mapping of the buffer files, and remove the files still in the cache directory. The files are only
+        unmapped once no view of the buffer is referenced anymore.
+        """
+        self._timestamps = np.zeros(0, dtype=self._dtype)
+        self._values = np.zeros((self._values.shape[0], 0), dtype=self._value_dtype)
+        self._head = 0
+        self._count = 0
+
+        for file_path in self._file_paths:
+            try:
+                os.remove(file_path)
+            except OSError as error:
+                logger.warning("Cannot remove the ring buffer file '{0}'. Exception: {1}".format(file_path, error))
+        self._file_paths = []
@@ -0,0 +1,159 @@
+"""
+Memory Accounting and Limits for the Curve Buffers
+"""
+
+import numpy as np
+
+from .block_ring_buffer import max_allocated_samples
+from .lod_pyramid import LOD_ROWS, level_layout
+
+
+def estimate_curve_nbytes(capacity, with_lod=False, dtype=float, value_dtype=None):
+    """
+    Estimate the number of bytes a curve allocates for its buffers. The ring buffers kept in memory being made of
+    blocks, the estimate covers the most blocks a full ring buffer can allocate.
+
+    Parameters
+    ----------
+    capacity : int
+        The ring buffer size of the curve
+    with_lod : bool
+        True if the curve also keeps levels of detail, i.e. in the min/max decimation render mode; False if not
+    dtype : numpy.dtype
+        The type of the buffered timestamps, and of the values unless value_dtype is provided
+    value_dtype : numpy.dtype, optional
+        The type of the buffered values
+
+    Returns
+    -------
+    int
+        The number of bytes of the ring buffer, and of the levels of detail if any.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    nbytes = max_allocated_samples(capacity) * (itemsize + np.dtype(value_dtype or dtype).itemsize)
+    if with_lod:
+        nbytes += sum(LOD_ROWS * buckets * itemsize for _, buckets in level_layout(capacity))
+    return nbytes
+
+
+def estimate_shared_nbytes(capacity, curve_count, with_lod=False, dtype=float, value_dtype=None, allocated_rows=None):
+    """
+    Estimate the number of bytes several curves allocate for their buffers when sharing a single row of timestamps.
+
+    Parameters
+    ----------
+    capacity : int
+        The ring buffer size of the curves
+    curve_count : int
+        The number of curves sharing the timestamps
+    with_lod : bool
+        True if the curves also keep levels of detail, i.e. in the min/max decimation render mode; False if not
+    dtype : numpy.dtype
+        The type of the buffered timestamps, and of the values unless value_dtype is provided
+    value_dtype : numpy.dtype, optional
+        The type of the buffered values
+    allocated_rows : int, optional
+        The number of rows of values allocated for the curves, including the free rows. One row per curve by default.
+
+    Returns
+    -------
+    int
+        The number of bytes of the shared ring buffer, and of the levels of detail of the curves if any.
+    """
+    if curve_count < 1:
+        return 0
+
+    # Each row takes the same bytes as the values of a ring buffer of its own, the timestamps being stored once
+    samples = max_allocated_samples(capacity)
+    nbytes = samples * (np.dtype(dtype).itemsize + max(allocated_rows or 0, curve_count) *
+                        np.dtype(value_dtype or dtype).itemsize)
+    if with_lod:
+        nbytes += curve_count * (estimate_curve_nbytes(capacity, True, dtype, value_dtype) -
+                                 estimate_curve_nbytes(capacity, False, dtype, value_dtype))
+    return nbytes
+
+
+class MemoryBudget(object):
+    """
+    A ceiling on the memory taken by the buffers of all the curves of a chart.
+    """
+    def __init__(self, limit_bytes=0):
+        """
+        Parameters
+        ----------
+        limit_bytes : int
+            The maximum number of bytes for all the curve buffers together, or 0 for no limit.
+        """
+        self._limit_bytes = int(limit_bytes)
+
+    @property
+    def limit_bytes(self):
+        return self._limit_bytes
+
+    @limit_bytes.setter
+    def limit_bytes(self, limit_bytes):
+        self._limit_bytes = max(int(limit_bytes), 0)
+
+    @property
+    def is_limited(self):
+        return self._limit_bytes > 0
+
+    def fits(self, nbytes):
+        """
+        Check whether a number of bytes is within the budget.
+
+        Parameters
+        ----------
+        nbytes : int
+            The number of bytes to check
+
+        Returns
+        -------
+        bool
+            True if the budget is unlimited, or not exceeded by the number of bytes; False otherwise.
+        """
+        return not self.is_limited or nbytes <= self._limit_bytes
+
+    def max_buffer_size(self, curve_count, with_lod=False, dtype=float, reserved_bytes=0, value_dtype=None,
+                        shared_curve_count=0, shared_allocated_rows=None):
+        """
+        Find the largest ring buffer size the curves can have without exceeding the budget, once some of the budget is
+        reserved, e.g. by the curves having their own buffer size.
+
+        Parameters
+        ----------
+        curve_count : int
+            The number of curves sharing the budget with their own ring buffer
+        with_lod : bool
+            True if the curves also keep levels of detail; False if not
+        dtype : numpy.dtype
+            The type of the buffered timestamps, and of the values unless value_dtype is provided
+        reserved_bytes : int
+            The number of bytes of the budget not available to the curves
+        value_dtype : numpy.dtype, optional
+            The type of the buffered values
+        shared_curve_count : int
+            The number of curves sharing the budget, and a single row of timestamps
+        shared_allocated_rows : int, optional
+            The number of rows of values allocated for the curves sharing the timestamps, including the free rows
+
+        Returns
+        -------
+        int
+            The largest buffer size within the budget, or None if the budget is unlimited or there is no curve.
+        """
+        if not self.is_limited or curve_count + shared_curve_count < 1:
+            return None
+
+        # The buffer footprint only grows with the buffer size, so search for the largest size that fits
+        available_bytes = max(self._limit_bytes - reserved_bytes, 0)
+        low, high = 0, available_bytes // (np.dtype(value_dtype or dtype).itemsize * (curve_count + shared_curve_count))
+        while low < high:
+            middle = (low + high + 1) // 2
+            nbytes = curve_count * estimate_curve_nbytes(middle, with_lod, dtype, value_dtype) + \
+                estimate_shared_nbytes(middle, shared_curve_count, with_lod, dtype, value_dtype, shared_allocated_rows)
+            if nbytes <= available_bytes:
+                low = middle
+            else:
+                high = middle - 1
+        return low
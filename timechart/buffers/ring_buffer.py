@@ -0,0 +1,390 @@
+"""
+A Fixed-Capacity Circular Buffer for Curve Data
+"""
+
+import numpy as np
+
+
+class ReadOnlyRingBufferError(TypeError):
+    """
+    Raised when writing into, or resizing, a ring buffer whose samples are written by someone else, e.g. a row of a
+    shared ring buffer, or the ring buffer of the collector process.
+    """
+    pass
+
+
+class RingBuffer(object):
+    """
+    A circular buffer holding (timestamp, value) pairs.
+
+    The timestamps and the values are stored in preallocated arrays, so that the values can be kept in a more compact
+    type than the timestamps, e.g. float32 values for the readbacks of 16-bit ADCs. A head pointer marks the next
+    column to write, so appending a sample is O(1) regardless of the buffer capacity. Once the buffer is full, each new
+    sample overwrites the oldest one.
+
+    More rows of values can be requested for records carrying several values per timestamp. The samples copied out of
+    the buffer are provided as (rows, N) arrays, with the timestamps in the first row and the values in the next rows,
+    all converted to the timestamps' type.
+    """
+    # True for the views of samples written by someone else, which raise a ReadOnlyRingBufferError on any write
+    read_only = False
+
+    def __init__(self, capacity, dtype=float, rows=2, value_dtype=None):
+        """
+        Parameters
+        ----------
+        capacity : int
+            The maximum number of samples the buffer can hold.
+        dtype : numpy.dtype
+            The type of the stored timestamps, and of the values unless value_dtype is provided.
+        rows : int
+            The number of rows of each sample, including the timestamp row.
+        value_dtype : numpy.dtype, optional
+            The type of the stored values.
+        """
+        self._dtype = np.dtype(dtype)
+        self._value_dtype = np.dtype(value_dtype or dtype)
+        capacity = max(int(capacity), 1)
+        self._timestamps = self._allocate((capacity,), self._dtype)
+        self._values = self._allocate((rows - 1, capacity), self._value_dtype)
+        self._head = 0
+        self._count = 0
+        self._total_appended = 0
+
+    def __len__(self):
+        return self._count
+
+    def _allocate(self, shape, dtype):
+        """
+        Allocate the storage of the timestamps or the values.
+
+        Parameters
+        ----------
+        shape : tuple
+            The shape of the array to allocate
+        dtype : numpy.dtype
+            The type of the array to allocate
+
+        Returns
+        -------
+            A zero-filled array.
+        """
+        return np.zeros(shape, dtype=dtype)
+
+    def close(self):
+        """
+        Release any resource held by the buffer storage, besides the memory. The buffer must not be used afterwards.
+        """
+        pass
+
+    @property
+    def capacity(self):
+        return self._timestamps.shape[0]
+
+    @property
+    def rows(self):
+        return self._values.shape[0] + 1
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def value_dtype(self):
+        return self._value_dtype
+
+    @property
+    def nbytes(self):
+        """
+        The number of bytes allocated for the samples, whether or not they hold any sample yet.
+        """
+        return self._timestamps.nbytes + self._values.nbytes
+
+    @property
+    def total_appended(self):
+        """
+        The number of samples written into the buffer since it was last cleared, including the samples that have
+        since been overwritten.
+        """
+        return self._total_appended
+
+    def clear(self):
+        """
+        Discard all the samples, keeping the allocated storage.
+        """
+        self._head = 0
+        self._count = 0
+        self._total_appended = 0
+
+    def append(self, timestamp, value):
+        """
+        Write a new sample at the head of the buffer, overwriting the oldest sample if the buffer is full.
+
+        Parameters
+        ----------
+        timestamp : float
+            The time the sample was recorded
+        value : float or sequence
+            The sample value, or a sequence of one value per row of values
+        """
+        head = self._head
+        self._timestamps[head] = timestamp
+        self._values[:, head] = value
+
+        head += 1
+        self._head = 0 if head == self._timestamps.shape[0] else head
+        if self._count < self._timestamps.shape[0]:
+            self._count += 1
+        self._total_appended += 1
+
+    def extend(self, data):
+        """
+        Write several samples at once, overwriting the oldest samples if the buffer overflows.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            A (rows, N) array of samples in chronological order.
+        """
+        count = data.shape[1]
+        capacity = self.capacity
+        self._total_appended += count
+        if count >= capacity:
+            self._timestamps[:] = data[0, -capacity:]
+            self._values[:] = data[1:, -capacity:]
+            self._head = 0
+            self._count = capacity
+            return
+
+        head = self._head
+        first_part = min(count, capacity - head)
+        self._timestamps[head:head + first_part] = data[0, :first_part]
+        self._values[:, head:head + first_part] = data[1:, :first_part]
+        self._timestamps[:count - first_part] = data[0, first_part:]
+        self._values[:, :count - first_part] = data[1:, first_part:]
+        self._head = (head + count) % capacity
+        self._count = min(self._count + count, capacity)
+
+    def resize(self, capacity):
+        """
+        Reallocate the buffer to a new capacity, keeping as many of the newest samples as fit.
+
+        Parameters
+        ----------
+        capacity : int
+            The new maximum number of samples the buffer can hold.
+        """
+        capacity = max(int(capacity), 1)
+        if capacity == self.capacity:
+            return
+
+        rows = self.rows
+        data = self.unrolled()[:, -capacity:]
+        self.close()
+        self._timestamps = self._allocate((capacity,), self._dtype)
+        self._values = self._allocate((rows - 1, capacity), self._value_dtype)
+        self._count = data.shape[1]
+        self._timestamps[:self._count] = data[0]
+        self._values[:, :self._count] = data[1:]
+        self._head = self._count % capacity
+
+    def load(self, data, total_appended=None):
+        """
+        Replace the buffer contents with the columns of a (rows, N) array, keeping the newest samples that fit.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The timestamps in the first row, and the values in the next rows, in chronological order.
+        total_appended : int, optional
+            The number of samples written since the buffer was last cleared, when moving the samples from another
+            buffer. The number of loaded samples by default.
+        """
+        data = np.asarray(data)[:, -self.capacity:]
+        self._count = data.shape[1]
+        self._timestamps[:self._count] = data[0]
+        self._values[:, :self._count] = data[1:]
+        self._head = self._count % self.capacity
+        self._total_appended = self._count if total_appended is None else max(int(total_appended), self._count)
+
+    def truncate(self, count):
+        """
+        Keep only the newest samples.
+
+        Parameters
+        ----------
+        count : int
+            The number of the newest samples to keep. Nothing happens if the buffer holds fewer samples.
+        """
+        self._count = max(min(int(count), self._count), 0)
+
+    def _sample(self, index):
+        return (self._timestamps[index],) + tuple(self._values[:, index])
+
+    def first(self):
+        """
+        Provide the oldest sample in the buffer.
+
+        Returns
+        -------
+            A tuple of the timestamp and the values, or None if the buffer is empty.
+        """
+        if not self._count:
+            return None
+        return self._sample((self._head - self._count) % self.capacity)
+
+    def last(self):
+        """
+        Provide the newest sample in the buffer.
+
+        Returns
+        -------
+            A tuple of the timestamp and the values, or None if the buffer is empty.
+        """
+        if not self._count:
+            return None
+        return self._sample(self._head - 1)
+
+    def _slices(self, count=None):
+        """
+        Provide the index ranges of the newest samples, in chronological order.
+
+        Parameters
+        ----------
+        count : int, optional
+            The number of the newest samples. All the samples by default.
+
+        Returns
+        -------
+            A list of one or two slices.
+        """
+        count = self._count if count is None else max(min(int(count), self._count), 0)
+        start = (self._head - count) % self.capacity
+        if start + count <= self.capacity:
+            return [slice(start, start + count)]
+        return [slice(start, self.capacity), slice(0, self._head)]
+
+    def segments(self):
+        """
+        Provide the buffer contents as contiguous views, without copying.
+
+        Returns
+        -------
+            A list of one or two (timestamps, values) tuples of array views which, concatenated in order, hold the
+            samples from the oldest to the newest. The timestamps are 1D arrays, and the values are (rows - 1, N)
+            arrays. The views are only valid until the next write into the buffer.
+        """
+        return [(self._timestamps[part], self._values[:, part]) for part in self._slices()]
+
+    def columns(self, start, stop):
+        """
+        Provide views of a range of samples, without copying.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first sample of the range, 0 being the oldest sample in the buffer
+        stop : int
+            The index after the last sample of the range
+
+        Returns
+        -------
+            A list of (timestamps, values) tuples of array views, holding the samples of the range in chronological
+            order.
+        """
+        parts = []
+        offset = 0
+        for timestamps, values in self.segments():
+            if offset >= stop:
+                break
+            first = max(start - offset, 0)
+            last = min(stop - offset, len(timestamps))
+            if first < last:
+                parts.append((timestamps[first:last], values[:, first:last]))
+            offset += len(timestamps)
+        return parts
+
+    def _search(self, timestamp, side="left"):
+        """
+        Find the index a timestamp would be inserted at to keep the samples in chronological order, as numpy's
+        searchsorted, across all the segments.
+        """
+        return int(sum(np.searchsorted(timestamps, timestamp, side=side) for timestamps, _ in self.segments()))
+
+    def _gather(self, parts):
+        """
+        Copy the samples of several (timestamps, values) views into a single (rows, N) array of the timestamps' type.
+        """
+        count = sum(len(timestamps) for timestamps, _ in parts)
+        data = np.empty((self.rows, count), dtype=self._dtype)
+        start = 0
+        for timestamps, values in parts:
+            data[0, start:start + len(timestamps)] = timestamps
+            data[1:, start:start + len(timestamps)] = values
+            start += len(timestamps)
+        return data
+
+    def count_between(self, start_time, end_time):
+        """
+        Count the samples recorded between two timestamps, without copying any data.
+
+        Parameters
+        ----------
+        start_time : float
+            The beginning of the time range
+        end_time : float
+            The end of the time range
+
+        Returns
+        -------
+        int
+            The number of samples within the time range.
+        """
+        return self._search(end_time, side="right") - self._search(start_time)
+
+    def between(self, start_time, end_time):
+        """
+        Copy the samples recorded between two timestamps, in chronological order. The closest sample before and after
+        the time range are included as well, so that a curve drawn from the copied samples reaches the edges of the
+        time range.
+
+        Parameters
+        ----------
+        start_time : float
+            The beginning of the time range
+        end_time : float
+            The end of the time range
+
+        Returns
+        -------
+            A (rows, N) array, with N being the number of samples copied.
+        """
+        first = max(self._search(start_time) - 1, 0)
+        last = min(self._search(end_time, side="right") + 1, len(self))
+        return self._gather(self.columns(first, last))
+
+    def newest(self, count):
+        """
+        Copy the newest samples, in chronological order.
+
+        Parameters
+        ----------
+        count : int
+            The number of samples to copy. All the samples are copied if the buffer holds fewer samples.
+
+        Returns
+        -------
+            A (rows, N) array, with N being the number of samples copied.
+        """
+        count = max(min(int(count), len(self)), 0)
+        return self._gather(self.columns(len(self) - count, len(self)))
+
+    def unrolled(self):
+        """
+        Copy the buffer contents into a new array, in chronological order.
+
+        Returns
+        -------
+            A (rows, N) array, with N being the number of samples in the buffer.
+        """
+        return self._gather(self.segments())
@@ -0,0 +1,359 @@
+"""
+A Circular Buffer in Shared Memory, Written by One Process and Read by Others
+"""
+
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .ring_buffer import ReadOnlyRingBufferError, RingBuffer
+
+# The layout of the header preceding the timestamps and the values in the shared memory block, as int64 fields
+HEADER_VERSION = 1
+(_VERSION, _CAPACITY, _ROWS, _VALUE_ITEMSIZE, _SEQUENCE, _HEAD, _COUNT, _TOTAL_APPENDED, _RESERVED_TOTAL,
+ _CONNECTED) = range(10)
+HEADER_FIELDS = 10
+
+
+def _map_arrays(buffer, capacity, rows, value_dtype):
+    """
+    Provide the header, the timestamps, and the values of a shared memory block as arrays.
+    """
+    header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=buffer)
+    offset = header.nbytes
+    timestamps = np.ndarray((capacity,), dtype=float, buffer=buffer, offset=offset)
+    offset += timestamps.nbytes
+    values = np.ndarray((rows - 1, capacity), dtype=value_dtype, buffer=buffer, offset=offset)
+    return header, timestamps, values
+
+
+class SharedMemoryRingBuffer(RingBuffer):
+    """
+    A ring buffer kept in a named shared memory block, e.g. a POSIX shared memory object, so that other processes can
+    read its samples without any copy through a SharedMemoryRingBufferView.
+
+    The buffer is written by a single process, which owns the shared memory block and removes it when the buffer is
+    closed. The position of the samples is kept in a header at the beginning of the block, updated under a sequence
+    counter, so that the readers can take a consistent snapshot of it while the samples are being written. The capacity
+    of the buffer is fixed, as the readers map the block once.
+    """
+    def __init__(self, capacity, name=None, rows=2, value_dtype=None):
+        """
+        Parameters
+        ----------
+        capacity : int
+            The maximum number of samples the buffer can hold.
+        name : str, optional
+            The name of the shared memory block to create. A unique name is generated if not provided.
+        rows : int
+            The number of rows of each sample, including the timestamp row.
+        value_dtype : numpy.dtype, optional
+            The type of the stored values. The timestamps are always stored as float64.
+        """
+        self._dtype = np.dtype(float)
+        self._value_dtype = np.dtype(value_dtype or float)
+        capacity = max(int(capacity), 1)
+        size = HEADER_FIELDS * 8 + capacity * (self._dtype.itemsize + (rows - 1) * self._value_dtype.itemsize)
+
+        self._shared_memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._header, self._timestamps, self._values = _map_arrays(self._shared_memory.buf, capacity, rows,
+                                                                   self._value_dtype)
+        self._header[:] = 0
+        self._header[_VERSION] = HEADER_VERSION
+        self._header[_CAPACITY] = capacity
+        self._header[_ROWS] = rows
+        self._header[_VALUE_ITEMSIZE] = self._value_dtype.itemsize
+        self._writing = 0
+
+    @property
+    def name(self):
+        """
+        The name the readers attach to the shared memory block with.
+        """
+        return self._shared_memory.name
+
+    @property
+    def _head(self):
+        return int(self._header[_HEAD])
+
+    @_head.setter
+    def _head(self, head):
+        self._header[_HEAD] = head
+
+    @property
+    def _count(self):
+        return int(self._header[_COUNT])
+
+    @_count.setter
+    def _count(self, count):
+        self._header[_COUNT] = count
+
+    @property
+    def _total_appended(self):
+        return int(self._header[_TOTAL_APPENDED])
+
+    @_total_appended.setter
+    def _total_appended(self, total_appended):
+        self._header[_TOTAL_APPENDED] = total_appended
+
+    @contextmanager
+    def _write(self, count=0):
+        """
+        Mark the header as being updated while writing samples, with an odd sequence number.
+
+        Parameters
+        ----------
+        count : int
+            The number of samples about to be written, which may overwrite as many of the oldest samples
+        """
+        if not self._writing:
+            self._header[_RESERVED_TOTAL] = self._total_appended + count
+            self._header[_SEQUENCE] += 1
+        self._writing += 1
+        try:
+            yield
+        finally:
+            self._writing -= 1
+            if not self._writing:
+                self._header[_SEQUENCE] += 1
+                self._header[_RESERVED_TOTAL] = self._total_appended
+
+    def set_connected(self, connected):
+        """
+        Publish the connection state of the channel recorded into the buffer.
+
+        Parameters
+        ----------
+        connected : bool
+            True if the channel is connected; False otherwise.
+        """
+        self._header[_CONNECTED] = int(bool(connected))
+
+    def clear(self):
+        with self._write():
+            super(SharedMemoryRingBuffer, self).clear()
+
+    def append(self, timestamp, value):
+        with self._write(1):
+            super(SharedMemoryRingBuffer, self).append(timestamp, value)
+
+    def extend(self, data):
+        with self._write(data.shape[1]):
+            super(SharedMemoryRingBuffer, self).extend(data)
+
+    def load(self, data, total_appended=None):
+        with self._write(np.shape(data)[1]):
+            super(SharedMemoryRingBuffer, self).load(data, total_appended)
+
+    def truncate(self, count):
+        with self._write():
+            super(SharedMemoryRingBuffer, self).truncate(count)
+
+    def resize(self, capacity):
+        if max(int(capacity), 1) != self.capacity:
+            raise ReadOnlyRingBufferError("The capacity of a shared memory ring buffer is fixed, as its readers map "
+                                          "it once.")
+
+    def close(self):
+        """
+        Remove the shared memory block. The readers still attached keep their mapping until they close their view.
+        """
+        if self._shared_memory is None:
+            return
+
+        self._header = self._timestamps = self._values = None
+        self._shared_memory.close()
+        self._shared_memory.unlink()
+        self._shared_memory = None
+
+
+class SharedMemoryRingBufferView(RingBuffer):
+    """
+    A read-only view of a SharedMemoryRingBuffer written by another process.
+
+    Each read takes a snapshot of the position of the samples, and only reads the samples of that snapshot. As the
+    writer keeps going meanwhile, the oldest samples of the snapshot may be overwritten while being copied, so these
+    samples are left out of the copies. Clearing the view only hides the samples written so far, as it doesn't own the
+    samples. Any write, or any change of the capacity, is refused with a ReadOnlyRingBufferError.
+    """
+    read_only = True
+
+    def __init__(self, name):
+        """
+        Parameters
+        ----------
+        name : str
+            The name of the shared memory block of the buffer
+
+        Raises
+        ------
+        FileNotFoundError
+            If there is no shared memory block with this name.
+        ValueError
+            If the shared memory block doesn't hold a ring buffer of a supported version.
+        """
+        self._shared_memory = shared_memory.SharedMemory(name=name)
+        try:
+            # The block is removed by its writer, not when this process exits
+            resource_tracker.unregister(self._shared_memory._name, "shared_memory")
+        except (AttributeError, KeyError):
+            pass
+
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=self._shared_memory.buf)
+        if header[_VERSION] != HEADER_VERSION:
+            self._shared_memory.close()
+            raise ValueError("The shared memory block '{0}' doesn't hold a ring buffer of version {1}."
+                             .format(name, HEADER_VERSION))
+
+        self._dtype = np.dtype(float)
+        self._value_dtype = np.dtype(np.float32 if header[_VALUE_ITEMSIZE] == 4 else np.float64)
+        self._header, self._timestamps, self._values = _map_arrays(
+            self._shared_memory.buf, int(header[_CAPACITY]), int(header[_ROWS]), self._value_dtype)
+        self._timestamps.flags.writeable = False
+        self._values.flags.writeable = False
+
+        # The number of samples written before the view was last cleared
+        self._start = 0
+        self._snapshot = None
+        self._frozen = False
+
+    @property
+    def name(self):
+        return self._shared_memory.name
+
+    @property
+    def connected(self):
+        """
+        The connection state of the channel recorded into the buffer, as published by the writer.
+        """
+        return bool(self._header[_CONNECTED])
+
+    def _take_snapshot(self):
+        """
+        Read the position of the samples while the writer isn't updating it.
+
+        Returns
+        -------
+            A tuple of the head, the number of samples, and the number of samples written.
+        """
+        while True:
+            sequence = self._header[_SEQUENCE]
+            if sequence % 2 == 0:
+                snapshot = (int(self._header[_HEAD]), int(self._header[_COUNT]), int(self._header[_TOTAL_APPENDED]))
+                if self._header[_SEQUENCE] == sequence:
+                    return snapshot
+
+    def _current(self):
+        if not self._frozen:
+            self._snapshot = self._take_snapshot()
+        return self._snapshot
+
+    @contextmanager
+    def _frozen_snapshot(self):
+        """
+        Keep reading the same snapshot until the end of a read, refreshing it first unless it's already kept.
+        """
+        if self._frozen:
+            yield
+            return
+
+        self._snapshot = self._take_snapshot()
+        self._frozen = True
+        try:
+            yield
+        finally:
+            self._frozen = False
+
+    @property
+    def _head(self):
+        return self._current()[0]
+
+    @property
+    def _count(self):
+        _, count, total_appended = self._current()
+        if total_appended < self._start:
+            # The writer was cleared
+            self._start = 0
+        return max(min(count, total_appended - self._start), 0)
+
+    @property
+    def _total_appended(self):
+        return max(self._current()[2] - self._start, 0)
+
+    def clear(self):
+        self._start = self._take_snapshot()[2]
+
+    def truncate(self, count):
+        self._start = max(self._start, self._take_snapshot()[2] - max(int(count), 0))
+
+    def resize(self, capacity):
+        # The capacity is set by the writer
+        if max(int(capacity), 1) != self.capacity:
+            raise ReadOnlyRingBufferError("The capacity of a shared memory ring buffer is set by its writer.")
+
+    def _read_only(self, *args, **kwargs):
+        raise ReadOnlyRingBufferError("The samples of a shared memory ring buffer are written by another process.")
+
+    append = extend = load = _read_only
+
+    def close(self):
+        """
+        Unmap the shared memory block. The block itself is removed by the writer.
+        """
+        if self._shared_memory is None:
+            return
+
+        self._header = self._timestamps = self._values = None
+        self._shared_memory.close()
+        self._shared_memory = None
+
+    def segments(self):
+        with self._frozen_snapshot():
+            return super(SharedMemoryRingBufferView, self).segments()
+
+    def _gather(self, parts):
+        data = super(SharedMemoryRingBufferView, self)._gather(parts)
+        head, count, total_appended = self._snapshot
+        capacity = self.capacity
+        # The samples that may have been overwritten since the snapshot, from the oldest sample of the snapshot
+        overwritten = int(self._header[_RESERVED_TOTAL]) - total_appended - (capacity - count)
+        if overwritten <= 0 or not parts:
+            return data
+
+        oldest = (head - count) % capacity
+        indices = np.concatenate([
+            (np.arange(len(timestamps)) + (timestamps.ctypes.data - self._timestamps.ctypes.data) //
+             self._dtype.itemsize - oldest) % capacity for timestamps, _ in parts])
+        return data[:, indices >= overwritten]
+
+    def _read(self, read, *args):
+        with self._frozen_snapshot():
+            return read(*args)
+
+    def __len__(self):
+        return self._count
+
+    def count_between(self, start_time, end_time):
+        return self._read(super(SharedMemoryRingBufferView, self).count_between, start_time, end_time)
+
+    def between(self, start_time, end_time):
+        return self._read(super(SharedMemoryRingBufferView, self).between, start_time, end_time)
+
+    def newest(self, count):
+        return self._read(super(SharedMemoryRingBufferView, self).newest, count)
+
+    def unrolled(self):
+        return self._read(super(SharedMemoryRingBufferView, self).unrolled)
+
+    def first(self):
+        with self._frozen_snapshot():
+            data = self._gather(self.columns(0, 1))
+            if not data.shape[1]:
+                # The oldest sample was overwritten meanwhile
+                data = self._gather(self.columns(0, len(self)))
+        return (data[0, 0],) + tuple(data[1:, 0]) if data.shape[1] else None
+
+    def last(self):
+        data = self.newest(1)
+        return (data[0, 0],) + tuple(data[1:, 0]) if data.shape[1] else None
@@ -0,0 +1,361 @@
+"""
+A Circular Buffer Shared by Curves Sampled at the Same Times
+"""
+
+import numpy as np
+
+from .ring_buffer import ReadOnlyRingBufferError, RingBuffer
+
+
+class SharedRingBuffer(object):
+    """
+    A ring buffer holding the samples of several curves recorded at the same timestamps, e.g. the curves all sampled
+    by the chart's update timer.
+
+    The timestamps are stored once, in the first row of a single ring buffer, and the values of the curves in the next
+    rows, as an (N curves x M samples) matrix. Compared to a ring buffer per curve, this nearly halves the memory taken
+    by the buffers of many curves, records a sample of all the curves with a single write, and lets the samples of all
+    the curves be copied at once.
+
+    Each curve reads its own samples through a SharedRingBufferRow, a view of its row of values providing the
+    RingBuffer interface.
+
+    The matrix is allocated with spare rows, so that adding a row reuses a free row of the matrix instead of copying
+    all the samples. The matrix is only reallocated when it runs out of free rows, growing to twice as many rows, or
+    when fewer than half of its rows are used, shrinking to the rows used. Adding or removing N rows one at a time then
+    copies the samples O(log N) times instead of N times.
+    """
+    def __init__(self, capacity, create_ring_buffer=RingBuffer):
+        """
+        Parameters
+        ----------
+        capacity : int
+            The maximum number of samples the buffer can hold.
+        create_ring_buffer : callable
+            Create the underlying ring buffer from a capacity and a number of rows, e.g. to keep it in memory-mapped
+            files, or to store the values in single precision.
+        """
+        self._create_ring_buffer = create_ring_buffer
+        self._ring_buffer = create_ring_buffer(capacity, rows=1)
+        self._rows = []
+        # The matrix rows not read by any row view, reused first by the rows added, the last one first
+        self._free_indices = []
+        # The matrix row of each row view, in the order of the views, to write a sample of all the rows at once
+        self._row_indices = np.zeros(0, dtype=int)
+
+    def __len__(self):
+        return len(self._ring_buffer)
+
+    @property
+    def ring_buffer(self):
+        """
+        The ring buffer holding the timestamps and the values of all the rows.
+        """
+        return self._ring_buffer
+
+    @property
+    def rows(self):
+        """
+        The rows of values, in the order they were added.
+        """
+        return list(self._rows)
+
+    @property
+    def row_count(self):
+        """
+        The number of rows of values read by a row view.
+        """
+        return len(self._rows)
+
+    @property
+    def allocated_rows(self):
+        """
+        The number of rows of values allocated, including the free rows.
+        """
+        return self._ring_buffer.rows - 1
+
+    @property
+    def capacity(self):
+        return self._ring_buffer.capacity
+
+    @property
+    def nbytes(self):
+        return self._ring_buffer.nbytes
+
+    @property
+    def total_appended(self):
+        return self._ring_buffer.total_appended
+
+    def allocated_rows_for(self, row_count):
+        """
+        Find the number of rows of values the matrix would have once the rows of values in use changed.
+
+        Parameters
+        ----------
+        row_count : int
+            The number of rows of values in use
+
+        Returns
+        -------
+        int
+            The number of rows of values allocated for the rows in use.
+        """
+        allocated_rows = self.allocated_rows
+        if row_count > allocated_rows:
+            return max(row_count, 2 * allocated_rows)
+        if 2 * row_count < allocated_rows:
+            return row_count
+        return allocated_rows
+
+    def add_rows(self, count):
+        """
+        Add rows of values for new curves. The samples already in the buffer are kept, and only the samples appended
+        afterwards are provided by the new rows.
+
+        Parameters
+        ----------
+        count : int
+            The number of rows to add
+
+        Returns
+        -------
+            A list of the new SharedRingBufferRow views.
+        """
+        if count < 1:
+            return []
+
+        allocated_rows = self.allocated_rows_for(len(self._rows) + count)
+        if allocated_rows > self.allocated_rows:
+            self._reallocate_rows(allocated_rows)
+
+        new_rows = [SharedRingBufferRow(self, self._free_indices.pop()) for _ in range(count)]
+        self._rows.extend(new_rows)
+        self._index_rows()
+        return new_rows
+
+    def remove_rows(self, rows):
+        """
+        Remove the rows of values of curves that don't share the buffer anymore. The removed rows can't be read
+        afterwards.
+
+        Parameters
+        ----------
+        rows : list
+            The SharedRingBufferRow views to remove
+        """
+        removed = set(id(row) for row in rows)
+        rows = [row for row in self._rows if id(row) in removed]
+        if not rows:
+            return
+
+        for row in rows:
+            row._shared_buffer = None
+            self._free_indices.append(row.index)
+        self._rows = [row for row in self._rows if row.shared_buffer is self]
+
+        allocated_rows = self.allocated_rows_for(len(self._rows))
+        if allocated_rows < self.allocated_rows:
+            self._reallocate_rows(allocated_rows)
+        self._index_rows()
+
+    def _reallocate_rows(self, allocated_rows):
+        """
+        Move the samples to a ring buffer with another number of rows of values, packing the rows in use first.
+        """
+        data = self._ring_buffer.unrolled()
+        packed = np.full((1 + allocated_rows, data.shape[1]), np.nan, dtype=data.dtype)
+        packed[0] = data[0]
+        for index, row in enumerate(self._rows, start=1):
+            packed[index] = data[row.index]
+            row._index = index
+        self._replace_ring_buffer(self._create_ring_buffer(self.capacity, rows=1 + allocated_rows), packed)
+        self._free_indices = list(range(allocated_rows, len(self._rows), -1))
+
+    def _index_rows(self):
+        self._row_indices = np.array([row.index - 1 for row in self._rows], dtype=int)
+
+    def _replace_ring_buffer(self, ring_buffer, data):
+        ring_buffer.load(data, total_appended=self._ring_buffer.total_appended)
+        self._ring_buffer.close()
+        self._ring_buffer = ring_buffer
+
+    def reallocate(self, create_ring_buffer):
+        """
+        Move the samples to a new underlying ring buffer, e.g. to change the storage of the buffer.
+
+        Parameters
+        ----------
+        create_ring_buffer : callable
+            Create the new ring buffer from a capacity and a number of rows.
+        """
+        self._create_ring_buffer = create_ring_buffer
+        self._replace_ring_buffer(create_ring_buffer(self.capacity, rows=self._ring_buffer.rows),
+                                  self._ring_buffer.unrolled())
+
+    def append(self, timestamp, values):
+        """
+        Write a sample of all the rows at the head of the buffer, overwriting the oldest sample if the buffer is full.
+
+        Parameters
+        ----------
+        timestamp : float
+            The time the sample was recorded
+        values : sequence
+            One value per row, in the order of the rows
+        """
+        column = np.full(self.allocated_rows, np.nan)
+        column[self._row_indices] = values
+        self._ring_buffer.append(timestamp, column)
+
+    def resize(self, capacity):
+        """
+        Reallocate the buffer to a new capacity, keeping as many of the newest samples as fit.
+
+        Parameters
+        ----------
+        capacity : int
+            The new maximum number of samples the buffer can hold.
+        """
+        self._ring_buffer.resize(capacity)
+
+    def clear(self):
+        """
+        Discard all the samples of all the rows, keeping the allocated storage.
+        """
+        self._ring_buffer.clear()
+        for row in self._rows:
+            row._start = 0
+
+    def close(self):
+        """
+        Release any resource held by the buffer storage. The buffer must not be used afterwards.
+        """
+        self._ring_buffer.close()
+
+    def matrix(self):
+        """
+        Copy the samples of all the rows at once, in chronological order.
+
+        Returns
+        -------
+            A (1 + N, M) array, with the timestamps in the first row, and the values of the N rows in the next rows,
+            in the order of the rows. A row added after some of the samples were recorded holds NaN for these samples.
+        """
+        data = self._ring_buffer.unrolled()
+        matrix = data[[0] + [row.index for row in self._rows]]
+        # A reused matrix row still holds the samples of the row it was freed by
+        oldest = self.total_appended - matrix.shape[1]
+        for index, row in enumerate(self._rows, start=1):
+            matrix[index, :max(row.start - oldest, 0)] = np.nan
+        return matrix
+
+
+class SharedRingBufferRow(RingBuffer):
+    """
+    A view of the timestamps and of one row of values of a shared ring buffer, read like the ring buffer of a single
+    curve. The samples are written by the shared ring buffer, for all the rows at once, so the view only discards
+    samples by hiding them, and refuses any write with a ReadOnlyRingBufferError.
+    """
+    read_only = True
+
+    def __init__(self, shared_buffer, index):
+        """
+        Parameters
+        ----------
+        shared_buffer : SharedRingBuffer
+            The buffer holding the samples of the row
+        index : int
+            The index of the row in the matrix of the shared buffer
+        """
+        # The storage belongs to the shared buffer, so the base class doesn't allocate anything
+        self._shared_buffer = shared_buffer
+        self._index = index
+        self._start = shared_buffer.total_appended
+
+    @property
+    def shared_buffer(self):
+        """
+        The buffer holding the samples of the row, or None if the row was removed from it.
+        """
+        return self._shared_buffer
+
+    @property
+    def index(self):
+        """
+        The index of the row in the matrix of the shared buffer, the timestamps being in the row 0.
+        """
+        return self._index
+
+    @property
+    def start(self):
+        """
+        The number of samples written into the shared buffer before the first sample of the row.
+        """
+        return self._start
+
+    @property
+    def capacity(self):
+        return self._shared_buffer.capacity
+
+    @property
+    def rows(self):
+        return 2
+
+    @property
+    def _count(self):
+        ring_buffer = self._shared_buffer.ring_buffer
+        return max(min(len(ring_buffer), ring_buffer.total_appended - self._start), 0)
+
+    @property
+    def _total_appended(self):
+        return max(self._shared_buffer.total_appended - self._start, 0)
+
+    @property
+    def _dtype(self):
+        return self._shared_buffer.ring_buffer.dtype
+
+    @property
+    def _value_dtype(self):
+        return self._shared_buffer.ring_buffer.value_dtype
+
+    @property
+    def nbytes(self):
+        """
+        The number of bytes allocated for the row's share of the shared buffer, including its free rows.
+        """
+        return self._shared_buffer.nbytes // max(self._shared_buffer.row_count, 1)
+
+    def close(self):
+        # The storage is released with the shared buffer
+        pass
+
+    def clear(self):
+        self._start = self._shared_buffer.total_appended
+
+    def truncate(self, count):
+        self._start = max(self._start, self._shared_buffer.total_appended - max(int(count), 0))
+
+    def _read_only(self, *args, **kwargs):
+        raise ReadOnlyRingBufferError("The samples of a shared ring buffer row are written through the shared buffer.")
+
+    append = extend = resize = load = _read_only
+
+    def first(self):
+        segments = self.segments()
+        if not segments:
+            return None
+        timestamps, values = segments[0]
+        return timestamps[0], values[0, 0]
+
+    def last(self):
+        segments = self.segments()
+        if not segments:
+            return None
+        timestamps, values = segments[-1]
+        return timestamps[-1], values[0, -1]
+
+    def segments(self):
+        # Only the newest samples of the shared buffer were recorded since the row was added or cleared
+        ring_buffer = self._shared_buffer.ring_buffer
+        return [(timestamps, values[self._index - 1:self._index])
+                for timestamps, values in ring_buffer.columns(len(ring_buffer) - self._count, len(ring_buffer))]
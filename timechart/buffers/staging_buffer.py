@@ -0,0 +1,63 @@
+"""
+A Queue of Samples Waiting to Be Written into a Ring Buffer
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+class StagingBuffer(object):
+    """
+    The samples received for a curve between two chart updates, waiting to be written into the curve's ring buffer at
+    once.
+
+    The samples are queued in a deque, whose appends and pops are atomic, so that the samples can be appended from the
+    thread receiving them while being drained from another thread, without any lock. Draining only takes the samples
+    queued when it starts, so the samples appended meanwhile are kept for the next drain.
+    """
+    def __init__(self):
+        self._samples = deque()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def append(self, timestamp, value):
+        """
+        Queue a sample.
+
+        Parameters
+        ----------
+        timestamp : float
+            The time the sample was received
+        value : float
+            The sample value
+        """
+        self._samples.append((timestamp, value))
+
+    def oldest_timestamp(self):
+        """
+        Provide the time the oldest queued sample was received, or None if there is no sample queued.
+        """
+        try:
+            return self._samples[0][0]
+        except IndexError:
+            return None
+
+    def drain(self):
+        """
+        Remove all the queued samples.
+
+        Returns
+        -------
+            A (2, N) array of the timestamps and the values of the N samples, in the order they were queued.
+        """
+        popleft = self._samples.popleft
+        samples = [popleft() for _ in range(len(self._samples))]
+        return np.array(samples, dtype=float).reshape(len(samples), 2).T
+
+    def clear(self):
+        """
+        Discard all the queued samples.
+        """
+        self._samples.clear()
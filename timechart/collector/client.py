@@ -0,0 +1,197 @@
+"""
+The Connection of a TimeChart Window to the Collector Process
+"""
+
+import json
+import logging
+import time
+
+from qtpy.QtCore import QObject
+from qtpy.QtNetwork import QLocalSocket
+
+from ..buffers.shared_memory_ring_buffer import SharedMemoryRingBufferView
+from ..displays.defaults import COLLECTOR_TIMEOUT_MS
+from .server import collector_server_name
+
+logger = logging.getLogger(__name__)
+
+
+class CollectorClient(QObject):
+    """
+    Subscribe a window to the channels recorded by the collector process, and attach to their ring buffers in shared
+    memory.
+
+    The requests wait for their reply, for COLLECTOR_TIMEOUT_MS at most. The requests for several channels are sent at
+    once, and wait for their replies together. Any failure, e.g. if no collector process is running, is logged and
+    reported by returning None, so that the window can connect the channels itself instead.
+    """
+    def __init__(self, name=None, parent=None):
+        """
+        Parameters
+        ----------
+        name : str, optional
+            The name of the local socket the collector process listens on. The collector socket of the current user by
+            default.
+        parent : QObject, optional
+            The parent of the client
+        """
+        super(CollectorClient, self).__init__(parent)
+        self._name = name or collector_server_name()
+        self._socket = QLocalSocket(self)
+
+    @property
+    def is_connected(self):
+        return self._socket.state() == QLocalSocket.ConnectedState
+
+    def connect_to_collector(self, timeout_ms=COLLECTOR_TIMEOUT_MS):
+        """
+        Connect to the collector process, if it's running.
+
+        Parameters
+        ----------
+        timeout_ms : int
+            How long to wait for the connection, in milliseconds
+
+        Returns
+        -------
+        bool
+            True if connected; False otherwise.
+        """
+        if self.is_connected:
+            return True
+
+        self._socket.connectToServer(self._name)
+        if not self._socket.waitForConnected(timeout_ms):
+            logger.debug("No collector process listening on '{0}': {1}".format(self._name,
+                                                                              self._socket.errorString()))
+            self._socket.abort()
+            return False
+        logger.info("Connected to the collector process on '{0}'.".format(self._name))
+        return True
+
+    def close(self):
+        """
+        Disconnect from the collector process, which drops all the subscriptions of the window.
+        """
+        self._socket.abort()
+
+    def _request(self, request):
+        """
+        Send a request to the collector process, and wait for its reply.
+
+        Parameters
+        ----------
+        request : dict
+            The request, as described by CollectorServer
+
+        Returns
+        -------
+        dict
+            The reply, or None if the collector process didn't reply in time, or reported an error.
+        """
+        return self._requests([request])[0]
+
+    def _requests(self, requests):
+        """
+        Send several requests to the collector process at once, and wait for their replies, so that the requests take
+        a single round trip to the collector process.
+
+        Parameters
+        ----------
+        requests : list
+            The requests, as described by CollectorServer
+
+        Returns
+        -------
+        list
+            The reply to each request, in order, or None for the requests the collector process didn't reply to in
+            time, or reported an error for.
+        """
+        if not self.is_connected or not requests:
+            return [None] * len(requests)
+
+        self._socket.write("".join(json.dumps(request) + "\n" for request in requests).encode("utf-8"))
+        self._socket.flush()
+        deadline = time.monotonic() + COLLECTOR_TIMEOUT_MS / 1000.0
+        replies = []
+        while len(replies) < len(requests):
+            if not self._socket.canReadLine():
+                remaining_ms = int((deadline - time.monotonic()) * 1000)
+                if remaining_ms <= 0 or not self._socket.waitForReadyRead(remaining_ms):
+                    logger.error("No reply from the collector process to '{0}'. Disconnecting from it."
+                                 .format(requests[len(replies)]))
+                    # A late reply would be taken for the reply to the next request
+                    self.close()
+                    return replies + [None] * (len(requests) - len(replies))
+                continue
+
+            reply = json.loads(bytes(self._socket.readLine()).decode("utf-8"))
+            if "error" in reply:
+                logger.error("The collector process cannot handle '{0}': {1}".format(requests[len(replies)],
+                                                                                     reply["error"]))
+                reply = None
+            replies.append(reply)
+        return replies
+
+    def subscribe(self, address, buffer_size):
+        """
+        Have the collector process record a channel, and attach to the channel's ring buffer.
+
+        Parameters
+        ----------
+        address : str
+            The channel address
+        buffer_size : int
+            The capacity of the ring buffer, if the collector process doesn't record the channel yet
+
+        Returns
+        -------
+        SharedMemoryRingBufferView
+            A read-only view of the channel's ring buffer, or None if the channel isn't recorded by the collector
+            process.
+        """
+        return self.subscribe_all([address], buffer_size)[0]
+
+    def subscribe_all(self, addresses, buffer_size):
+        """
+        Have the collector process record several channels, e.g. the channels of a config file, with a single round
+        trip to the collector process, and attach to the channels' ring buffers.
+
+        Parameters
+        ----------
+        addresses : list
+            The channel addresses
+        buffer_size : int
+            The capacity of the ring buffers, for the channels the collector process doesn't record yet
+
+        Returns
+        -------
+        list
+            A read-only view of each channel's ring buffer, in order, or None for the channels not recorded by the
+            collector process.
+        """
+        replies = self._requests([{"command": "subscribe", "address": address, "buffer_size": int(buffer_size)}
+                                  for address in addresses])
+        views = []
+        for address, reply in zip(addresses, replies):
+            view = None
+            if reply is not None:
+                try:
+                    view = SharedMemoryRingBufferView(reply["name"])
+                except (OSError, ValueError) as error:
+                    logger.error("Cannot attach to the ring buffer of '{0}' in the collector process. Exception: {1}"
+                                 .format(address, error))
+                    self.unsubscribe(address)
+            views.append(view)
+        return views
+
+    def unsubscribe(self, address):
+        """
+        Let the collector process stop recording a channel, unless other windows still plot it.
+
+        Parameters
+        ----------
+        address : str
+            The channel address
+        """
+        self._request({"command": "unsubscribe", "address": address})
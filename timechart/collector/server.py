@@ -0,0 +1,250 @@
+"""
+The Collector Process Recording the Channels Plotted by Several TimeChart Windows
+"""
+
+from collections import Counter
+import json
+import logging
+import time
+
+from qtpy.QtCore import QObject, Slot
+from qtpy.QtNetwork import QLocalServer
+
+from pydm.widgets.channel import PyDMChannel
+from pydm.widgets.timeplot import MINIMUM_BUFFER_SIZE, DEFAULT_BUFFER_SIZE
+
+from ..buffers.shared_memory_ring_buffer import SharedMemoryRingBuffer
+from ..displays.defaults import COLLECTOR_SERVER_NAME, COLLECTOR_TIMEOUT_MS
+from ..utilities.single_instance import listen_unless_running, user_server_name
+
+logger = logging.getLogger(__name__)
+
+
+def collector_server_name():
+    """
+    Provide the name of the local socket the collector process of the current user listens on.
+    """
+    return user_server_name(COLLECTOR_SERVER_NAME)
+
+
+class CollectedChannel(QObject):
+    """
+    A channel recorded by the collector process, with every value received written into a ring buffer in shared
+    memory, together with the time it was received.
+    """
+    def __init__(self, address, buffer_size):
+        """
+        Parameters
+        ----------
+        address : str
+            The channel address
+        buffer_size : int
+            The capacity of the shared ring buffer, which is fixed for the lifetime of the channel
+        """
+        super(CollectedChannel, self).__init__()
+        self.ring_buffer = SharedMemoryRingBuffer(max(int(buffer_size), MINIMUM_BUFFER_SIZE))
+        self._closed = False
+        self.channel = PyDMChannel(address=address, connection_slot=self.connectionStateChanged,
+                                   value_slot=self.receiveNewValue)
+        self.channel.connect()
+
+    @property
+    def address(self):
+        return self.channel.address
+
+    @Slot(bool)
+    def connectionStateChanged(self, connected):
+        if self._closed:
+            return
+        self.ring_buffer.set_connected(connected)
+
+    @Slot(float)
+    @Slot(int)
+    def receiveNewValue(self, new_value):
+        if self._closed:
+            # A value queued before the channel was disconnected
+            return
+        self.ring_buffer.append(time.time(), new_value)
+
+    def close(self):
+        """
+        Disconnect the channel, and remove the shared ring buffer.
+        """
+        self._closed = True
+        self.channel.disconnect()
+        self.ring_buffer.close()
+
+
+class CollectorServer(QObject):
+    """
+    A local server owning the channel connections and the ring buffers of the curves plotted by the TimeChart windows
+    of a user, so that the windows plotting the same channel share a single connection and a single buffer.
+
+    The windows talk to the server over a local socket, one JSON request per line, answered by one JSON reply per line:
+
+    - {"command": "subscribe", "address": ..., "buffer_size": ...} connects the channel unless it's already collected,
+      and is answered by {"address": ..., "name": ...}, the name being the shared memory block of the channel's ring
+      buffer. The buffer size only applies to the first subscription to the channel.
+    - {"command": "unsubscribe", "address": ...} is answered by {"address": ...}.
+
+    Any failure is answered by {"error": ...}. The channel is disconnected, and its ring buffer removed, once no window
+    subscribes to it anymore, including when the windows exit without unsubscribing.
+    """
+    def __init__(self, name=None, parent=None):
+        """
+        Parameters
+        ----------
+        name : str, optional
+            The name of the local socket to listen on. The collector socket of the current user by default.
+        parent : QObject, optional
+            The parent of the server
+        """
+        super(CollectorServer, self).__init__(parent)
+        self._name = name or collector_server_name()
+        self._server = QLocalServer(self)
+        self._server.newConnection.connect(self._accept_connections)
+        self._channels = dict()
+        # The number of subscriptions of each window socket to each channel address
+        self._subscriptions = dict()
+
+    @property
+    def addresses(self):
+        """
+        The addresses of the channels currently collected.
+        """
+        return sorted(self._channels)
+
+    def listen(self):
+        """
+        Start listening for the TimeChart windows of the current user, unless another collector process is already
+        listening.
+
+        Returns
+        -------
+        bool
+            True if the server is listening; False otherwise.
+        """
+        if not listen_unless_running(self._server, self._name, COLLECTOR_TIMEOUT_MS):
+            logger.error("Cannot start the collector on '{0}'. Is another collector running?".format(self._name))
+            return False
+        return True
+
+    def close(self):
+        """
+        Stop listening, disconnect all the channels, and remove their ring buffers.
+        """
+        self._server.close()
+        for socket in list(self._subscriptions):
+            self._drop_socket(socket)
+        for channel in self._channels.values():
+            channel.close()
+        self._channels.clear()
+
+    @Slot()
+    def _accept_connections(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            self._subscriptions[socket] = Counter()
+            socket.readyRead.connect(lambda socket=socket: self._read_requests(socket))
+            socket.disconnected.connect(lambda socket=socket: self._drop_socket(socket))
+
+    def _read_requests(self, socket):
+        while socket.canReadLine():
+            line = bytes(socket.readLine()).decode("utf-8", "replace")
+            try:
+                reply = self.handle_request(socket, json.loads(line))
+            except (ValueError, TypeError, KeyError) as error:
+                reply = {"error": "Invalid request '{0}': {1}".format(line.strip(), error)}
+            socket.write((json.dumps(reply) + "\n").encode("utf-8"))
+
+    def handle_request(self, socket, request):
+        """
+        Handle a request from a window.
+
+        Parameters
+        ----------
+        socket : QLocalSocket
+            The socket of the window
+        request : dict
+            The decoded request
+
+        Returns
+        -------
+        dict
+            The reply.
+        """
+        command = request["command"]
+        address = request["address"]
+        if command == "subscribe":
+            return self.subscribe(socket, address, request.get("buffer_size", DEFAULT_BUFFER_SIZE))
+        if command == "unsubscribe":
+            self.unsubscribe(socket, address)
+            return {"address": address}
+        return {"error": "Unknown command '{0}'".format(command)}
+
+    def subscribe(self, socket, address, buffer_size):
+        """
+        Start collecting a channel for a window, unless it's already collected.
+
+        Parameters
+        ----------
+        socket : QLocalSocket
+            The socket of the window
+        address : str
+            The channel address
+        buffer_size : int
+            The capacity of the channel's ring buffer, if the channel isn't collected yet
+
+        Returns
+        -------
+        dict
+            The reply, with the name of the shared memory block of the channel's ring buffer.
+        """
+        channel = self._channels.get(address)
+        if channel is None:
+            try:
+                channel = CollectedChannel(address, buffer_size)
+            except (OSError, ValueError) as error:
+                logger.error("Cannot collect the channel '{0}'. Exception: {1}".format(address, error))
+                return {"error": str(error)}
+            self._channels[address] = channel
+            logger.info("Collecting the channel '{0}'.".format(address))
+
+        self._subscriptions.setdefault(socket, Counter())[address] += 1
+        return {"address": address, "name": channel.ring_buffer.name}
+
+    def unsubscribe(self, socket, address):
+        """
+        Stop collecting a channel for a window, and disconnect the channel if no other window subscribes to it.
+
+        Parameters
+        ----------
+        socket : QLocalSocket
+            The socket of the window
+        address : str
+            The channel address
+        """
+        subscriptions = self._subscriptions.get(socket)
+        if not subscriptions or not subscriptions[address]:
+            return
+
+        subscriptions[address] -= 1
+        if not subscriptions[address]:
+            del subscriptions[address]
+        if not any(address in subscriptions for subscriptions in self._subscriptions.values()):
+            logger.info("No longer collecting the channel '{0}'.".format(address))
+            self._channels.pop(address).close()
+
+    def _drop_socket(self, socket):
+        """
+        Remove all the subscriptions of a window, e.g. once it has exited.
+        """
+        subscriptions = self._subscriptions.get(socket)
+        if subscriptions is None:
+            return
+
+        for address, count in list(subscriptions.items()):
+            for _ in range(count):
+                self.unsubscribe(socket, address)
+        del self._subscriptions[socket]
+        socket.deleteLater()
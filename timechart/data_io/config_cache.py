@@ -0,0 +1,177 @@
+"""
+A Cache of the Parsed Config Files
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+
+from timechart import __version__ as ver
+
+from ..displays.defaults import CONFIG_CACHE_DIR, CONFIG_CACHE_MAX_MB, CONFIG_CACHE_MAX_AGE_DAYS
+from ..utilities.prewarm import is_private_directory
+
+import logging
+logger = logging.getLogger(__name__)
+
+# The version of the cache entries, to change whenever their layout changes
+CACHE_FORMAT_VERSION = 1
+CACHE_ENTRY_SUFFIX = ".pickle"
+
+
+class ConfigCache:
+    """
+    Keep the settings parsed from config files in a local cache directory, so that opening the same config file again
+    skips parsing it.
+
+    An entry is keyed by the config file's path, and is only used while the file keeps the modification time, size and
+    content hash it was parsed with, and while TimeChart keeps the version it was parsed with. Entries are unpickled,
+    so the cache directory must only be accessible by the current user. Otherwise, the cache isn't used.
+    """
+    def __init__(self, cache_dir=CONFIG_CACHE_DIR, max_bytes=CONFIG_CACHE_MAX_MB * 1024 * 1024,
+                 max_age_s=CONFIG_CACHE_MAX_AGE_DAYS * 24 * 3600):
+        """
+        Parameters
+        ----------
+        cache_dir : str
+            The directory to keep the cache entries in. It's created if it doesn't exist.
+        max_bytes : int
+            The total size the entries are evicted down to, least recently used first
+        max_age_s : float
+            How long an entry is kept since it was last used, in seconds
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+
+    def load(self, filename, content):
+        """
+        Provide the settings cached for a config file.
+
+        Parameters
+        ----------
+        filename : str
+            The path to the config file
+        content : bytes
+            The content of the config file
+
+        Returns
+        -------
+            The settings cached for the config file, or None if there is no valid entry for this content.
+        """
+        entry_filename = self._entry_filename(filename)
+        if not self._is_usable() or not os.path.exists(entry_filename):
+            return None
+
+        try:
+            with open(entry_filename, 'rb') as entry_file:
+                entry = pickle.load(entry_file)
+            if entry["key"] != self._key(filename, content):
+                return None
+
+            # Keep the entries used the most recently when evicting
+            os.utime(entry_filename)
+            return entry["settings"]
+        except Exception:
+            logger.debug("Cannot read the cache entry '{0}'.".format(entry_filename), exc_info=True)
+            self._remove(entry_filename)
+            return None
+
+    def store(self, filename, content, settings):
+        """
+        Cache the settings parsed from a config file, then evict the entries too old, or too many.
+
+        Parameters
+        ----------
+        filename : str
+            The path to the config file
+        content : bytes
+            The content of the config file
+        settings : object
+            The settings parsed from the config file
+        """
+        if not self._is_usable():
+            return
+
+        entry_filename = self._entry_filename(filename)
+        temp_filename = None
+        try:
+            data = pickle.dumps(dict(key=self._key(filename, content), settings=settings), pickle.HIGHEST_PROTOCOL)
+
+            # Write to a temporary file first, so that another TimeChart process never reads a partial entry
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as temp_file:
+                temp_filename = temp_file.name
+                temp_file.write(data)
+            os.replace(temp_filename, entry_filename)
+        except Exception:
+            logger.warning("Cannot cache the settings of '{0}'.".format(filename), exc_info=True)
+            if temp_filename:
+                self._remove(temp_filename)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the entries not used for longer than the maximum age, then the least recently used entries until the
+        entries fit the maximum size.
+        """
+        now = time.time()
+        entries = list()
+        with os.scandir(self.cache_dir) as dir_entries:
+            for dir_entry in dir_entries:
+                if not dir_entry.name.endswith(CACHE_ENTRY_SUFFIX):
+                    continue
+                try:
+                    status = dir_entry.stat()
+                except OSError:
+                    continue
+                if now - status.st_mtime > self.max_age_s:
+                    self._remove(dir_entry.path)
+                else:
+                    entries.append((status.st_mtime, status.st_size, dir_entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            total_bytes -= size
+
+    def _is_usable(self):
+        """
+        Create the cache directory if needed, and check that only the current user can access it.
+        """
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        except OSError:
+            logger.warning("Cannot create the config cache directory '{0}'.".format(self.cache_dir))
+            return False
+        if not is_private_directory(self.cache_dir):
+            logger.warning("The config cache directory '{0}' is accessible by other users. The config cache isn't "
+                           "used.".format(self.cache_dir))
+            return False
+        return True
+
+    def _entry_filename(self, filename):
+        path_hash = hashlib.sha256(os.path.realpath(filename).encode()).hexdigest()
+        return os.path.join(self.cache_dir, path_hash[:32] + CACHE_ENTRY_SUFFIX)
+
+    @staticmethod
+    def _key(filename, content):
+        """
+        Provide what a cache entry must match to be used for a config file: the path, the modification time and the
+        content hash of the file, as well as the TimeChart version and the cache format.
+        """
+        status = os.stat(filename)
+        return (CACHE_FORMAT_VERSION, str(ver), os.path.realpath(filename), status.st_mtime_ns, len(content),
+                hashlib.blake2b(content, digest_size=20).hexdigest())
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
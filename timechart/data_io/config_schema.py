@@ -0,0 +1,312 @@
+"""
+Validation and Migration of the TimeChart Config Format
+"""
+
+from collections import OrderedDict, namedtuple
+import math
+
+from qtpy.QtCore import Qt
+from qtpy.QtGui import QColor
+from pydm.widgets.timeplot import DEFAULT_BUFFER_SIZE
+
+from timechart import __version__ as ver
+
+from ..displays.defaults import (ASYNC_DATA_SAMPLING, SYNC_DATA_SAMPLING, CAPTURE_DATA_SAMPLING, DEFAULT_CHART_TITLE,
+                                 DEFAULT_REDRAW_RATE_HZ, DEFAULT_CURVE_STATUS_REFRESH_RATE_HZ,
+                                 DEFAULT_DATA_SAMPLING_RATE_HZ, DEFAULT_CHART_BACKGROUND_COLOR,
+                                 DEFAULT_CHART_AXIS_COLOR, ALL_POINTS_RENDERING, MIN_MAX_DECIMATION_RENDERING,
+                                 MEMORY_STORAGE, MEMMAP_STORAGE, DEFAULT_CACHE_DIR, DOUBLE_PRECISION_VALUES,
+                                 SINGLE_PRECISION_VALUES, DEFAULT_MEMORY_BUDGET_MB, MAX_MEMORY_BUDGET_MB,
+                                 MAX_CURVE_BUFFER_SIZE)
+
+# The version of the config format written by the SettingsExporter. The configs without a schema version, i.e. written
+# before the schema was versioned, or converted from StripTool config files, are version 1.
+CONFIG_SCHEMA_VERSION = 2
+SCHEMA_VERSION_KEY = "__schema_version__"
+
+# How many of the problems found in a config are reported in the error message
+MAX_REPORTED_PROBLEMS = 10
+
+# A setting of the config format: the check of its value, which raises a ValueError for an invalid value, the value
+# given by the migrations to the configs without the setting, or REQUIRED, and whether the older configs may hold the
+# value as a string of digits
+Field = namedtuple("Field", ["check", "default", "numeric"])
+REQUIRED = object()
+
+
+class ConfigSchemaError(ValueError):
+    """
+    A config doesn't match the TimeChart config format, with the list of the problems found.
+    """
+    def __init__(self, problems):
+        self.problems = problems
+        message = "; ".join(problems[:MAX_REPORTED_PROBLEMS])
+        if len(problems) > MAX_REPORTED_PROBLEMS:
+            message += "; and {0} more problems".format(len(problems) - MAX_REPORTED_PROBLEMS)
+        super(ConfigSchemaError, self).__init__("Invalid config: " + message)
+
+
+def _boolean(value):
+    if not isinstance(value, bool):
+        raise ValueError("expected true or false")
+    return value
+
+
+def _number(minimum=None, maximum=None, integer=False, positive=False, nullable=False):
+    """
+    Provide the check of a numeric setting.
+
+    Parameters
+    ----------
+    minimum : int or float
+        The smallest value allowed
+    maximum : int or float
+        The largest value allowed
+    integer : bool
+        Whether only integers are allowed
+    positive : bool
+        Whether only values greater than 0 are allowed
+    nullable : bool
+        Whether null is allowed
+    """
+    expected = "an integer" if integer else "a number"
+    if minimum is not None and maximum is not None:
+        expected += " from {0} to {1}".format(minimum, maximum)
+    elif minimum is not None:
+        expected += " of at least {0}".format(minimum)
+    elif maximum is not None:
+        expected += " of at most {0}".format(maximum)
+    if positive:
+        expected += " greater than 0"
+    if nullable:
+        expected += ", or null"
+    types = (int,) if integer else (int, float)
+
+    def check(value):
+        if value is None and nullable:
+            return value
+        if (isinstance(value, bool) or not isinstance(value, types) or not math.isfinite(value) or
+                (minimum is not None and value < minimum) or (maximum is not None and value > maximum) or
+                (positive and value <= 0)):
+            raise ValueError("expected " + expected)
+        return value
+    return check
+
+
+def _choice(*choices):
+    def check(value):
+        if isinstance(value, bool) or value not in choices:
+            raise ValueError("expected one of {0}".format(", ".join(str(choice) for choice in choices)))
+        return value
+    return check
+
+
+def _text(nullable=True, empty=True):
+    expected = "a string" if empty else "a non-empty string"
+    if nullable:
+        expected += ", or null"
+
+    def check(value):
+        if value is None and nullable:
+            return value
+        if not isinstance(value, str) or not (empty or value):
+            raise ValueError("expected " + expected)
+        return value
+    return check
+
+
+def _color(nullable=False):
+    def check(value):
+        if value is None and nullable:
+            return value
+        # The StripTool configs hold colors already converted into QColor objects
+        if isinstance(value, QColor) and value.isValid():
+            return value
+        if not isinstance(value, str) or not QColor.isValidColor(value):
+            raise ValueError("expected a color name" + (", or null" if nullable else ""))
+        return value
+    return check
+
+
+CHART_FIELDS = OrderedDict([
+    ("title", Field(_text(nullable=False), DEFAULT_CHART_TITLE, False)),
+    ("x_axis_label", Field(_text(), None, False)),
+    ("x_axis_unit", Field(_text(), None, False)),
+    ("left_y_axis_label", Field(_text(), None, False)),
+    ("left_y_axis_unit", Field(_text(), None, False)),
+    ("show_right_y_axis", Field(_boolean, False, False)),
+    ("right_y_axis_label", Field(_text(), None, False)),
+    ("right_y_axis_unit", Field(_text(), None, False)),
+    ("redraw_rate", Field(_number(positive=True), DEFAULT_REDRAW_RATE_HZ, True)),
+    ("curve_status_refresh_rate", Field(_number(positive=True), DEFAULT_CURVE_STATUS_REFRESH_RATE_HZ, True)),
+    ("render_mode", Field(_choice(ALL_POINTS_RENDERING, MIN_MAX_DECIMATION_RENDERING), ALL_POINTS_RENDERING, True)),
+    ("data_sampling_mode", Field(_choice(ASYNC_DATA_SAMPLING, SYNC_DATA_SAMPLING, CAPTURE_DATA_SAMPLING),
+                                 ASYNC_DATA_SAMPLING, True)),
+    ("update_interval_hz", Field(_number(positive=True), DEFAULT_DATA_SAMPLING_RATE_HZ, True)),
+    ("limit_time_span", Field(_boolean, False, False)),
+    ("time_span_limit_hours", Field(_number(minimum=0, integer=True), 0, True)),
+    ("time_span_limit_minutes", Field(_number(minimum=0, integer=True), 0, True)),
+    ("time_span_limit_seconds", Field(_number(minimum=0, integer=True), 0, True)),
+    ("buffer_size", Field(_number(minimum=1, maximum=MAX_CURVE_BUFFER_SIZE, integer=True), DEFAULT_BUFFER_SIZE,
+                          True)),
+    ("storage_backend", Field(_choice(MEMORY_STORAGE, MEMMAP_STORAGE), MEMORY_STORAGE, True)),
+    ("cache_dir", Field(_text(nullable=False, empty=False), DEFAULT_CACHE_DIR, False)),
+    ("value_precision", Field(_choice(DOUBLE_PRECISION_VALUES, SINGLE_PRECISION_VALUES), DOUBLE_PRECISION_VALUES,
+                              True)),
+    ("memory_budget_mb", Field(_number(minimum=0, maximum=MAX_MEMORY_BUDGET_MB, integer=True),
+                               DEFAULT_MEMORY_BUDGET_MB, True)),
+    ("show_legend", Field(_boolean, False, False)),
+    ("background_color", Field(_color(), DEFAULT_CHART_BACKGROUND_COLOR.name(), False)),
+    ("axis_color", Field(_color(), DEFAULT_CHART_AXIS_COLOR.name(), False)),
+    ("show_x_grid", Field(_boolean, False, False)),
+    ("show_y_grid", Field(_boolean, False, False)),
+    # The grid opacity slider clamps the values above its range
+    ("grid_alpha", Field(_number(minimum=0), 5, True)),
+])
+
+CURVE_FIELDS = OrderedDict([
+    ("is_visible", Field(_boolean, True, False)),
+    ("color", Field(_color(nullable=True), None, False)),
+    ("y_channel", Field(_text(nullable=False, empty=False), REQUIRED, False)),
+    # The Qt pen styles, from Qt.NoPen to Qt.CustomDashLine
+    ("line_style", Field(_choice(*range(7)), Qt.SolidLine, True)),
+    ("line_width", Field(_number(minimum=0, integer=True), 2, True)),
+    ("symbol", Field(_text(), None, False)),
+    ("symbol_size", Field(_number(minimum=0, integer=True, nullable=True), None, True)),
+    ("buffer_size", Field(_number(minimum=1, maximum=MAX_CURVE_BUFFER_SIZE, integer=True, nullable=True), None,
+                          True)),
+    ("update_interval_hz", Field(_number(positive=True, nullable=True), None, True)),
+])
+
+# The checks of the settings, looked up once rather than for each curve of a config
+_CHART_CHECKS = tuple((name, field.check) for name, field in CHART_FIELDS.items())
+_CURVE_CHECKS = tuple((name, field.check) for name, field in CURVE_FIELDS.items())
+
+
+def validate_settings(settings):
+    """
+    Migrate a config to the current config format, then check every setting, so that a config is refused before any
+    of its settings is applied.
+
+    Parameters
+    ----------
+    settings : dict
+        The settings of a TimeChart JSON config file, or of a StripTool config file converted to the TimeChart format.
+        They are left untouched.
+
+    Returns
+    -------
+    OrderedDict
+        The settings in the current config format, with every setting present.
+
+    Raises
+    ------
+    ConfigSchemaError
+        If the config can't be migrated, or has invalid settings.
+    """
+    if not isinstance(settings, dict):
+        raise ConfigSchemaError(["expected the config to be a JSON object"])
+
+    version = settings.get(SCHEMA_VERSION_KEY, 1)
+    if isinstance(version, bool) or not isinstance(version, int) or version < 1:
+        raise ConfigSchemaError(["{0}: expected an integer of at least 1".format(SCHEMA_VERSION_KEY)])
+    if version > CONFIG_SCHEMA_VERSION:
+        raise ConfigSchemaError(["the config format version {0} was written by a newer TimeChart than this one "
+                                 "({1}), which reads up to the version {2}".format(version, ver,
+                                                                                    CONFIG_SCHEMA_VERSION)])
+
+    while version < CONFIG_SCHEMA_VERSION:
+        settings = MIGRATIONS[version](settings)
+        version += 1
+
+    problems = list()
+    _check_settings(settings, problems)
+    if problems:
+        raise ConfigSchemaError(problems)
+    return settings
+
+
+def _check_settings(settings, problems):
+    """
+    Check the settings in the current config format, adding a description of each problem found to the problems.
+    """
+    pvs = settings.get("pvs", None)
+    if not isinstance(pvs, dict):
+        problems.append("pvs: expected an object")
+    else:
+        for curve_name, curve_settings in pvs.items():
+            if not isinstance(curve_settings, dict):
+                problems.append("pvs.{0}: expected an object".format(curve_name))
+                continue
+            _check_fields(_CURVE_CHECKS, curve_settings, "pvs.{0}.".format(curve_name), problems)
+
+    chart_settings = settings.get("chart_settings", None)
+    if not isinstance(chart_settings, dict):
+        problems.append("chart_settings: expected an object")
+    elif len(chart_settings):
+        # A config exported without the chart settings has none of them
+        _check_fields(_CHART_CHECKS, chart_settings, "chart_settings.", problems)
+
+
+def _check_fields(checks, settings, prefix, problems):
+    for name, check in checks:
+        try:
+            check(settings[name])
+        except KeyError:
+            problems.append(prefix + name + ": missing")
+        except ValueError as error:
+            problems.append("{0}{1}: {2}, got {3!r}".format(prefix, name, error, settings[name]))
+
+
+def _migrate_from_version_1(settings):
+    """
+    Migrate a config written before the config format was versioned, or converted from a StripTool config file. These
+    configs may lack the settings added since, e.g. the storage backend, or hold numbers as strings of digits, e.g. the
+    time span limit or the buffer size of StripTool configs.
+    """
+    migrated = OrderedDict(settings)
+    migrated[SCHEMA_VERSION_KEY] = 2
+    migrated["pvs"] = settings.get("pvs", OrderedDict())
+    migrated["chart_settings"] = settings.get("chart_settings", OrderedDict())
+
+    if isinstance(migrated["pvs"], dict):
+        migrated["pvs"] = OrderedDict(
+            (curve_name, _fill_fields(CURVE_FIELDS, curve_settings) if isinstance(curve_settings, dict)
+             else curve_settings)
+            for curve_name, curve_settings in migrated["pvs"].items())
+    if isinstance(migrated["chart_settings"], dict) and len(migrated["chart_settings"]):
+        migrated["chart_settings"] = _fill_fields(CHART_FIELDS, migrated["chart_settings"])
+    return migrated
+
+
+def _fill_fields(fields, settings):
+    """
+    Provide a copy of the settings with the missing settings given their default value, and the numbers held as
+    strings converted into numbers.
+    """
+    filled = OrderedDict(settings)
+    for name, field in fields.items():
+        if name not in filled:
+            if field.default is not REQUIRED:
+                filled[name] = field.default
+        elif field.numeric and isinstance(filled[name], str):
+            filled[name] = _parse_number(filled[name])
+    return filled
+
+
+def _parse_number(text):
+    """
+    Convert a string of digits into an int, or a float, leaving any other string as is for the check to refuse.
+    """
+    for number_type in (int, float):
+        try:
+            return number_type(text.strip())
+        except ValueError:
+            pass
+    return text
+
+
+# The migration of a config from each older version of the config format to the next version
+MIGRATIONS = {
+    1: _migrate_from_version_1,
+}
@@ -0,0 +1,80 @@
+"""
+Watching a Config File for Changes
+"""
+
+import os
+
+from qtpy.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+from ..displays.defaults import CONFIG_WATCH_DELAY_MS
+
+
+class ConfigWatcher(QObject):
+    """
+    Watch a config file, and signal once its contents changed, e.g. for a config generated from a database and
+    rewritten several times a day.
+
+    A change is only signaled once the file stays unchanged for CONFIG_WATCH_DELAY_MS, so that a file being written is
+    read once it's complete. Many editors and generators replace the file instead of writing into it, which makes the
+    file system watcher drop the file, so its directory is watched too, and the file is watched again whenever it shows
+    up.
+    """
+    # The path of the config file, whose contents changed
+    configChanged = Signal(str)
+
+    def __init__(self, path, parent=None, delay_ms=CONFIG_WATCH_DELAY_MS):
+        """
+        Parameters
+        ----------
+        path : str
+            The path of the config file to watch
+        parent : QObject, optional
+            The parent of the watcher
+        delay_ms : int
+            How long the file must stay unchanged before the change is signaled, in milliseconds
+        """
+        super(ConfigWatcher, self).__init__(parent)
+        self._path = os.path.abspath(path)
+        self._signature = self._file_signature()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._check_file)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._handle_change)
+        self._watcher.directoryChanged.connect(self._handle_change)
+        self._watcher.addPath(os.path.dirname(self._path))
+        self._watch_file()
+
+    @property
+    def path(self):
+        return self._path
+
+    def _file_signature(self):
+        """
+        Identify the current contents of the file by its modification time and size, or None if the file is missing.
+        """
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _watch_file(self):
+        if self._path not in self._watcher.files() and os.path.isfile(self._path):
+            self._watcher.addPath(self._path)
+
+    def _handle_change(self, path):
+        # Wait for the file to stay unchanged
+        self._timer.start()
+
+    def _check_file(self):
+        self._watch_file()
+        signature = self._file_signature()
+        if signature is None or signature == self._signature:
+            # The file is being replaced, or another file of the directory changed
+            return
+        self._signature = signature
+        self.configChanged.emit(self._path)
@@ -3,7 +3,6 @@ StripTool Configuration Data File Import Strategy
 """
 
 from collections import OrderedDict
-import re
 
 from qtpy.QtGui import QColor
 from qtpy.QtCore import Qt
@@ -11,7 +10,6 @@ from qtpy.QtCore import Qt
 from timechart import __version__ as ver
 
 from .timechart_config_importer import TimeChartConfigImporter
-from ...utilities.utils import add_striptool_color
 from timechart.displays.defaults import DEFAULT_CHART_TITLE, ASYNC_DATA_SAMPLING
 
 
@@ -33,7 +31,7 @@ def _convert_to_hz(key, chart_settings, time_per_second):
 
 def _adjust_color_value(color_value):
     try:
-        color_value = color_value.rstrip().split(" ")
+        color_value = color_value.split()
         color = QColor(int(color_value[0]) // 257, int(color_value[1]) // 257, int(color_value[2]) // 257)
 
         return color
@@ -57,81 +55,121 @@ def _convert_to_time_span(chart_settings, time_span_seconds):
         chart_settings["time_span_limit_seconds"] = seconds
 
 
-global LINE_WIDTH
-LINE_WIDTH = 1
+class _StripToolConversion:
+    """
+    The state of converting a single StripTool config file. Each conversion keeps its own state, so that several files
+    can be converted at the same time.
+    """
+    def __init__(self, timechart_settings):
+        """
+        Parameters
+        ----------
+        timechart_settings : OrderedDict
+            The TimeChart settings to fill in.
+        """
+        self.timechart_settings = timechart_settings
 
+        # StripTool defines the same line width for all curves, while TimeChart lets each curve have its own line
+        # width, so the StripTool line width is kept here to assign to each curve
+        self.line_width = 1
+        self.colors = list()
+        self.index_to_pv_names = OrderedDict()
 
-def _add_to_curves(key, value, chart_pvs, index_to_pv_names):
-    """
-    Form a list of PVs from parsing the StripTool configuration file.
-    Then, determine the specific values for each PV to assign to the TimeChart configuration data structure.
+    def add(self, key, value):
+        """
+        Convert a StripTool key and value into the TimeChart settings.
 
-    Parameters
-    ----------
-    key : str
-        A key from the StripTool config file
-    value : str
-        A value paired with a key from the StripTool config file
-    chart_pvs : OrderedDict
-        A dictionary of PVs, and for each PV, there's a nested dict to hold the PV's specific attribute values
-    index_to_pv_names : OrderedDict
-        A map between the StripTool's label for each PV, and the PV name.
-    """
-    key_components = key.split('.')
-    key_specific_item = key_components[-1]
-    key_index = int(key_components[-2])
-
-    if "Name" in key:
-        value = "ca://" + value
-        chart_pvs[value] = OrderedDict()
-
-        global LINE_WIDTH
-        chart_pvs[value]["line_width"] = LINE_WIDTH
-
-        chart_pvs[value]["y_channel"] = value
-        chart_pvs[value]["line_style"] = Qt.SolidLine
-        chart_pvs[value]["symbol"] = None
-        chart_pvs[value]["symbol_size"] = 1
-
-        index_to_pv_names[key_index] = value
-    else:
-        pv_name = index_to_pv_names[key_index]
-        converted_content = StripToolConfigImporter.CONVERSION_TABLE[key_specific_item]
-
-        if isinstance(converted_content, tuple):
-            if converted_content[0]:
-                converted_content[1](converted_content[0], chart_pvs[pv_name], value)
-            else:
-                converted_content[1](chart_pvs[pv_name], value)
+        Parameters
+        ----------
+        key : str
+            A key from the StripTool config file
+        value : str
+            A value paired with a key from the StripTool config file
+        """
+        if key == "Strip.Option.GraphLineWidth":
+            self.line_width = int(value)
+        elif "Strip.Curve" in key:
+            self._add_to_curves(key, value)
+        elif "Strip.Color" in key:
+            self.colors.append(_adjust_color_value(value))
+
+        _apply_conversion(StripToolConfigImporter.CONVERSION_TABLE.get(key, None),
+                          self.timechart_settings["chart_settings"], value)
+
+    def _add_to_curves(self, key, value):
+        """
+        Form a list of PVs from parsing the StripTool configuration file.
+        Then, determine the specific values for each PV to assign to the TimeChart configuration data structure.
+
+        Parameters
+        ----------
+        key : str
+            A key from the StripTool config file
+        value : str
+            A value paired with a key from the StripTool config file
+        """
+        chart_pvs = self.timechart_settings["pvs"]
+        key_components = key.split('.')
+        key_specific_item = key_components[-1]
+        key_index = int(key_components[-2])
+
+        if "Name" in key:
+            value = "ca://" + value
+            chart_pvs[value] = OrderedDict()
+            chart_pvs[value]["line_width"] = self.line_width
+            chart_pvs[value]["y_channel"] = value
+            chart_pvs[value]["line_style"] = Qt.SolidLine
+            chart_pvs[value]["symbol"] = None
+            chart_pvs[value]["symbol_size"] = 1
+
+            self.index_to_pv_names[key_index] = value
         else:
-            chart_pvs[pv_name][converted_content] = value
+            pv_name = self.index_to_pv_names[key_index]
+            _apply_conversion(StripToolConfigImporter.CONVERSION_TABLE[key_specific_item], chart_pvs[pv_name], value)
 
 
-def _customize_colors(value):
+def _apply_conversion(converted_content, settings, value):
     """
-    Add the StripTool-defined colors to TimeChart's random color collections.
+    Assign a StripTool value to the TimeChart settings, as described by an entry of the conversion table.
 
     Parameters
     ----------
-    value : QColor
-        A StripTool-defined color, as specified in the StripTool config file.
+    converted_content : str or tuple or None
+        The TimeChart key, or the TimeChart key and the function to convert the value with. Nothing is assigned if
+        None.
+    settings : OrderedDict
+        The TimeChart settings to assign the value to.
+    value : str
+        The StripTool value.
     """
-    add_striptool_color(_adjust_color_value(value))
+    if isinstance(converted_content, tuple):
+        if converted_content[0]:
+            converted_content[1](converted_content[0], settings, value)
+        else:
+            converted_content[1](settings, value)
+    elif converted_content:
+        settings[converted_content] = value
 
 
-def _convert_to_line_width(_, __, line_width_value):
+def iter_striptool_settings(settings_file):
     """
-    Since StripTool defines the same line width for all curves while TimeChart lets each curve have its own line width,
-    here we must import the global StripTool line width, save it to a global variable, and then, whenever it's time
-    to provide the line width for a curve, retrieve the global line width variable to assign to that curve.
+    Parse the lines of a StripTool config file one at a time, without reading the whole file first.
+    Each line holds a key, then a value separated by spaces.
 
     Parameters
     ----------
-    line_width_value : str
-        The line width as set by the StripTool config file.
+    settings_file : iterable
+        The file object, or any other iterable of lines, to parse
+
+    Yields
+    ------
+        The key and the value of each line. The value is None if the line has no value.
     """
-    global LINE_WIDTH
-    LINE_WIDTH = int(line_width_value)
+    for line in settings_file:
+        tokens = line.split(None, 1)
+        if not tokens:
+            continue
+        yield tokens[0], tokens[1].rstrip() if len(tokens) > 1 else None
 
 
 class StripToolConfigImporter(TimeChartConfigImporter):
@@ -154,7 +192,6 @@ class StripToolConfigImporter(TimeChartConfigImporter):
         "Strip.Color.Grid": ("axis_color", _convert_to_qcolor),
         "Strip.Option.GridXon": ("show_x_grid", _convert_to_bool),
         "Strip.Option.GridYon": ("show_y_grid", _convert_to_bool),
-        "Strip.Option.GraphLineWidth": ("line_width", _convert_to_line_width)
     }
 
     def __init__(self, pydm_main_display):
@@ -168,7 +205,7 @@ class StripToolConfigImporter(TimeChartConfigImporter):
 
     def import_to_dict(self, settings_file):
         """
-        Parse the StripTool config file.
+        Parse the StripTool config file, line by line.
 
         Parameters
         ----------
@@ -179,11 +216,9 @@ class StripToolConfigImporter(TimeChartConfigImporter):
         -------
             The file data as a dictionary
         """
-        lines = [line.rstrip('\n') for line in settings_file.readlines()]
-        stp_data = self._read_file_into_dict(lines)
-        return stp_data
+        return OrderedDict(iter_striptool_settings(settings_file))
 
-    def convert_to_timechart_setting(self, stp_data):
+    def convert_to_timechart_setting(self, stp_data, striptool_colors=None):
         """
         Convert StripTool settings into TimeChart settings
 
@@ -191,6 +226,8 @@ class StripToolConfigImporter(TimeChartConfigImporter):
         ----------
         stp_data : dict
             The StripTool data to convert.
+        striptool_colors : list
+            If provided, the colors defined by the StripTool file are appended to this list.
 
         Returns
         -------
@@ -214,46 +251,10 @@ class StripToolConfigImporter(TimeChartConfigImporter):
         timechart_settings["chart_settings"]["show_legend"] = False
         timechart_settings["chart_settings"]["grid_alpha"] = 5
 
-        index_to_pv_name = OrderedDict()
+        conversion = _StripToolConversion(timechart_settings)
         for k, v in stp_data.items():
-            converted_content = StripToolConfigImporter.CONVERSION_TABLE.get(k, None)
-
-            if "Strip.Curve" in k:
-                _add_to_curves(k, v, timechart_settings["pvs"], index_to_pv_name)
-            elif "Strip.Color" in k:
-                _customize_colors(v)
-
-            if isinstance(converted_content, tuple):
-                if converted_content[0]:
-                    converted_content[1](converted_content[0], timechart_settings["chart_settings"], v)
-                else:
-                    converted_content[1](timechart_settings["chart_settings"], v)
-            elif converted_content:
-                timechart_settings["chart_settings"][converted_content] = v
+            conversion.add(k, v)
 
+        if striptool_colors is not None:
+            striptool_colors.extend(conversion.colors)
         return timechart_settings
-
-    def _read_file_into_dict(self, file_contents):
-        """
-        Parse a file's contents into a dictionary for subsequent filtering.
-        For each line, expect two strings, separated by a space. The first string becomes a dictionary entry's key,
-        and the next one is the dictionary entry's value.
-
-        Parameters
-        ----------
-        file_contents : list
-            A list of strings, each of which is a line from a text file
-
-        Returns
-        -------
-            A dictionary with the keys and values parsed from the file contents.
-        """
-        settings_modules = OrderedDict()
-        for line in file_contents:
-            tokens = re.sub(' +', ' ', line.lstrip())
-            tokens = tokens.split(' ', 1)
-            try:
-                settings_modules[tokens[0]] = tokens[1]
-            except IndexError:
-                settings_modules[tokens[0]] = None
-        return settings_modules
@@ -2,10 +2,19 @@
 The settings importer to process TimeChart configuration data
 """
 
+from collections import namedtuple
+
 from qtpy.QtGui import QColor
 
-from ...displays.defaults import ASYNC_DATA_SAMPLING, SYNC_DATA_SAMPLING
+from ...displays.defaults import (ASYNC_DATA_SAMPLING, SYNC_DATA_SAMPLING, CAPTURE_DATA_SAMPLING,
+                                  MIN_DATA_SAMPLING_RATE_HZ, MAX_DATA_SAMPLING_RATE_HZ)
 from ...utilities.utils import random_color
+from ..config_schema import validate_settings
+
+
+# The final sampling settings of the chart, computed from the settings before any of them is applied. The time span is
+# None if the chart's time span isn't limited.
+SamplingPlan = namedtuple("SamplingPlan", ["data_sampling_mode", "update_interval", "time_span", "buffer_size"])
 
 
 class TimeChartConfigImporter(object):
@@ -40,14 +49,41 @@ class TimeChartConfigImporter(object):
             A dictionary containing widgets as the keys, and the widget values as the values.
         """
         for widget, widget_value in chart_values.items():
+            if isinstance(widget.value(), int):
+                # The values of the integer widgets may be written as floats, e.g. the grid opacity
+                widget_value = int(round(float(widget_value)))
             widget.setValue(widget_value)
 
-        self.main_display.handle_data_sampling_rate_changed()
         self.main_display.handle_redraw_rate_changed()
-        if self.main_display.chart_limit_time_span_chk.isChecked():
-            self.main_display.chart_limit_time_span_chk.clicked.emit(True)
-            self.main_display.handle_time_span_changed()
-            self.main_display.chart_limit_time_span_activate_btn.clicked.emit()
+        self.main_display.handle_curve_status_refresh_rate_changed()
+
+    def plan_sampling(self, chart_settings):
+        """
+        Compute the final sampling settings of the chart from the chart settings, so that the buffers are allocated
+        once, at their final size, instead of after each setting affecting their size.
+
+        Parameters
+        ----------
+        chart_settings : dict
+            The chart settings of a config
+
+        Returns
+        -------
+        SamplingPlan
+            The data sampling mode, update interval in seconds, time span in seconds, and buffer size to apply.
+        """
+        data_sampling_mode = chart_settings["data_sampling_mode"]
+        update_interval_hz = int(round(float(chart_settings["update_interval_hz"])))
+        update_interval_hz = min(max(update_interval_hz, MIN_DATA_SAMPLING_RATE_HZ), MAX_DATA_SAMPLING_RATE_HZ)
+
+        time_span = None
+        if data_sampling_mode == ASYNC_DATA_SAMPLING and chart_settings["limit_time_span"]:
+            time_span = (int(chart_settings["time_span_limit_hours"]) * 3600 +
+                         int(chart_settings["time_span_limit_minutes"]) * 60 +
+                         int(chart_settings["time_span_limit_seconds"])) or None
+
+        return SamplingPlan(data_sampling_mode, 1.0 / update_interval_hz, time_span,
+                            int(chart_settings["buffer_size"]))
 
     def _set_chart_checkboxes(self, checked_data):
         """
@@ -91,72 +127,165 @@ class TimeChartConfigImporter(object):
 
         self.main_display : PyDMDisplay
             The TimeChart's Main Display
-        """        
-        pv_settings = settings["pvs"]
-        for k, v in pv_settings.items():
-            color_value = v.get("color", None)
-            color = QColor(color_value) if color_value else random_color(curve_colors_only=True)
-            self.main_display.add_y_channel(pv_name=v["y_channel"],
-                                            curve_name=k,
-                                            color=color,
-                                            line_style=v["line_style"],
-                                            line_width=v["line_width"],
-                                            symbol=v["symbol"],
-                                            symbol_size=v["symbol_size"],
-                                            is_visible=v.get("is_visible", True))
+        """
+        # Refuse an invalid config before anything is changed, rather than leaving the config half-applied
+        settings = validate_settings(settings)
+
+        # The curves of a config imported earlier, and still waiting to be added, are replaced by those of this config
+        self.main_display.curve_loader.cancel()
+        channel_settings = self._channel_settings(settings)
+        for curve_settings in channel_settings:
+            curve_settings["color"] = curve_settings["color"] or random_color(curve_colors_only=True)
 
         chart_settings = settings["chart_settings"]
         if len(chart_settings):
-            self.main_display.chart_title_line_edt.textChanged.emit(
-                chart_settings["title"])
-
-            chart_labels = {
-                "bottom": (chart_settings["x_axis_label"], chart_settings["x_axis_unit"]),
-            }
-            if chart_settings.get("show_right_y_axis", False):
-                chart_labels["right"] = (chart_settings["right_axis_label"], chart_settings["right_axis_unit"]),
-            if chart_settings.get("left_axis_label", None):
-                chart_labels["left"] = (chart_settings["left_axis_label"], chart_settings["left_axis_unit"]),
-            self._set_chart_labels(chart_labels)
-
-            data_sampling_mode = chart_settings["data_sampling_mode"]
-            chart_checked_data = {
-                self.main_display.chart_sync_mode_sync_radio: data_sampling_mode == SYNC_DATA_SAMPLING,
-                self.main_display.chart_sync_mode_async_radio: data_sampling_mode == ASYNC_DATA_SAMPLING,
-                self.main_display.chart_limit_time_span_chk: chart_settings["limit_time_span"],
-                self.main_display.show_legend_chk: chart_settings["show_legend"],
-                self.main_display.show_x_grid_chk: chart_settings["show_x_grid"],
-                self.main_display.show_y_grid_chk: chart_settings["show_y_grid"]
-            }
-            self._set_chart_checkboxes(chart_checked_data)
-            self.main_display.show_legend_chk.clicked.emit(chart_settings["show_legend"])
-            self.main_display.show_x_grid_chk.clicked.emit(chart_settings["show_x_grid"])
-            self.main_display.show_y_grid_chk.clicked.emit(chart_settings["show_y_grid"])
-
-            chart_values = {
-                self.main_display.chart_redraw_rate_spin: chart_settings["redraw_rate"],
-                self.main_display.chart_data_async_sampling_rate_spin: chart_settings["update_interval_hz"],
-                self.main_display.grid_opacity_slr: chart_settings["grid_alpha"],
-            }
-
-            time_span_limit_hours = int(chart_settings["time_span_limit_hours"])
-            time_span_limit_minutes = int(chart_settings["time_span_limit_minutes"])
-            time_span_limit_seconds = int(chart_settings["time_span_limit_seconds"])
-            timespan_values = {
-                self.main_display.chart_limit_time_span_hours_spin_box: time_span_limit_hours,
-                self.main_display.chart_limit_time_span_minutes_spin_box: time_span_limit_minutes,
-                self.main_display.chart_limit_time_span_seconds_spin_box: time_span_limit_seconds,
-            }
-            chart_values.update(timespan_values)
-            self._set_chart_values(chart_values)
-
-            self.main_display.chart_ring_buffer_size_edt.setText(str(chart_settings["buffer_size"]))
-            self.main_display.handle_buffer_size_changed()
-
-            color_data = {
-                self.main_display.background_color_btn: (chart_settings["background_color"],
-                                                         self.main_display.chart.setBackgroundColor),
-                self.main_display.axis_color_btn: (chart_settings["axis_color"],
-                                                   self.main_display.chart.setAxisColor)
-            }
-            self._set_chart_colors(color_data)
+            self._commit_chart_settings(chart_settings)
+
+        # The curves are added a batch at a time from the event loop, so after the chart settings are applied. They
+        # are created with the chart's final settings, e.g. its buffer size and data sampling mode. The legend and the
+        # grid are laid out again once the curves, and their axes, are added.
+        on_loaded = (lambda: self._apply_legend_and_grid(chart_settings)) if len(chart_settings) else None
+        self.main_display.load_y_channels(channel_settings, on_loaded=on_loaded)
+
+    def update_settings(self, settings):
+        """
+        Apply the settings of a config again after it changed, e.g. a watched config file. The curves are compared to
+        the curves of the Main Display: only the curves of PVs no longer in the config are removed, the curves of new
+        PVs added, and the settings that changed applied to the other curves, which keep their data and their
+        connections. The chart settings are only applied again if they changed since they were last applied.
+
+        Parameters
+        ----------
+        settings : OrderedDict
+            A dictionary of all the imported settings
+        """
+        settings = validate_settings(settings)
+
+        # Compare with all the curves, including those still waiting to be added
+        self.main_display.curve_loader.finish()
+        channel_settings = self._channel_settings(settings)
+        pv_names = set(curve_settings["pv_name"] for curve_settings in channel_settings)
+        for pv_name in [pv_name for pv_name in self.main_display.channel_map if pv_name not in pv_names]:
+            self.main_display.remove_curve(pv_name)
+
+        chart_settings = settings["chart_settings"]
+        if len(chart_settings) and chart_settings != self.main_display.imported_chart_settings:
+            self._commit_chart_settings(chart_settings)
+
+        new_channel_settings = []
+        for curve_settings in channel_settings:
+            if curve_settings["pv_name"] in self.main_display.channel_map:
+                self.main_display.update_y_channel(**curve_settings)
+            else:
+                curve_settings["color"] = curve_settings["color"] or random_color(curve_colors_only=True)
+                new_channel_settings.append(curve_settings)
+        self.main_display.add_y_channels(new_channel_settings)
+
+    def _channel_settings(self, settings):
+        """
+        Provide the parameters of the Main Display's add_y_channel for each curve of a config, with a None color for
+        the curves without a color.
+        """
+        channel_settings = list()
+        for k, v in settings["pvs"].items():
+            color_value = v["color"]
+            update_interval_hz = v["update_interval_hz"]
+            channel_settings.append(dict(pv_name=v["y_channel"],
+                                         curve_name=k,
+                                         color=QColor(color_value) if color_value else None,
+                                         line_style=v["line_style"],
+                                         line_width=v["line_width"],
+                                         symbol=v["symbol"],
+                                         symbol_size=v["symbol_size"],
+                                         is_visible=v["is_visible"],
+                                         buffer_size=v["buffer_size"],
+                                         update_interval=1 / update_interval_hz if update_interval_hz else None))
+        return channel_settings
+
+    def _commit_chart_settings(self, chart_settings):
+        """
+        Apply the chart settings of a config, resizing the buffers once, to the planned buffer size, after all the
+        chart settings are applied.
+        """
+        plan = self.plan_sampling(chart_settings)
+        with self.main_display.chart.applying_settings():
+            self._apply_chart_settings(chart_settings, plan)
+        self.main_display.chart_ring_buffer_size_edt.setText(str(self.main_display.chart.getBufferSize()))
+        self.main_display.imported_chart_settings = chart_settings
+
+    def _apply_legend_and_grid(self, chart_settings):
+        """
+        Show the legend and the grid of the chart as set by the chart settings of a config.
+        """
+        self.main_display.show_legend_chk.clicked.emit(chart_settings["show_legend"])
+        self.main_display.show_x_grid_chk.clicked.emit(chart_settings["show_x_grid"])
+        self.main_display.show_y_grid_chk.clicked.emit(chart_settings["show_y_grid"])
+
+    def _apply_chart_settings(self, chart_settings, plan):
+        """
+        Apply the chart settings of a config through the widgets of the Data and Graph tabs.
+
+        Parameters
+        ----------
+        chart_settings : dict
+            The chart settings of the config
+        plan : SamplingPlan
+            The final sampling settings of the chart
+        """
+        self.main_display.build_settings_tabs()
+        self.main_display.chart_title_line_edt.textChanged.emit(
+            chart_settings["title"])
+
+        chart_labels = {
+            "bottom": (chart_settings["x_axis_label"], chart_settings["x_axis_unit"]),
+        }
+        if chart_settings["show_right_y_axis"]:
+            chart_labels["right"] = (chart_settings["right_y_axis_label"], chart_settings["right_y_axis_unit"])
+        if chart_settings["left_y_axis_label"]:
+            chart_labels["left"] = (chart_settings["left_y_axis_label"], chart_settings["left_y_axis_unit"])
+        self._set_chart_labels(chart_labels)
+
+        # Select the storage first, so that the buffers are moved at most once, before being resized
+        self.main_display.set_storage_backend(chart_settings["storage_backend"], chart_settings["cache_dir"])
+        self.main_display.set_value_precision(chart_settings["value_precision"])
+        self.main_display.set_memory_budget(chart_settings["memory_budget_mb"])
+        self.main_display.set_render_mode(chart_settings["render_mode"])
+
+        chart_checked_data = {
+            self.main_display.chart_sync_mode_sync_radio: plan.data_sampling_mode == SYNC_DATA_SAMPLING,
+            self.main_display.chart_sync_mode_async_radio: plan.data_sampling_mode == ASYNC_DATA_SAMPLING,
+            self.main_display.chart_sync_mode_capture_radio: plan.data_sampling_mode == CAPTURE_DATA_SAMPLING,
+            self.main_display.chart_limit_time_span_chk: chart_settings["limit_time_span"],
+            self.main_display.show_legend_chk: chart_settings["show_legend"],
+            self.main_display.show_x_grid_chk: chart_settings["show_x_grid"],
+            self.main_display.show_y_grid_chk: chart_settings["show_y_grid"]
+        }
+        self._set_chart_checkboxes(chart_checked_data)
+        self._apply_legend_and_grid(chart_settings)
+
+        chart_values = {
+            self.main_display.chart_redraw_rate_spin: chart_settings["redraw_rate"],
+            self.main_display.curve_status_refresh_rate_spin: chart_settings["curve_status_refresh_rate"],
+            self.main_display.chart_data_async_sampling_rate_spin: chart_settings["update_interval_hz"],
+            self.main_display.grid_opacity_slr: chart_settings["grid_alpha"],
+            self.main_display.chart_limit_time_span_hours_spin_box: chart_settings["time_span_limit_hours"],
+            self.main_display.chart_limit_time_span_minutes_spin_box: chart_settings["time_span_limit_minutes"],
+            self.main_display.chart_limit_time_span_seconds_spin_box: chart_settings["time_span_limit_seconds"],
+        }
+        self._set_chart_values(chart_values)
+
+        self.main_display.chart.setUpdateInterval(plan.update_interval)
+        if plan.time_span:
+            self.main_display.chart_limit_time_span_chk.clicked.emit(True)
+            self.main_display.handle_time_span_changed()
+            self.main_display.chart.setTimeSpan(plan.time_span)
+        # Let the chart fit the buffer size within the memory budget, rather than refusing it
+        self.main_display.chart.setBufferSize(plan.buffer_size)
+
+        color_data = {
+            self.main_display.background_color_btn: (chart_settings["background_color"],
+                                                     self.main_display.chart.setBackgroundColor),
+            self.main_display.axis_color_btn: (chart_settings["axis_color"],
+                                               self.main_display.chart.setAxisColor)
+        }
+        self._set_chart_colors(color_data)
@@ -7,6 +7,7 @@ import json
 
 from pydm import utilities
 from timechart import __version__ as ver
+from .config_schema import CONFIG_SCHEMA_VERSION, SCHEMA_VERSION_KEY
 
 
 class SettingsExporter:
@@ -39,11 +40,14 @@ class SettingsExporter:
         """
         settings = OrderedDict()
         settings["__version__"] = str(ver)
+        settings[SCHEMA_VERSION_KEY] = CONFIG_SCHEMA_VERSION
         settings["pvs"] = OrderedDict()
         settings["chart_settings"] = OrderedDict()
         chart = self.main_display.chart
 
         if self.include_pvs:
+            # Export all the curves, even those still waiting to be added
+            self.main_display.curve_loader.finish()
             pv_list = list()
             for k, v in self.main_display.channel_map.items():
                 curve_settings = OrderedDict()
@@ -55,11 +59,16 @@ class SettingsExporter:
                 curve_settings["line_width"] = v.lineWidth
                 curve_settings["symbol"] = v.symbol
                 curve_settings["symbol_size"] = v.symbolSize
+                curve_settings["buffer_size"] = curve.own_buffer_size
+                curve_settings["update_interval_hz"] = 1 / curve.own_update_interval if curve.own_update_interval \
+                    else None
 
                 pv_list.append((k, curve_settings))
             for item in pv_list:
                 settings["pvs"][item[0]] = item[1]
         if self.include_chart_settings:
+            # Some chart settings are only kept by the widgets of the Data and Graph tabs
+            self.main_display.build_settings_tabs()
             chart_settings = OrderedDict()
             chart_settings["title"] = chart.getPlotTitle()
 
@@ -78,24 +87,26 @@ class SettingsExporter:
             chart_settings["right_y_axis_unit"] = chart.units["right"]
 
             chart_settings["redraw_rate"] = chart.maxRedrawRate
+            chart_settings[
+                "curve_status_refresh_rate"] = self.main_display.curve_status_refresh_rate_spin.value()
+            chart_settings["render_mode"] = chart.getRenderMode()
             chart_settings[
                 "data_sampling_mode"] = self.main_display.data_sampling_mode
             chart_settings["update_interval_hz"] = 1 / chart.getUpdateInterval()
             chart_settings[
                 "limit_time_span"] = self.main_display.chart_limit_time_span_chk.isChecked()
 
-            time_span_limit_hours = self.main_display.chart_limit_time_span_minutes_spin_box.text()
-            time_span_limit_minutes = self.main_display.chart_limit_time_span_minutes_spin_box.text()
-            time_span_limit_seconds = self.main_display.chart_limit_time_span_seconds_spin_box.text()
-
-            chart_settings[
-                "time_span_limit_hours"] = time_span_limit_hours if time_span_limit_hours else 0
-            chart_settings[
-                "time_span_limit_minutes"] = time_span_limit_minutes if time_span_limit_minutes else 0
-            chart_settings[
-                "time_span_limit_seconds"] = time_span_limit_seconds if time_span_limit_seconds else 0
+            chart_settings["time_span_limit_hours"] = self.main_display.chart_limit_time_span_hours_spin_box.value()
+            chart_settings["time_span_limit_minutes"] = \
+                self.main_display.chart_limit_time_span_minutes_spin_box.value()
+            chart_settings["time_span_limit_seconds"] = \
+                self.main_display.chart_limit_time_span_seconds_spin_box.value()
 
             chart_settings["buffer_size"] = chart.getBufferSize()
+            chart_settings["storage_backend"] = chart.getStorageBackend()
+            chart_settings["cache_dir"] = chart.getCacheDirectory()
+            chart_settings["value_precision"] = chart.getValuePrecision()
+            chart_settings["memory_budget_mb"] = self.main_display.chart_memory_budget_spin.value()
             chart_settings["show_legend"] = chart.getShowLegend()
             chart_settings["background_color"] = str(
                 utilities.colors.svg_color_from_hex(
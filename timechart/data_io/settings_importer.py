@@ -2,12 +2,13 @@
 Configuration Data Importing, for Both TimeChart and StripTool Configuration Files
 """
 
+import io
 import six
 import json
 
 from .importers.timechart_config_importer import TimeChartConfigImporter
 from .importers.striptool_config_importer import StripToolConfigImporter
-from ..utilities.utils import serialize_colors
+from ..utilities.utils import serialize_colors, add_striptool_color
 
 
 import logging
@@ -23,13 +24,17 @@ class SettingsImporter:
     Import configuration data from files exported from different sources, i.e. TimeChart and
     StripTool.
     """
-    def __init__(self, pydm_main_display=None):
+    def __init__(self, pydm_main_display=None, config_cache=None):
         """
         Parameters
         ----------
         pydm_main_display : PyDMDisplay
             The Main Window object.
+        config_cache : ConfigCache
+            The cache to read the parsed config files from, and to add the config files parsed to. If None, the config
+            files are always parsed.
         """
+        self.config_cache = config_cache
         self.timechart_importer = TimeChartConfigImporter(pydm_main_display)
         self.striptool_importer = StripToolConfigImporter(pydm_main_display)
 
@@ -42,22 +47,74 @@ class SettingsImporter:
         filename : The path to a configuration data file.
         """
         try:
-            with open(filename, 'r') as settings_file:
-                if filename.endswith(".stp"):
-                    logger.warning("The StripTool config file format will soon be unsupported. You can convert this "
-                                   "file to the TimeChart config format by clicking on the Export button, then select "
-                                   "Chart Settings while running TimeChart.")
-                    timechart_settings = self.convert_stp_file(settings_file)
-                else:
-                    timechart_settings = json.load(settings_file)
-
             # Apply the settings as TimeChart settings, now that we have all the file data converted to the same
             # TimeChart config format
-            self.timechart_importer.apply_settings(timechart_settings)
+            self.timechart_importer.apply_settings(self.read_settings(filename))
+        except Exception as error:
+            six.raise_from(SettingsImporterException(str(error)), error)
+
+    def update_settings(self, filename):
+        """
+        Apply the settings of a file again after it changed, only adding, removing, or restyling the curves that
+        changed, so that the other curves keep their data and their connections.
+
+        Parameters
+        ----------
+        filename : The path to a configuration data file.
+        """
+        try:
+            self.timechart_importer.update_settings(self.read_settings(filename))
         except Exception as error:
             six.raise_from(SettingsImporterException(str(error)), error)
 
-    def convert_stp_file(self, stp_file_handle, new_timechart_file=None):
+    def read_settings(self, filename):
+        """
+        Read the settings of a TimeChart JSON file, or of a StripTool .stp file converted to the TimeChart format.
+
+        Parameters
+        ----------
+        filename : The path to a configuration data file.
+
+        Returns
+        -------
+            The TimeChart settings dictionary.
+        """
+        if filename.endswith(".stp"):
+            logger.warning("The StripTool config file format will soon be unsupported. You can convert this "
+                           "file to the TimeChart config format by clicking on the Export button, then select "
+                           "Chart Settings while running TimeChart.")
+        with open(filename, 'rb') as settings_file:
+            content = settings_file.read()
+
+        cached = self.config_cache.load(filename, content) if self.config_cache else None
+        if cached is None:
+            cached = self._parse_settings(filename, content)
+            if self.config_cache:
+                self.config_cache.store(filename, content, cached)
+        timechart_settings, striptool_colors = cached
+
+        # Pick the colors of the curves without a color from the colors the StripTool file defines
+        for color in striptool_colors:
+            add_striptool_color(color)
+        return timechart_settings
+
+    def _parse_settings(self, filename, content):
+        """
+        Parse the content of a TimeChart JSON file, or of a StripTool .stp file into the TimeChart format.
+
+        Returns
+        -------
+            The TimeChart settings dictionary, and the colors defined by the StripTool file : tuple
+        """
+        striptool_colors = list()
+        if filename.endswith(".stp"):
+            timechart_settings = self.convert_stp_file(io.StringIO(content.decode()),
+                                                       striptool_colors=striptool_colors)
+        else:
+            timechart_settings = json.loads(content)
+        return timechart_settings, striptool_colors
+
+    def convert_stp_file(self, stp_file_handle, new_timechart_file=None, striptool_colors=None):
         """
         Convert a StripTool STP file into the TimeChart config data, and write to a TimeChart JSON config file if
         requested.
@@ -68,6 +125,8 @@ class SettingsImporter:
             The handle to the STP config file
         new_timechart_file : str
             The full path to the TimeChart file to write the TimeChart config dict to.
+        striptool_colors : list
+            If provided, the colors defined by the STP file are appended to this list.
 
         Returns
         -------
@@ -78,7 +137,7 @@ class SettingsImporter:
         stp_data = self.striptool_importer.import_to_dict(stp_file_handle)
 
         # Convert to the equivalent TimeChart settings
-        timechart_settings = self.striptool_importer.convert_to_timechart_setting(stp_data)
+        timechart_settings = self.striptool_importer.convert_to_timechart_setting(stp_data, striptool_colors)
 
         if new_timechart_file:
             serialize_colors(timechart_settings)
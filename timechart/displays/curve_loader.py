@@ -0,0 +1,157 @@
+"""
+The Progressive Addition of Curves to the Main Display
+"""
+
+from collections import deque
+import logging
+import time
+
+from qtpy.QtCore import QObject, QTimer, Signal
+
+from .defaults import CURVE_LOADING_BATCH_MS
+
+logger = logging.getLogger(__name__)
+
+
+class CurveLoader(QObject):
+    """
+    Add curves to the Main Display a batch at a time from the event loop, so that the display shows up right away, and
+    stays responsive, while many curves are added, e.g. from a large config file or a long --pvs list.
+
+    Each batch adds its curves with a single call, so that the legend and the curve controls are laid out once per
+    batch, and then leaves the event loop to paint the display and handle the user input before the next batch. The
+    number of curves of a batch is fit to the time the previous batch took per curve, for each batch to take about
+    CURVE_LOADING_BATCH_MS. The channels of the curves connect in the background, so their connections are opened
+    concurrently, without a batch waiting for them.
+    """
+    # The number of curves added, and the number of curves queued since loading started
+    progressChanged = Signal(int, int)
+    # All the curves queued are added
+    finished = Signal()
+
+    def __init__(self, add_curves, parent=None, batch_time_ms=CURVE_LOADING_BATCH_MS):
+        """
+        Parameters
+        ----------
+        add_curves : callable
+            Add a batch of curves at once from a list of the parameters queued for each curve, e.g. the Main Display's
+            add_y_channels
+        parent : QObject, optional
+            The parent of the loader
+        batch_time_ms : int
+            How long each batch adds curves for, in milliseconds
+        """
+        super(CurveLoader, self).__init__(parent)
+        self._add_curves = add_curves
+        self._batch_time = batch_time_ms / 1000.0
+        self._batch_size = 1
+        self._queue = deque()
+        self._added = 0
+        self._total = 0
+        # What to do once the curves queued so far are added
+        self._on_finished = list()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._add_batch)
+
+    @property
+    def is_loading(self):
+        return bool(self._queue)
+
+    def queue(self, curves, on_finished=None):
+        """
+        Queue curves to add.
+
+        Parameters
+        ----------
+        curves : iterable
+            The parameters of each curve, as handed over to add_curves
+        on_finished : callable, optional
+            Called once all the curves queued so far are added, e.g. to lay out the legend of a config's curves. It's
+            not called if the loading is canceled.
+        """
+        self._queue.extend(curves)
+        if on_finished is not None:
+            self._on_finished.append(on_finished)
+        self._total = self._added + len(self._queue)
+        if not self._queue:
+            self._finish()
+            return
+        self.progressChanged.emit(self._added, self._total)
+        self._timer.start()
+
+    def discard(self, is_discarded):
+        """
+        Drop the queued curves matching a condition, e.g. the curve of a PV removed while its curve is still queued.
+
+        Parameters
+        ----------
+        is_discarded : callable
+            Tell from the parameters of a queued curve whether to drop the curve
+        """
+        kept = [curve for curve in self._queue if not is_discarded(curve)]
+        if len(kept) == len(self._queue):
+            return
+        self._total -= len(self._queue) - len(kept)
+        self._queue = deque(kept)
+        if self._queue:
+            self.progressChanged.emit(self._added, self._total)
+        else:
+            self._finish()
+
+    def cancel(self):
+        """
+        Drop the curves not added yet, and what was to be done once they were added.
+        """
+        self._queue.clear()
+        self._on_finished = list()
+        self._finish()
+
+    def finish(self):
+        """
+        Add all the curves left in the queue right away, e.g. before exporting the settings.
+        """
+        if self._queue:
+            self._add(len(self._queue))
+        self._finish()
+
+    def _add_batch(self):
+        started = time.perf_counter()
+        count = self._add(self._batch_size)
+        elapsed = time.perf_counter() - started
+        # Fit the next batch to the batch time, without more than doubling it in case this batch was unusually fast
+        if count == self._batch_size:
+            fitting_size = int(count * self._batch_time / elapsed) if elapsed > 0 else 2 * count
+            self._batch_size = max(min(fitting_size, 2 * count), 1)
+
+        if self._queue:
+            self.progressChanged.emit(self._added, self._total)
+        else:
+            self._finish()
+
+    def _add(self, count):
+        batch = [self._queue.popleft() for _ in range(min(count, len(self._queue)))]
+        try:
+            self._add_curves(batch)
+        except Exception:
+            # Keep loading the other curves
+            logger.exception("Cannot add the curves.")
+        self._added += len(batch)
+        return len(batch)
+
+    def _finish(self):
+        self._timer.stop()
+        self._batch_size = 1
+        on_finished, self._on_finished = self._on_finished, list()
+        for callback in on_finished:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Cannot complete the loading of the curves.")
+        if not self._total:
+            return
+        self.progressChanged.emit(self._total, self._total)
+        self._added = 0
+        self._total = 0
+        self.finished.emit()
@@ -6,10 +6,13 @@ from pydm import Display
 from pydm.widgets.baseplot import BasePlotCurveItem
 
 from qtpy.QtCore import Qt, QSize
-from qtpy.QtWidgets import (QFormLayout, QLabel, QComboBox, QSpinBox,
-                            QPushButton, QColorDialog, QCheckBox, QGroupBox)
+from qtpy.QtWidgets import (QFormLayout, QLabel, QComboBox, QSpinBox, QDoubleSpinBox,
+                            QPushButton, QColorDialog, QMessageBox)
 from qtpy.QtGui import QPalette
 
+from ..utilities.utils import display_message_box, format_bytes
+from .defaults import MAX_CURVE_BUFFER_SIZE, MAX_DATA_SAMPLING_RATE_HZ, CURVE_SAMPLING_RATE_DECIMALS
+
 
 class CurveSettingsDisplay(Display):
     def __init__(self, main_display, pv_name, parent=None):
@@ -51,6 +54,11 @@ class CurveSettingsDisplay(Display):
         self.line_width_lbl = QLabel("Line Width")
         self.line_width_spin = QSpinBox()
 
+        self.buffer_size_lbl = QLabel("Ring Buffer Size")
+        self.buffer_size_spin = QSpinBox()
+        self.sampling_rate_lbl = QLabel("Sampling Rate (Hz)")
+        self.sampling_rate_spin = QDoubleSpinBox()
+
         self.set_defaults_btn = QPushButton("Reset")
         self.set_defaults_btn.clicked.connect(self.handle_reset_button_clicked)
 
@@ -58,7 +66,7 @@ class CurveSettingsDisplay(Display):
         self.close_dialog_btn.clicked.connect(self.handle_close_button_clicked)
 
         self.setWindowTitle(self.pv_name.split("://")[1])
-        self.setFixedSize(QSize(300, 200))
+        self.setFixedSize(QSize(300, 270))
         self.setWindowModality(Qt.ApplicationModal)
 
         self.setup_ui()
@@ -90,6 +98,15 @@ class CurveSettingsDisplay(Display):
             self.line_style_cmb.addItem(k)
         self.line_width_spin.setRange(1, 5)
 
+        # 0 makes the curve follow the chart's buffer size and sampling rate
+        self.buffer_size_spin.setRange(0, MAX_CURVE_BUFFER_SIZE)
+        self.buffer_size_spin.setSpecialValueText("Chart Setting")
+        # A slow channel can be sampled less often than once a second
+        self.sampling_rate_spin.setDecimals(CURVE_SAMPLING_RATE_DECIMALS)
+        self.sampling_rate_spin.setRange(0, MAX_DATA_SAMPLING_RATE_HZ)
+        self.sampling_rate_spin.setSingleStep(0.1)
+        self.sampling_rate_spin.setSpecialValueText("Chart Setting")
+
         # Set the widget values to the current settings of the current curve
         self.set_widgets_to_current_curve_settings()
 
@@ -104,6 +121,11 @@ class CurveSettingsDisplay(Display):
         self.line_width_spin.valueChanged.connect(
             self.handle_line_width_changed)
 
+        self.buffer_size_spin.editingFinished.connect(
+            self.handle_buffer_size_changed)
+        self.sampling_rate_spin.editingFinished.connect(
+            self.handle_sampling_rate_changed)
+
         # Add widgets to the form layout
         self.main_layout.setSpacing(10)
         self.main_layout.addRow(self.curve_color_lbl, self.curve_color_btn)
@@ -111,6 +133,8 @@ class CurveSettingsDisplay(Display):
         self.main_layout.addRow(self.symbol_size_lbl, self.symbol_size_spin)
         self.main_layout.addRow(self.line_style_lbl, self.line_style_cmb)
         self.main_layout.addRow(self.line_width_lbl, self.line_width_spin)
+        self.main_layout.addRow(self.buffer_size_lbl, self.buffer_size_spin)
+        self.main_layout.addRow(self.sampling_rate_lbl, self.sampling_rate_spin)
         self.main_layout.addRow(self.set_defaults_btn, self.close_dialog_btn)
 
         # Add the form layout to the main layout of this dialog
@@ -133,6 +157,10 @@ class CurveSettingsDisplay(Display):
             self.symbol_size_spin.setValue(curve.symbolSize)
             self.line_width_spin.setValue(curve.lineWidth)
 
+            self.buffer_size_spin.setValue(curve.own_buffer_size or 0)
+            interval = curve.own_update_interval
+            self.sampling_rate_spin.setValue(1 / interval if interval else 0)
+
     def set_combo_box(self, combo_box, reference_dict, curve_setting_value):
         """
         Reverse look up for a dictionary key using a dictionary value, and then set that value to a QComboBox widget.
@@ -225,6 +253,42 @@ class CurveSettingsDisplay(Display):
             self.chart.refreshCurve(curve)
             self.channel_map[self.pv_name] = curve
 
+    def handle_buffer_size_changed(self):
+        """
+        Give the curve its own buffer size, or make it follow the chart's buffer size if the Chart Setting is selected.
+        A buffer size exceeding the chart's memory budget is refused.
+        """
+        curve = self.chart.findCurve(self.pv_name)
+        if not curve:
+            return
+
+        buffer_size = self.buffer_size_spin.value() or None
+        if buffer_size == curve.own_buffer_size:
+            return
+
+        memory_budget = self.chart.getMemoryBudget()
+        memory_usage = self.chart.estimateMemoryUsage(own_buffer_sizes={curve: buffer_size})
+        if memory_budget and memory_usage > memory_budget:
+            display_message_box(QMessageBox.Warning, "Memory Budget Exceeded",
+                                "A ring buffer size of {0} for this curve would make the curves use {1}, over the "
+                                "memory budget of {2}.".format(buffer_size, format_bytes(memory_usage),
+                                                               format_bytes(memory_budget)))
+            self.buffer_size_spin.setValue(curve.own_buffer_size or 0)
+            return
+
+        self.chart.setCurveBufferSize(curve, buffer_size)
+        self.buffer_size_spin.setValue(curve.own_buffer_size or 0)
+
+    def handle_sampling_rate_changed(self):
+        """
+        Give the curve its own sampling rate, or make it follow the chart's sampling rate if the Chart Setting is
+        selected.
+        """
+        curve = self.chart.findCurve(self.pv_name)
+        if curve:
+            sampling_rate = self.sampling_rate_spin.value()
+            self.chart.setCurveUpdateInterval(curve, 1.0 / sampling_rate if sampling_rate else None)
+
     def handle_reset_button_clicked(self):
         """
         Handle the click of the Reset button. This will set all the dialog widgets to the default curve appearance
@@ -243,6 +307,11 @@ class CurveSettingsDisplay(Display):
             self.line_style_cmb.setCurrentIndex(1)
             self.line_width_spin.setValue(1)
 
+            self.buffer_size_spin.setValue(0)
+            self.handle_buffer_size_changed()
+            self.sampling_rate_spin.setValue(0)
+            self.handle_sampling_rate_changed()
+
     def closeEvent(self, event):
         self.handle_close_button_clicked()
 
@@ -255,11 +324,8 @@ class CurveSettingsDisplay(Display):
         curve = self.chart.findCurve(self.pv_name)
         if curve:
             # Update the widget checkbox text to the current curve color
-            widget = self.main_display.findChild(QGroupBox, self.pv_name + "_grb")
-            chb = widget.findChild(QCheckBox, self.pv_name + "_chb")
-            lbl = widget.findChild(QLabel, self.pv_name + "_lbl")
-            widget = [chb, lbl]
-            for w in widget:
+            controls = self.main_display.pv_controls[self.pv_name]
+            for w in (controls.checkbox, controls.data_label):
                 palette = w.palette()
                 palette.setColor(QPalette.Active, QPalette.WindowText,
                                  curve.color)
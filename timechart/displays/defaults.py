@@ -2,6 +2,8 @@
 Global Constant Definitions
 """
 
+import os
+
 from qtpy.QtGui import QColor
 
 
@@ -9,9 +11,15 @@ MIN_REDRAW_RATE_HZ = 1
 MAX_REDRAW_RATE_HZ = 240
 DEFAULT_REDRAW_RATE_HZ = 30
 
+MIN_CURVE_STATUS_REFRESH_RATE_HZ = 1
+MAX_CURVE_STATUS_REFRESH_RATE_HZ = 30
+DEFAULT_CURVE_STATUS_REFRESH_RATE_HZ = 4
+
 MIN_DATA_SAMPLING_RATE_HZ = 1
 MAX_DATA_SAMPLING_RATE_HZ = 360
 DEFAULT_DATA_SAMPLING_RATE_HZ = 10
+# The decimals of a curve's own sampling rate, so that a slow channel can be sampled as rarely as every 100 seconds
+CURVE_SAMPLING_RATE_DECIMALS = 2
 
 DEFAULT_EXPORTED_IMAGE_WIDTH = "800"
 DEFAULT_EXPORTED_IMAGE_HEIGHT = "600"
@@ -24,6 +32,55 @@ MAX_DISPLAY_PV_NAME_LENGTH = 30
 
 ASYNC_DATA_SAMPLING = 0
 SYNC_DATA_SAMPLING = 1
+CAPTURE_DATA_SAMPLING = 2
+
+# How often the values captured by the curves in the capture mode are written into their ring buffers
+CAPTURE_FLUSH_INTERVAL_MS = 50
+
+# How long to add curves for at each pass of the event loop, while many curves are added, e.g. from a config file
+CURVE_LOADING_BATCH_MS = 15
+
+# How long a watched config file must stay unchanged before it's applied again, for it to be completely written
+CONFIG_WATCH_DELAY_MS = 500
+
+# The local socket the collector process listens on, followed by the user name, so that each user runs their own
+COLLECTOR_SERVER_NAME = "timechart-collector"
+# How long to wait for the collector process to answer a request before falling back to in-process channels
+COLLECTOR_TIMEOUT_MS = 1000
+# How often the curves fed by the collector process check their shared ring buffers for new samples
+COLLECTOR_POLL_INTERVAL_MS = 50
+
+# The local socket the first TimeChart window listens on for PVs to add, followed by the user name
+INSTANCE_SERVER_NAME = "timechart-instance"
+# How long to wait for the running TimeChart window to take the PVs before starting a new one
+INSTANCE_TIMEOUT_MS = 1000
+
+ALL_POINTS_RENDERING = 0
+MIN_MAX_DECIMATION_RENDERING = 1
+
+MEMORY_STORAGE = 0
+MEMMAP_STORAGE = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "timechart")
+
+# The directory the parsed config files are cached in, the total size its entries are evicted down to, and how long an
+# entry is kept since it was last used
+CONFIG_CACHE_DIR = os.path.join(DEFAULT_CACHE_DIR, "configs")
+CONFIG_CACHE_MAX_MB = 64
+CONFIG_CACHE_MAX_AGE_DAYS = 30
+
+# The precision the buffered values are stored with. The timestamps are always kept in double precision.
+DOUBLE_PRECISION_VALUES = 0
+SINGLE_PRECISION_VALUES = 1
+
+# The largest buffer size that can be given to a single curve
+MAX_CURVE_BUFFER_SIZE = 100000000
+
+# The memory budget for all the curve buffers, 0 meaning no limit
+DEFAULT_MEMORY_BUDGET_MB = 0
+MAX_MEMORY_BUDGET_MB = 1024 * 1024
+
+# The number of raw samples aggregated into each bucket of the finest level of detail
+LOD_MIN_BUCKET_SIZE = 16
 
 X_AXIS_LABEL_SEPARATOR = " -- "
 IMPORT_FILE_FORMAT = "Timechart JSON file (*.json);;TimeChart StripTool file (*.stp);;All files (*.*)"
@@ -6,12 +6,10 @@ import logging
 
 import os
 
+from collections import OrderedDict, namedtuple
 from functools import partial
 import datetime
 
-from pyqtgraph import TextItem
-from pyqtgraph.GraphicsScene import exportDialog
-
 from qtpy.QtCore import Qt, Slot, QTimer
 from qtpy.QtWidgets import (QApplication, QWidget, QCheckBox, QHBoxLayout,
                             QVBoxLayout, QFormLayout, QLabel, QSplitter,
@@ -19,46 +17,67 @@ from qtpy.QtWidgets import (QApplication, QWidget, QCheckBox, QHBoxLayout,
                             QSpinBox, QTabWidget,
                             QColorDialog, QGroupBox, QRadioButton,
                             QMessageBox, QFileDialog, QScrollArea, QFrame,
-                            QSizePolicy, QLayout,
-                            QToolButton, QFontDialog)
+                            QSizePolicy, QLayout, QListWidget,
+                            QToolButton, QFontDialog, QProgressBar)
 from qtpy.QtGui import QColor, QPalette
 
 from pydm import Display
-from pydm.widgets.archiver_time_plot import PyDMArchiverTimePlot
-from pydm.widgets.timeplot import (PyDMTimePlot, DEFAULT_X_MIN,
-                                   MINIMUM_BUFFER_SIZE, DEFAULT_BUFFER_SIZE)
+from pydm.widgets.timeplot import (DEFAULT_X_MIN, MINIMUM_BUFFER_SIZE,
+                                   DEFAULT_BUFFER_SIZE)
 from pydm.utilities.iconfont import IconFont
+from ..data_io.config_watcher import ConfigWatcher
 from ..data_io.settings_importer import SettingsImporter, SettingsImporterException
+from ..data_io.config_cache import ConfigCache
+from ..collector.client import CollectorClient
+from ..widgets.time_chart_plot import TimeChartPlot
+from .curve_loader import CurveLoader
 
-
-from .curve_settings_display import CurveSettingsDisplay
-from .axis_settings_display import AxisSettingsDisplay
-from .chart_data_export_display import ChartDataExportDisplay
-from ..utilities.utils import random_color, display_message_box
+from ..utilities.utils import random_color, display_message_box, format_bytes
+from ..utilities.startup_profile import startup_phase
 
 from .defaults import (
+    ALL_POINTS_RENDERING,
     ASYNC_DATA_SAMPLING,
+    CAPTURE_DATA_SAMPLING,
+    DEFAULT_CACHE_DIR,
     DEFAULT_CHART_AXIS_COLOR,
     DEFAULT_CHART_BACKGROUND_COLOR,
     DEFAULT_CHART_TITLE,
+    DEFAULT_CURVE_STATUS_REFRESH_RATE_HZ,
     DEFAULT_DATA_SAMPLING_RATE_HZ,
+    DEFAULT_MEMORY_BUDGET_MB,
+    DOUBLE_PRECISION_VALUES,
     # DEFAULT_EXPORTED_IMAGE_HEIGHT,
     # DEFAULT_EXPORTED_IMAGE_WIDTH,
     DEFAULT_REDRAW_RATE_HZ,
     IMPORT_FILE_FORMAT,
+    MAX_CURVE_STATUS_REFRESH_RATE_HZ,
     MAX_DATA_SAMPLING_RATE_HZ,
     MAX_DISPLAY_PV_NAME_LENGTH,
+    MAX_MEMORY_BUDGET_MB,
     MAX_REDRAW_RATE_HZ,
+    MEMMAP_STORAGE,
+    MEMORY_STORAGE,
+    MIN_CURVE_STATUS_REFRESH_RATE_HZ,
+    MIN_MAX_DECIMATION_RENDERING,
     MIN_DATA_SAMPLING_RATE_HZ,
     MIN_REDRAW_RATE_HZ,
+    SINGLE_PRECISION_VALUES,
     SYNC_DATA_SAMPLING,
     X_AXIS_LABEL_SEPARATOR,
 )
 
 logger = logging.getLogger(__name__)
 
+
+# The widgets managing a curve from the Curves tab, kept by the display so that frequently run handlers don't have to
+# search the widget tree for them
+PvControls = namedtuple("PvControls", ["group_box", "checkbox", "data_label", "modify_btn", "focus_btn"])
+
+
 class TimeChartDisplay(Display):
-    def __init__(self, parent=None, args=[], macros=None, show_pv_add_panel=True, config_file=None):
+    def __init__(self, parent=None, args=[], macros=None, show_pv_add_panel=True, config_file=None,
+                 use_collector=False, use_config_cache=False):
         """
         Create all the widgets, including any child dialogs.
 
@@ -72,12 +91,22 @@ class TimeChartDisplay(Display):
             Macros to modify the UI parameters at runtime
         show_pv_add_panel : bool
             Whether or not to show the PV add panel on top of the graph
+        config_file : str, optional
+            The configuration file to import once the widgets are created
+        use_collector : bool
+            Whether to have the collector process record the channels, if it's running, instead of connecting them in
+            this process
+        use_config_cache : bool
+            Whether to read the config file from the cache of the parsed config files, if it was parsed before, and to
+            add it to the cache otherwise
         """
         super(TimeChartDisplay, self).__init__(parent=parent, args=args,
                                                macros=macros)
 
         self.legend_font = None
         self.channel_map = dict()
+        self.pv_controls = dict()
+        self.outdated_curve_status_pvs = set()
         self.setWindowTitle("TimeChart Tool")
 
         self.main_layout = QVBoxLayout()
@@ -98,6 +127,13 @@ class TimeChartDisplay(Display):
         self.pv_connect_push_btn = QPushButton("Connect")
         self.pv_connect_push_btn.clicked.connect(self.add_curve)
 
+        self.curve_loading_bar = QProgressBar()
+        self.curve_loading_bar.setFormat("Adding curves: %v of %m")
+        self.curve_loading_bar.setMaximumWidth(250)
+        self.curve_loading_bar.hide()
+        self.curve_loader = CurveLoader(self.add_y_channels, parent=self)
+        self.curve_loader.progressChanged.connect(self.handle_curve_loading_progress)
+
         self.tab_panel = QTabWidget()
         self.tab_panel.setMinimumWidth(350)
         self.tab_panel.setMaximumWidth(350)
@@ -107,11 +143,20 @@ class TimeChartDisplay(Display):
         self.chart_settings_tab = QWidget()
 
         self.charting_layout = QHBoxLayout()
-        self.chart = PyDMTimePlot(plot_by_timestamps=False)
+        self.chart = TimeChartPlot(plot_by_timestamps=False)
         self.chart.setDownsampling(ds=False, auto=False, mode=None)
         self.chart.plot_redrawn_signal.connect(self.update_curve_data)
         self.chart.setBufferSize(DEFAULT_BUFFER_SIZE)
         self.chart.setPlotTitle(DEFAULT_CHART_TITLE)
+        # The Asynchronous data sampling mode, selected in the Data tab by default
+        self.chart.setUpdatesAsynchronously(True)
+
+        self.collector_client = None
+        if use_collector:
+            client = CollectorClient(parent=self)
+            if client.connect_to_collector():
+                self.collector_client = client
+                self.chart.setCollectorClient(client)
 
         self.splitter = QSplitter()
 
@@ -146,14 +191,6 @@ class TimeChartDisplay(Display):
         self.curves_tab_layout = QHBoxLayout()
         self.curves_tab_layout.addWidget(self.curve_settings_scroll)
 
-        self.data_tab_layout = QVBoxLayout()
-        self.data_tab_layout.setAlignment(Qt.AlignTop)
-        self.data_tab_layout.setSpacing(5)
-
-        self.chart_settings_layout = QVBoxLayout()
-        self.chart_settings_layout.setAlignment(Qt.AlignTop)
-        self.chart_settings_layout.setSpacing(5)
-
         self.chart_layout = QVBoxLayout()
         self.chart_layout.setSpacing(10)
 
@@ -236,13 +273,6 @@ class TimeChartDisplay(Display):
         self.pause_chart_btn.clicked.connect(
             self.handle_pause_chart_btn_clicked)
 
-        self.title_settings_layout = QVBoxLayout()
-        self.title_settings_layout.setAlignment(Qt.AlignTop)
-        self.title_settings_layout.setSpacing(5)
-
-        self.title_settings_grpbx = QGroupBox("Title and Legend")
-        self.title_settings_grpbx.setMaximumHeight(120)
-
         self.import_export_data_layout = QVBoxLayout()
         self.import_export_data_layout.setAlignment(Qt.AlignTop)
         self.import_export_data_layout.setSpacing(5)
@@ -255,176 +285,28 @@ class TimeChartDisplay(Display):
         self.export_data_btn.clicked.connect(
             self.handle_export_data_btn_clicked)
 
-        self.chart_title_layout = QHBoxLayout()
-        self.chart_title_layout.setSpacing(10)
-
-        self.chart_title_lbl = QLabel(text="Graph Title")
-        self.chart_title_line_edt = QLineEdit()
-        self.chart_title_line_edt.setText(self.chart.getPlotTitle())
-        self.chart_title_line_edt.textChanged.connect(
-            self.handle_title_text_changed)
-
-        self.chart_title_font_btn = QPushButton()
-        self.chart_title_font_btn.setFixedHeight(24)
-        self.chart_title_font_btn.setFixedWidth(24)
-        self.chart_title_font_btn.setIcon(IconFont().icon("font"))
-        self.chart_title_font_btn.clicked.connect(
-            partial(self.handle_chart_font_changed, "title")
-        )
-
-        self.chart_change_axis_settings_btn = QPushButton(
-            text="Change Axis Settings...")
-        self.chart_change_axis_settings_btn.clicked.connect(
-            self.handle_change_axis_settings_clicked)
-
         self.update_datetime_timer = QTimer(self)
         self.update_datetime_timer.timeout.connect(
             self.handle_update_datetime_timer_timeout)
 
-        self.chart_sync_mode_layout = QVBoxLayout()
-        self.chart_sync_mode_layout.setSpacing(5)
-
-        self.chart_sync_mode_grpbx = QGroupBox("Data Sampling Mode")
-        self.chart_sync_mode_grpbx.setMaximumHeight(100)
-
-        self.chart_sync_mode_sync_radio = QRadioButton("Synchronous")
-        self.chart_sync_mode_async_radio = QRadioButton("Asynchronous")
-        self.chart_sync_mode_async_radio.setChecked(True)
-
-        self.graph_drawing_settings_layout = QVBoxLayout()
-        self.graph_drawing_settings_layout.setAlignment(Qt.AlignVCenter)
-
-        self.chart_interval_layout = QFormLayout()
-
-        self.chart_redraw_rate_lbl = QLabel("Redraw Rate (Hz)")
-        self.chart_redraw_rate_spin = QSpinBox()
-        self.chart_redraw_rate_spin.setRange(MIN_REDRAW_RATE_HZ,
-                                             MAX_REDRAW_RATE_HZ)
-        self.chart_redraw_rate_spin.setValue(DEFAULT_REDRAW_RATE_HZ)
-        self.chart_redraw_rate_spin.editingFinished.connect(
-            self.handle_redraw_rate_changed)
-
-        self.chart_data_sampling_rate_lbl = QLabel("Data Sampling Rate (Hz)")
-        self.chart_data_async_sampling_rate_spin = QSpinBox()
-        self.chart_data_async_sampling_rate_spin.setRange(
-            MIN_DATA_SAMPLING_RATE_HZ, MAX_DATA_SAMPLING_RATE_HZ)
-        self.chart_data_async_sampling_rate_spin.setValue(
-            DEFAULT_DATA_SAMPLING_RATE_HZ)
-        self.chart_data_async_sampling_rate_spin.editingFinished.connect(
-            self.handle_data_sampling_rate_changed)
-        self.chart_data_sampling_rate_lbl.hide()
-        self.chart_data_async_sampling_rate_spin.hide()
-
-        self.chart_limit_time_span_layout = QHBoxLayout()
-        self.chart_limit_time_span_layout.setSpacing(5)
-
-        self.limit_time_plan_text = "Limit Time Span"
-        self.chart_limit_time_span_chk = QCheckBox(self.limit_time_plan_text)
-        self.chart_limit_time_span_chk.hide()
-        self.chart_limit_time_span_lbl = QLabel("Hr:Min:Sec")
-        self.chart_limit_time_span_hours_spin_box = QSpinBox()
-        self.chart_limit_time_span_hours_spin_box.setMaximum(999)
-        self.chart_limit_time_span_minutes_spin_box = QSpinBox()
-        self.chart_limit_time_span_minutes_spin_box.setMaximum(59)
-        self.chart_limit_time_span_seconds_spin_box = QSpinBox()
-        self.chart_limit_time_span_seconds_spin_box.setMaximum(59)
-        self.chart_limit_time_span_activate_btn = QPushButton("Apply")
-        self.chart_limit_time_span_activate_btn.setDisabled(True)
+        self.curve_status_refresh_timer = QTimer(self)
+        self.curve_status_refresh_timer.timeout.connect(
+            self.handle_curve_status_refresh_timer_timeout)
+        self.curve_status_refresh_timer.start(
+            int(1000 / DEFAULT_CURVE_STATUS_REFRESH_RATE_HZ))
 
-        self.chart_ring_buffer_layout = QFormLayout()
-
-        self.chart_ring_buffer_size_lbl = QLabel("Ring Buffer Size")
-        self.chart_ring_buffer_size_edt = QLineEdit()
-        self.chart_ring_buffer_size_edt.returnPressed.connect(
-            self.handle_buffer_size_changed)
-        self.chart_ring_buffer_size_edt.setText(str(DEFAULT_BUFFER_SIZE))
-
-        self.show_legend_chk = QCheckBox("Show Legend")
-        self.show_legend_chk.clicked.connect(
-            self.handle_show_legend_checkbox_clicked)
-        self.show_legend_chk.setChecked(self.chart.showLegend)
-
-        self.legend_font_btn = QPushButton()
-        self.legend_font_btn.setFixedHeight(24)
-        self.legend_font_btn.setFixedWidth(24)
-        self.legend_font_btn.setIcon(IconFont().icon("font"))
-        self.legend_font_btn.clicked.connect(
-            partial(self.handle_chart_font_changed, "legend")
-        )
-
-        self.graph_background_color_layout = QFormLayout()
-        self.axis_grid_color_layout = QFormLayout()
-
-        self.background_color_lbl = QLabel("Graph Background Color ")
-        self.background_color_btn = QPushButton()
-        self.background_color_btn.setStyleSheet(
-            "background-color: " + self.chart.getBackgroundColor().name())
-        self.background_color_btn.setContentsMargins(10, 0, 5, 5)
-        self.background_color_btn.setMaximumWidth(20)
-        self.background_color_btn.clicked.connect(
-            self.handle_background_color_button_clicked)
-
-        self.axis_settings_layout = QVBoxLayout()
-        self.axis_settings_layout.setSpacing(10)
-
-        self.show_x_grid_chk = QCheckBox("Show x Grid")
-        self.show_x_grid_chk.setChecked(self.chart.showXGrid)
-        self.show_x_grid_chk.clicked.connect(
-            self.handle_show_x_grid_checkbox_clicked)
-
-        self.show_y_grid_chk = QCheckBox("Show y Grid")
-        self.show_y_grid_chk.setChecked(self.chart.showYGrid)
-        self.show_y_grid_chk.clicked.connect(
-            self.handle_show_y_grid_checkbox_clicked)
-
-        self.axis_color_lbl = QLabel("Axis and Grid Color")
-        self.axis_color_btn = QPushButton()
-        self.axis_color_btn.setStyleSheet(
-            "background-color: " + DEFAULT_CHART_AXIS_COLOR.name())
-        self.axis_color_btn.setContentsMargins(10, 0, 5, 5)
-        self.axis_color_btn.setMaximumWidth(20)
-        self.axis_color_btn.clicked.connect(
-            self.handle_axis_color_button_clicked)
-
-        self.grid_opacity_lbl = QLabel("Grid Opacity")
-        self.grid_opacity_lbl.setEnabled(False)
-
-        self.grid_opacity_slr = QSlider(Qt.Horizontal)
-        self.grid_opacity_slr.setFocusPolicy(Qt.StrongFocus)
-        self.grid_opacity_slr.setRange(0, 10)
-        self.grid_opacity_slr.setValue(5)
-        self.grid_opacity_slr.setTickInterval(1)
-        self.grid_opacity_slr.setSingleStep(1)
-        self.grid_opacity_slr.setTickPosition(QSlider.TicksBelow)
-        self.grid_opacity_slr.valueChanged.connect(
-            self.handle_grid_opacity_slider_mouse_release)
-        self.grid_opacity_slr.setEnabled(False)
-
-        self.save_data_btn = QPushButton("Save Data to Disk")
-        self.save_data_btn.clicked.connect(
-            self.handle_save_data_btn_clicked)
-
-        self.reset_data_settings_btn = QPushButton("Reset Data Settings")
-        self.reset_data_settings_btn.clicked.connect(
-            self.handle_reset_data_settings_btn_clicked)
-
-        self.reset_chart_settings_btn = QPushButton("Reset Chart Settings")
-        self.reset_chart_settings_btn.clicked.connect(
-            self.handle_reset_chart_settings_btn_clicked)
-
-        self.fullscreen_mode_toggle_btn = QPushButton('Toggle Fullscreen-Like Mode')
-        self.fullscreen_mode_toggle_btn.setCheckable(True)
-        self.fullscreen_mode_toggle_btn.clicked.connect(self.handle_fullscreen_mode_toggled)
+        self.chart.memoryBudgetExceeded.connect(
+            self.handle_memory_budget_exceeded)
+        self.curve_status_refresh_timer.timeout.connect(
+            self.refresh_memory_usage)
+        self.curve_status_refresh_timer.timeout.connect(
+            self.refresh_ingestion_statistics)
 
         self.curve_checkbox_panel = QWidget()
 
-        self.graph_drawing_settings_grpbx = QGroupBox("Graph Intervals")
-        self.graph_drawing_settings_grpbx.setAlignment(Qt.AlignTop)
-
-        self.axis_settings_grpbx = QGroupBox("Graph Appearance")
-
         self.app = QApplication.instance()
-        self.setup_ui()
+        with startup_phase("setup_ui"):
+            self.setup_ui()
 
         self.curve_settings_disp = None
         self.axis_settings_disp = None
@@ -435,12 +317,17 @@ class TimeChartDisplay(Display):
         self.time_span_limit_minutes = None
         self.time_span_limit_seconds = None
         self.data_sampling_mode = ASYNC_DATA_SAMPLING
+        self._settings_tabs_built = False
+        # The chart settings of the config file last imported, to only apply them again if they change
+        self.imported_chart_settings = None
+        self.config_watcher = None
 
         # If there is an imported config file, let's start TimeChart with the imported configuration data
         if config_file:
-            importer = SettingsImporter(self)
+            importer = SettingsImporter(self, config_cache=ConfigCache() if use_config_cache else None)
             try:
-                importer.import_settings(config_file)
+                with startup_phase("config import"):
+                    importer.import_settings(config_file)
             except SettingsImporterException:
                 display_message_box(QMessageBox.Critical, "Import Failure",
                                     "Cannot import the file '{0}'. Check the log for the error details."
@@ -461,6 +348,11 @@ class TimeChartDisplay(Display):
         # No UI file is being used
         return None
 
+    def closeEvent(self, event):
+        # The curves still waiting to be loaded must not be added to a closed window
+        self.curve_loader.cancel()
+        super(TimeChartDisplay, self).closeEvent(event)
+
     def setup_ui(self):
         """
         Initialize the widgets and layouts.
@@ -470,20 +362,17 @@ class TimeChartDisplay(Display):
         self.pv_layout.addWidget(self.pv_protocol_cmb)
         self.pv_layout.addWidget(self.pv_name_line_edt)
         self.pv_layout.addWidget(self.pv_connect_push_btn)
+        self.pv_layout.addWidget(self.curve_loading_bar)
         self.pv_add_panel.setLayout(self.pv_layout)
         QTimer.singleShot(0, self.pv_name_line_edt.setFocus)
 
         self.curve_settings_tab.setLayout(self.curves_tab_layout)
 
-        self.chart_settings_tab.setLayout(self.chart_settings_layout)
-        self.setup_chart_settings_layout()
-
-        self.data_settings_tab.setLayout(self.data_tab_layout)
-        self.setup_data_tab_layout()
-
+        # The Data and Graph tabs stay empty until one of them is selected
         self.tab_panel.addTab(self.curve_settings_tab, "Curves")
         self.tab_panel.addTab(self.data_settings_tab, "Data")
         self.tab_panel.addTab(self.chart_settings_tab, "Graph")
+        self.tab_panel.currentChanged.connect(self.handle_tab_changed)
 
         self.crosshair_settings_layout.addWidget(self.enable_crosshair_chk)
         self.crosshair_settings_layout.addWidget(self.crosshair_coord_lbl)
@@ -548,6 +437,8 @@ class TimeChartDisplay(Display):
         layout.addWidget(button)
         handle.setLayout(layout)
 
+        self.update_datetime_timer.start(1000)
+
     def handle_splitter_button(self, left=True):
         if left:
             self.splitter.setSizes([1, 1])
@@ -588,6 +479,282 @@ class TimeChartDisplay(Display):
 
         dialog.open()
 
+    def build_settings_tabs(self):
+        """
+        Create the widgets of the Data and Graph tabs, unless they're created already. The tabs are only built once
+        one of them is selected, or before their widgets are used, e.g. by the settings importer and exporter, so that
+        they don't delay the first paint of the display.
+        """
+        if self._settings_tabs_built:
+            return
+        self._settings_tabs_built = True
+
+        with startup_phase("build_settings_tabs"):
+            self.create_data_tab_widgets()
+            self.create_chart_settings_tab_widgets()
+
+            self.chart_settings_tab.setLayout(self.chart_settings_layout)
+            self.setup_chart_settings_layout()
+
+            self.data_settings_tab.setLayout(self.data_tab_layout)
+            self.setup_data_tab_layout()
+
+    def handle_tab_changed(self, index):
+        if self.tab_panel.widget(index) in (self.data_settings_tab, self.chart_settings_tab):
+            self.build_settings_tabs()
+
+    def create_data_tab_widgets(self):
+        self.data_tab_layout = QVBoxLayout()
+        self.data_tab_layout.setAlignment(Qt.AlignTop)
+        self.data_tab_layout.setSpacing(5)
+
+        self.chart_sync_mode_layout = QVBoxLayout()
+        self.chart_sync_mode_layout.setSpacing(5)
+
+        self.chart_sync_mode_grpbx = QGroupBox("Data Sampling Mode")
+        self.chart_sync_mode_grpbx.setMaximumHeight(170)
+
+        self.chart_sync_mode_sync_radio = QRadioButton("Synchronous")
+        self.chart_sync_mode_async_radio = QRadioButton("Asynchronous")
+        self.chart_sync_mode_capture_radio = QRadioButton("Capture All Updates")
+        self.chart_sync_mode_async_radio.setChecked(True)
+        self.chart_ingestion_statistics_lbl = QLabel()
+        self.chart_ingestion_statistics_lbl.setWordWrap(True)
+        self.chart_ingestion_statistics_lbl.hide()
+
+        self.graph_drawing_settings_layout = QVBoxLayout()
+        self.graph_drawing_settings_layout.setAlignment(Qt.AlignVCenter)
+
+        self.chart_interval_layout = QFormLayout()
+
+        self.chart_redraw_rate_lbl = QLabel("Redraw Rate (Hz)")
+        self.chart_redraw_rate_spin = QSpinBox()
+        self.chart_redraw_rate_spin.setRange(MIN_REDRAW_RATE_HZ,
+                                             MAX_REDRAW_RATE_HZ)
+        self.chart_redraw_rate_spin.setValue(DEFAULT_REDRAW_RATE_HZ)
+        self.chart_redraw_rate_spin.editingFinished.connect(
+            self.handle_redraw_rate_changed)
+
+        self.curve_status_refresh_rate_lbl = QLabel("Curve Status Rate (Hz)")
+        self.curve_status_refresh_rate_spin = QSpinBox()
+        self.curve_status_refresh_rate_spin.setRange(
+            MIN_CURVE_STATUS_REFRESH_RATE_HZ, MAX_CURVE_STATUS_REFRESH_RATE_HZ)
+        self.curve_status_refresh_rate_spin.setValue(
+            DEFAULT_CURVE_STATUS_REFRESH_RATE_HZ)
+        self.curve_status_refresh_rate_spin.editingFinished.connect(
+            self.handle_curve_status_refresh_rate_changed)
+
+        self.chart_render_mode_lbl = QLabel("Render Mode")
+        self.chart_render_mode_cmb = QComboBox()
+        self.chart_render_mode_cmb.addItem("All Points", ALL_POINTS_RENDERING)
+        self.chart_render_mode_cmb.addItem("Min/Max per Pixel",
+                                           MIN_MAX_DECIMATION_RENDERING)
+        self.chart_render_mode_cmb.currentIndexChanged.connect(
+            self.handle_render_mode_changed)
+
+        self.chart_data_sampling_rate_lbl = QLabel("Data Sampling Rate (Hz)")
+        self.chart_data_async_sampling_rate_spin = QSpinBox()
+        self.chart_data_async_sampling_rate_spin.setRange(
+            MIN_DATA_SAMPLING_RATE_HZ, MAX_DATA_SAMPLING_RATE_HZ)
+        self.chart_data_async_sampling_rate_spin.setValue(
+            DEFAULT_DATA_SAMPLING_RATE_HZ)
+        self.chart_data_async_sampling_rate_spin.editingFinished.connect(
+            self.handle_data_sampling_rate_changed)
+        self.chart_data_sampling_rate_lbl.hide()
+        self.chart_data_async_sampling_rate_spin.hide()
+
+        self.chart_limit_time_span_layout = QHBoxLayout()
+        self.chart_limit_time_span_layout.setSpacing(5)
+
+        self.limit_time_plan_text = "Limit Time Span"
+        self.chart_limit_time_span_chk = QCheckBox(self.limit_time_plan_text)
+        self.chart_limit_time_span_chk.hide()
+        self.chart_limit_time_span_lbl = QLabel("Hr:Min:Sec")
+        self.chart_limit_time_span_hours_spin_box = QSpinBox()
+        self.chart_limit_time_span_hours_spin_box.setMaximum(999)
+        self.chart_limit_time_span_minutes_spin_box = QSpinBox()
+        self.chart_limit_time_span_minutes_spin_box.setMaximum(59)
+        self.chart_limit_time_span_seconds_spin_box = QSpinBox()
+        self.chart_limit_time_span_seconds_spin_box.setMaximum(59)
+        self.chart_limit_time_span_activate_btn = QPushButton("Apply")
+        self.chart_limit_time_span_activate_btn.setDisabled(True)
+
+        self.chart_ring_buffer_layout = QFormLayout()
+
+        self.chart_ring_buffer_size_lbl = QLabel("Ring Buffer Size")
+        self.chart_ring_buffer_size_edt = QLineEdit()
+        self.chart_ring_buffer_size_edt.returnPressed.connect(
+            self.handle_buffer_size_changed)
+        self.chart_ring_buffer_size_edt.setText(str(self.chart.getBufferSize()))
+
+        self.chart_storage_backend_lbl = QLabel("Buffer Storage")
+        self.chart_storage_backend_cmb = QComboBox()
+        self.chart_storage_backend_cmb.addItem("Memory", MEMORY_STORAGE)
+        self.chart_storage_backend_cmb.addItem("Disk (Memory-Mapped)",
+                                               MEMMAP_STORAGE)
+        self.chart_storage_backend_cmb.currentIndexChanged.connect(
+            self.handle_storage_backend_changed)
+
+        self.chart_cache_dir_layout = QHBoxLayout()
+        self.chart_cache_dir_lbl = QLabel("Cache Directory")
+        self.chart_cache_dir_edt = QLineEdit()
+        self.chart_cache_dir_edt.setText(DEFAULT_CACHE_DIR)
+        self.chart_cache_dir_edt.returnPressed.connect(
+            self.handle_storage_backend_changed)
+        self.chart_cache_dir_btn = QPushButton()
+        self.chart_cache_dir_btn.setFixedHeight(24)
+        self.chart_cache_dir_btn.setFixedWidth(24)
+        self.chart_cache_dir_btn.setIcon(IconFont().icon("folder-open"))
+        self.chart_cache_dir_btn.clicked.connect(
+            self.handle_cache_dir_button_clicked)
+
+        self.chart_value_precision_lbl = QLabel("Value Precision")
+        self.chart_value_precision_cmb = QComboBox()
+        self.chart_value_precision_cmb.addItem("Double (float64)",
+                                               DOUBLE_PRECISION_VALUES)
+        self.chart_value_precision_cmb.addItem("Single (float32)",
+                                               SINGLE_PRECISION_VALUES)
+        self.chart_value_precision_cmb.currentIndexChanged.connect(
+            self.handle_value_precision_changed)
+
+        self.chart_memory_budget_lbl = QLabel("Memory Budget (MB)")
+        self.chart_memory_budget_spin = QSpinBox()
+        self.chart_memory_budget_spin.setRange(0, MAX_MEMORY_BUDGET_MB)
+        self.chart_memory_budget_spin.setSpecialValueText("Unlimited")
+        self.chart_memory_budget_spin.setValue(DEFAULT_MEMORY_BUDGET_MB)
+        self.chart_memory_budget_spin.setToolTip(
+            "The maximum memory for the buffers of all the curves, including their pre-aggregated data and their "
+            "memory-mapped files.\nOnly the Ring Buffer Size of the Data tab is reduced to fit within the budget, "
+            "discarding the oldest data points instead of downsampling them.\nThe curves having their own Ring Buffer "
+            "Size keep it, and a new size of their own exceeding the budget is refused.")
+        self.chart_memory_budget_spin.editingFinished.connect(
+            self.handle_memory_budget_changed)
+
+        self.chart_memory_usage_lbl = QLabel("Memory Usage")
+        self.chart_memory_usage_value_lbl = QLabel()
+        self.chart_memory_usage_lst = QListWidget()
+        self.chart_memory_usage_lst.setMaximumHeight(100)
+        self.chart_memory_budget_warning_lbl = QLabel()
+        self.chart_memory_budget_warning_lbl.setWordWrap(True)
+        self.chart_memory_budget_warning_lbl.setStyleSheet("color: red")
+        self.chart_memory_budget_warning_lbl.hide()
+
+        self.save_data_btn = QPushButton("Save Data to Disk")
+        self.save_data_btn.clicked.connect(
+            self.handle_save_data_btn_clicked)
+
+        self.reset_data_settings_btn = QPushButton("Reset Data Settings")
+        self.reset_data_settings_btn.clicked.connect(
+            self.handle_reset_data_settings_btn_clicked)
+
+        self.graph_drawing_settings_grpbx = QGroupBox("Graph Intervals")
+        self.graph_drawing_settings_grpbx.setAlignment(Qt.AlignTop)
+
+    def create_chart_settings_tab_widgets(self):
+        self.chart_settings_layout = QVBoxLayout()
+        self.chart_settings_layout.setAlignment(Qt.AlignTop)
+        self.chart_settings_layout.setSpacing(5)
+
+        self.title_settings_layout = QVBoxLayout()
+        self.title_settings_layout.setAlignment(Qt.AlignTop)
+        self.title_settings_layout.setSpacing(5)
+
+        self.title_settings_grpbx = QGroupBox("Title and Legend")
+        self.title_settings_grpbx.setMaximumHeight(120)
+
+        self.chart_title_layout = QHBoxLayout()
+        self.chart_title_layout.setSpacing(10)
+
+        self.chart_title_lbl = QLabel(text="Graph Title")
+        self.chart_title_line_edt = QLineEdit()
+        self.chart_title_line_edt.setText(self.chart.getPlotTitle())
+        self.chart_title_line_edt.textChanged.connect(
+            self.handle_title_text_changed)
+
+        self.chart_title_font_btn = QPushButton()
+        self.chart_title_font_btn.setFixedHeight(24)
+        self.chart_title_font_btn.setFixedWidth(24)
+        self.chart_title_font_btn.setIcon(IconFont().icon("font"))
+        self.chart_title_font_btn.clicked.connect(
+            partial(self.handle_chart_font_changed, "title")
+        )
+
+        self.chart_change_axis_settings_btn = QPushButton(
+            text="Change Axis Settings...")
+        self.chart_change_axis_settings_btn.clicked.connect(
+            self.handle_change_axis_settings_clicked)
+
+        self.show_legend_chk = QCheckBox("Show Legend")
+        self.show_legend_chk.clicked.connect(
+            self.handle_show_legend_checkbox_clicked)
+        self.show_legend_chk.setChecked(self.chart.showLegend)
+
+        self.legend_font_btn = QPushButton()
+        self.legend_font_btn.setFixedHeight(24)
+        self.legend_font_btn.setFixedWidth(24)
+        self.legend_font_btn.setIcon(IconFont().icon("font"))
+        self.legend_font_btn.clicked.connect(
+            partial(self.handle_chart_font_changed, "legend")
+        )
+
+        self.graph_background_color_layout = QFormLayout()
+        self.axis_grid_color_layout = QFormLayout()
+
+        self.background_color_lbl = QLabel("Graph Background Color ")
+        self.background_color_btn = QPushButton()
+        self.background_color_btn.setStyleSheet(
+            "background-color: " + self.chart.getBackgroundColor().name())
+        self.background_color_btn.setContentsMargins(10, 0, 5, 5)
+        self.background_color_btn.setMaximumWidth(20)
+        self.background_color_btn.clicked.connect(
+            self.handle_background_color_button_clicked)
+
+        self.axis_settings_layout = QVBoxLayout()
+        self.axis_settings_layout.setSpacing(10)
+
+        self.show_x_grid_chk = QCheckBox("Show x Grid")
+        self.show_x_grid_chk.setChecked(self.chart.showXGrid)
+        self.show_x_grid_chk.clicked.connect(
+            self.handle_show_x_grid_checkbox_clicked)
+
+        self.show_y_grid_chk = QCheckBox("Show y Grid")
+        self.show_y_grid_chk.setChecked(self.chart.showYGrid)
+        self.show_y_grid_chk.clicked.connect(
+            self.handle_show_y_grid_checkbox_clicked)
+
+        self.axis_color_lbl = QLabel("Axis and Grid Color")
+        self.axis_color_btn = QPushButton()
+        self.axis_color_btn.setStyleSheet(
+            "background-color: " + DEFAULT_CHART_AXIS_COLOR.name())
+        self.axis_color_btn.setContentsMargins(10, 0, 5, 5)
+        self.axis_color_btn.setMaximumWidth(20)
+        self.axis_color_btn.clicked.connect(
+            self.handle_axis_color_button_clicked)
+
+        self.grid_opacity_lbl = QLabel("Grid Opacity")
+        self.grid_opacity_lbl.setEnabled(False)
+
+        self.grid_opacity_slr = QSlider(Qt.Horizontal)
+        self.grid_opacity_slr.setFocusPolicy(Qt.StrongFocus)
+        self.grid_opacity_slr.setRange(0, 10)
+        self.grid_opacity_slr.setValue(5)
+        self.grid_opacity_slr.setTickInterval(1)
+        self.grid_opacity_slr.setSingleStep(1)
+        self.grid_opacity_slr.setTickPosition(QSlider.TicksBelow)
+        self.grid_opacity_slr.valueChanged.connect(
+            self.handle_grid_opacity_slider_mouse_release)
+        self.grid_opacity_slr.setEnabled(False)
+
+        self.reset_chart_settings_btn = QPushButton("Reset Chart Settings")
+        self.reset_chart_settings_btn.clicked.connect(
+            self.handle_reset_chart_settings_btn_clicked)
+
+        self.fullscreen_mode_toggle_btn = QPushButton('Toggle Fullscreen-Like Mode')
+        self.fullscreen_mode_toggle_btn.setCheckable(True)
+        self.fullscreen_mode_toggle_btn.clicked.connect(self.handle_fullscreen_mode_toggled)
+
+        self.axis_settings_grpbx = QGroupBox("Graph Appearance")
+
     def setup_data_tab_layout(self):
         self.chart_sync_mode_sync_radio.toggled.connect(
             partial(self.handle_sync_mode_radio_toggle,
@@ -595,9 +762,14 @@ class TimeChartDisplay(Display):
         self.chart_sync_mode_async_radio.toggled.connect(
             partial(self.handle_sync_mode_radio_toggle,
                     self.chart_sync_mode_async_radio))
+        self.chart_sync_mode_capture_radio.toggled.connect(
+            partial(self.handle_sync_mode_radio_toggle,
+                    self.chart_sync_mode_capture_radio))
 
         self.chart_sync_mode_layout.addWidget(self.chart_sync_mode_sync_radio)
         self.chart_sync_mode_layout.addWidget(self.chart_sync_mode_async_radio)
+        self.chart_sync_mode_layout.addWidget(self.chart_sync_mode_capture_radio)
+        self.chart_sync_mode_layout.addWidget(self.chart_ingestion_statistics_lbl)
         self.chart_sync_mode_grpbx.setLayout(self.chart_sync_mode_layout)
 
         self.data_tab_layout.addWidget(self.chart_sync_mode_grpbx)
@@ -633,6 +805,10 @@ class TimeChartDisplay(Display):
 
         self.chart_interval_layout.addRow(self.chart_redraw_rate_lbl,
                                           self.chart_redraw_rate_spin)
+        self.chart_interval_layout.addRow(self.curve_status_refresh_rate_lbl,
+                                          self.curve_status_refresh_rate_spin)
+        self.chart_interval_layout.addRow(self.chart_render_mode_lbl,
+                                          self.chart_render_mode_cmb)
         self.chart_interval_layout.addRow(self.chart_data_sampling_rate_lbl,
                                           self.chart_data_async_sampling_rate_spin)
         self.graph_drawing_settings_layout.addLayout(self.chart_interval_layout)
@@ -644,6 +820,25 @@ class TimeChartDisplay(Display):
 
         self.chart_ring_buffer_layout.addRow(self.chart_ring_buffer_size_lbl,
                                              self.chart_ring_buffer_size_edt)
+        self.chart_ring_buffer_layout.addRow(self.chart_storage_backend_lbl,
+                                             self.chart_storage_backend_cmb)
+
+        self.chart_cache_dir_layout.addWidget(self.chart_cache_dir_edt)
+        self.chart_cache_dir_layout.addWidget(self.chart_cache_dir_btn)
+        self.chart_ring_buffer_layout.addRow(self.chart_cache_dir_lbl,
+                                             self.chart_cache_dir_layout)
+        self.chart_cache_dir_lbl.hide()
+        self.chart_cache_dir_edt.hide()
+        self.chart_cache_dir_btn.hide()
+
+        self.chart_ring_buffer_layout.addRow(self.chart_value_precision_lbl,
+                                             self.chart_value_precision_cmb)
+        self.chart_ring_buffer_layout.addRow(self.chart_memory_budget_lbl,
+                                             self.chart_memory_budget_spin)
+        self.chart_ring_buffer_layout.addRow(self.chart_memory_budget_warning_lbl)
+        self.chart_ring_buffer_layout.addRow(self.chart_memory_usage_lbl,
+                                             self.chart_memory_usage_value_lbl)
+        self.chart_ring_buffer_layout.addRow(self.chart_memory_usage_lst)
 
         self.graph_drawing_settings_layout.addLayout(
             self.chart_ring_buffer_layout)
@@ -651,7 +846,25 @@ class TimeChartDisplay(Display):
             self.graph_drawing_settings_layout)
 
         self.data_tab_layout.addWidget(self.graph_drawing_settings_grpbx)
-        self.chart_sync_mode_async_radio.toggled.emit(True)
+
+        # Show the data sampling mode the chart is in, without applying it to the chart again, which would clear the
+        # data of the curves plotted before the tab was built
+        sync_mode_radios = {
+            SYNC_DATA_SAMPLING: self.chart_sync_mode_sync_radio,
+            ASYNC_DATA_SAMPLING: self.chart_sync_mode_async_radio,
+            CAPTURE_DATA_SAMPLING: self.chart_sync_mode_capture_radio,
+        }
+        for radio_btn in sync_mode_radios.values():
+            radio_btn.blockSignals(True)
+        sync_mode_radios[self.data_sampling_mode].setChecked(True)
+        for radio_btn in sync_mode_radios.values():
+            radio_btn.blockSignals(False)
+
+        is_async = self.data_sampling_mode == ASYNC_DATA_SAMPLING
+        self.chart_data_sampling_rate_lbl.setVisible(is_async)
+        self.chart_data_async_sampling_rate_spin.setVisible(is_async)
+        self.chart_limit_time_span_chk.setVisible(is_async)
+        self.chart_ingestion_statistics_lbl.setVisible(self.data_sampling_mode == CAPTURE_DATA_SAMPLING)
 
         self.data_tab_layout.addWidget(self.save_data_btn)
         self.data_tab_layout.addWidget(self.reset_data_settings_btn)
@@ -691,8 +904,6 @@ class TimeChartDisplay(Display):
 
         self.chart_settings_layout.addWidget(self.fullscreen_mode_toggle_btn)
 
-        self.update_datetime_timer.start(1000)
-
     def handle_fullscreen_mode_toggled(self):
         toggled = self.fullscreen_mode_toggle_btn.isChecked()
         if toggled == True:
@@ -713,14 +924,77 @@ class TimeChartDisplay(Display):
             pv_name = self._get_full_pv_name(self.pv_name_line_edt.text())
 
         if pv_name and len(pv_name):
-            color = random_color(curve_colors_only=True)
-            for k, v in self.channel_map.items():
-                if color == v.color:
-                    color = random_color(curve_colors_only=True)
+            self.add_y_channels([self._new_curve_settings(pv_name)])
+            self.handle_splitter_button(left=True)
+
+    def _new_curve_settings(self, pv_name):
+        """
+        Provide the parameters of add_y_channel for a new curve of a PV, with a random color.
+        """
+        color = random_color(curve_colors_only=True)
+        for k, v in self.channel_map.items():
+            if color == v.color:
+                color = random_color(curve_colors_only=True)
+        return dict(pv_name=pv_name, curve_name=pv_name, color=color)
+
+    def load_curves(self, pv_names):
+        """
+        Add a curve for each PV a batch at a time from the event loop, e.g. for the --pvs list, so that the display
+        shows up, and stays responsive, while the curves are added.
+
+        Parameters
+        ----------
+        pv_names : list
+            The addresses of the PVs to plot
+        """
+        pv_names = [self._get_full_pv_name(pv_name) for pv_name in pv_names]
+        self.load_y_channels([self._new_curve_settings(pv_name) for pv_name in pv_names if pv_name])
+        if pv_names:
+            self.handle_splitter_button(left=True)
+
+    def load_y_channels(self, channel_settings, on_loaded=None):
+        """
+        Add curves a batch at a time from the event loop, e.g. for the curves of a config file.
+
+        Parameters
+        ----------
+        channel_settings : list
+            The parameters of add_y_channel for each curve, as dictionaries
+        on_loaded : callable, optional
+            Called once the curves are added, unless their loading is canceled, e.g. by importing another config
+        """
+        self.curve_loader.queue(channel_settings, on_finished=on_loaded)
+
+    def handle_curve_loading_progress(self, added, total):
+        self.curve_loading_bar.setMaximum(total)
+        self.curve_loading_bar.setValue(added)
+        self.curve_loading_bar.setVisible(added < total)
+
+    @Slot(list)
+    def add_curves(self, pv_names):
+        """
+        Add a curve for each PV not plotted yet, e.g. for the PVs handed over by the PyDM external tool, and bring the
+        window to the front.
 
-            self.add_y_channel(pv_name=pv_name, curve_name=pv_name, color=color)
+        Parameters
+        ----------
+        pv_names : list
+            The addresses of the PVs to plot
+        """
+        # The PVs already plotted include the PVs still waiting to be loaded
+        self.curve_loader.finish()
+        pv_names = [self._get_full_pv_name(pv_name) for pv_name in pv_names]
+        new_pv_names = [pv_name for pv_name in OrderedDict.fromkeys(pv_names)
+                        if pv_name and pv_name not in self.channel_map]
+        if new_pv_names:
+            self.add_y_channels([self._new_curve_settings(pv_name) for pv_name in new_pv_names])
             self.handle_splitter_button(left=True)
 
+        window = self.window()
+        window.showNormal() if window.isMinimized() else window.show()
+        window.raise_()
+        window.activateWindow()
+
     def show_mouse_coordinates(self, x, y):
         self.crosshair_coord_lbl.clear()
         self.crosshair_coord_lbl.setText(
@@ -734,28 +1008,131 @@ class TimeChartDisplay(Display):
             self.show_mouse_coordinates)
 
     def add_y_channel(self, pv_name, curve_name, color, line_style=Qt.SolidLine,
-                      line_width=2, symbol=None, symbol_size=None, is_visible=True):
-        if pv_name in self.channel_map:
-            logger.error("'{0}' has already been added.".format(pv_name))
+                      line_width=2, symbol=None, symbol_size=None, is_visible=True,
+                      buffer_size=None, update_interval=None):
+        self.add_y_channels([dict(pv_name=pv_name, curve_name=curve_name, color=color, line_style=line_style,
+                                  line_width=line_width, symbol=symbol, symbol_size=symbol_size,
+                                  is_visible=is_visible, buffer_size=buffer_size,
+                                  update_interval=update_interval)])
+
+    def add_y_channels(self, channel_settings):
+        """
+        Add several curves at once, e.g. for the curves of a config file or the PVs of the --pvs list. The legend, the
+        curve controls, and the chart control buttons are updated once for all the curves, instead of once per curve.
+
+        Parameters
+        ----------
+        channel_settings : list
+            The parameters of add_y_channel for each curve, as dictionaries
+        """
+        new_settings = OrderedDict()
+        for settings in channel_settings:
+            pv_name = settings["pv_name"]
+            if pv_name in self.channel_map or pv_name in new_settings:
+                logger.error("'{0}' has already been added.".format(pv_name))
+                continue
+            new_settings[pv_name] = settings
+        if not new_settings:
             return
 
-        curve = self.chart.addYChannel(y_channel=pv_name, name=curve_name,
-                                       color=color, lineStyle=line_style,
-                                       lineWidth=line_width, symbol=symbol,
-                                       symbolSize=symbol_size)
-        curve.show() if is_visible else curve.hide()
+        channels = [dict(y_channel=pv_name, name=settings["curve_name"], color=settings["color"],
+                         lineStyle=settings.get("line_style", Qt.SolidLine), lineWidth=settings.get("line_width", 2),
+                         symbol=settings.get("symbol"), symbolSize=settings.get("symbol_size"))
+                    for pv_name, settings in new_settings.items()]
 
-        if self.show_legend_chk.isChecked():
+        # Lay out the controls of all the new curves at once
+        self.curve_settings_inner_frame.setUpdatesEnabled(False)
+        try:
+            curves = self.chart.addYChannels(channels)
+            for (pv_name, settings), curve in zip(new_settings.items(), curves):
+                if curve is None:
+                    continue
+
+                curve.show() if settings.get("is_visible", True) else curve.hide()
+                if settings.get("buffer_size"):
+                    self.chart.setCurveBufferSize(curve, settings["buffer_size"])
+                if settings.get("update_interval"):
+                    self.chart.setCurveUpdateInterval(curve, settings["update_interval"])
+
+                self.channel_map[pv_name] = curve
+                self.generate_pv_controls(pv_name, settings["color"])
+                try:
+                    if curve.channel is not None:
+                        self.app.add_connection(curve.channel)
+                except AttributeError:
+                    # these methods are not needed on future versions of pydm
+                    pass
+        finally:
+            self.curve_settings_inner_frame.setUpdatesEnabled(True)
+
+        if self.is_legend_checked():
             self.change_legend_font(self.legend_font)
-        self.channel_map[pv_name] = curve
-        self.generate_pv_controls(pv_name, color)
-
         self.enable_chart_control_buttons()
+        self.tab_panel.setCurrentIndex(0)
+
+    def update_y_channel(self, pv_name, curve_name=None, color=None, line_style=Qt.SolidLine, line_width=2,
+                         symbol=None, symbol_size=None, is_visible=True, buffer_size=None, update_interval=None):
+        """
+        Apply new settings to a curve already plotted, e.g. from a config file that changed. Only the settings that
+        differ from the curve's are applied, so that the curve keeps its data and its connection. If its own buffer
+        size changes, the curve keeps the newest samples that fit.
+
+        Parameters
+        ----------
+        pv_name : str
+            The name of the PV the curve is plotted for
+        curve_name : str, optional
+            The name of the curve, which isn't changed
+        color : QColor, optional
+            The new color of the curve, or None to keep its color
+        The other parameters are those of add_y_channel.
+        """
+        # The curve applies each style right away, without being added to the chart again
+        curve = self.channel_map[pv_name]
+        if color is not None and color != curve.color:
+            curve.color = color
+            controls = self.pv_controls[pv_name]
+            for w in (controls.checkbox, controls.data_label):
+                palette = w.palette()
+                palette.setColor(QPalette.Active, QPalette.WindowText, color)
+                w.setPalette(palette)
+        if line_style != curve.lineStyle:
+            curve.lineStyle = line_style
+        if int(line_width) != curve.lineWidth:
+            curve.lineWidth = line_width
+        if symbol != curve.symbol:
+            curve.symbol = symbol
+        if symbol_size is not None and symbol_size != curve.symbolSize:
+            curve.symbolSize = symbol_size
+
+        # The checkbox shows or hides the curve, together with its legend item
+        self.pv_controls[pv_name].checkbox.setChecked(is_visible)
+
+        if (buffer_size or None) != curve.own_buffer_size:
+            self.chart.setCurveBufferSize(curve, buffer_size or None)
+        own_update_interval = curve.own_update_interval
+        if int(1000 * (update_interval or 0)) != int(1000 * (own_update_interval or 0)):
+            self.chart.setCurveUpdateInterval(curve, update_interval or None)
+
+    def watch_config_file(self, config_file):
+        """
+        Apply a config file again whenever it changes, only adding, removing, or restyling the curves that changed.
+
+        Parameters
+        ----------
+        config_file : str
+            The path of the config file to watch
+        """
+        self.config_watcher = ConfigWatcher(config_file, parent=self)
+        self.config_watcher.configChanged.connect(self.handle_watched_config_changed)
+
+    def handle_watched_config_changed(self, config_file):
         try:
-            self.app.add_connection(curve.channel)
-        except AttributeError:
-            # these methods are not needed on future versions of pydm
-            pass
+            SettingsImporter(self).update_settings(config_file)
+            logger.info("Applied the changes of the file '{0}'.".format(config_file))
+        except SettingsImporterException:
+            # Keep the current settings until the file is fixed, without interrupting the operator with a dialog
+            logger.exception("Cannot apply the changes of the file '{0}'.".format(config_file))
 
     def generate_pv_controls(self, pv_name, curve_color):
         """
@@ -813,7 +1190,7 @@ class TimeChartDisplay(Display):
 
         checkbox.setChecked(True)
         checkbox.toggled.connect(partial(self.handle_curve_chkbox_toggled, checkbox))
-        if not self.chart.findCurve(pv_name).isVisible():
+        if not self.channel_map[pv_name].isVisible():
             checkbox.setChecked(False)
 
         modify_curve_btn = QPushButton("Modify...",
@@ -858,8 +1235,8 @@ class TimeChartDisplay(Display):
         individual_curve_layout.addLayout(curve_btn_layout)
 
         self.curve_settings_layout.addWidget(individual_curve_grpbx)
-
-        self.tab_panel.setCurrentIndex(0)
+        self.pv_controls[pv_name] = PvControls(individual_curve_grpbx, checkbox, data_text, modify_curve_btn,
+                                               focus_curve_btn)
 
     def handle_curve_chkbox_toggled(self, checkbox):
         """
@@ -882,7 +1259,7 @@ class TimeChartDisplay(Display):
             if curve:
                 curve.show()
                 self.chart.addLegendItem(curve, pv_name,
-                                         self.show_legend_chk.isChecked())
+                                         self.is_legend_checked())
                 self.change_legend_font(self.legend_font)
         else:
             curve = self.chart.findCurve(pv_name)
@@ -900,6 +1277,8 @@ class TimeChartDisplay(Display):
             The name of the PV the curve is being plotted for
 
         """
+        from .curve_settings_display import CurveSettingsDisplay
+
         self.curve_settings_disp = CurveSettingsDisplay(self, pv_name)
         self.curve_settings_disp.show()
 
@@ -916,6 +1295,8 @@ class TimeChartDisplay(Display):
     def annotate_curve(self, pv_name):
         curve = self.chart.findCurve(pv_name)
         if curve:
+            from pyqtgraph import TextItem
+
             annot = TextItem(
                 html='<div style="text-align: center"><span style="color: #FFF;">This is the'
                      '</span><br><span style="color: #FF0; font-size: 16pt;">PEAK</span></div>',
@@ -932,10 +1313,13 @@ class TimeChartDisplay(Display):
         pv_name : str
             The name of the PV the curve is being plotted for
         """
+        # The curve may still be waiting to be loaded, and must not be added once removed
+        self.curve_loader.discard(lambda settings: settings["pv_name"] == pv_name)
         curve = self.chart.findCurve(pv_name)
         if curve:
             try:
-                self.app.remove_connection(curve.channel)
+                if curve.channel is not None:
+                    self.app.remove_connection(curve.channel)
             except AttributeError:
                 # these methods are not needed on future versions of pydm
                 pass
@@ -943,18 +1327,30 @@ class TimeChartDisplay(Display):
             del self.channel_map[pv_name]
             self.chart.removeLegendItem(pv_name)
 
-            widget = self.findChild(QGroupBox, pv_name + "_grb")
-            if widget:
-                widget.deleteLater()
+            controls = self.pv_controls.pop(pv_name, None)
+            if controls:
+                controls.group_box.deleteLater()
+            self.outdated_curve_status_pvs.discard(pv_name)
 
         if len(self.chart.getCurves()) < 1:
             self.enable_chart_control_buttons(False)
-            self.show_legend_chk.setChecked(False)
+            if self._settings_tabs_built:
+                self.show_legend_chk.setChecked(False)
+
+    def is_legend_checked(self):
+        """
+        Whether Show Legend is checked in the Graph tab, which follows the chart until the tab is built.
+        """
+        if not self._settings_tabs_built:
+            return self.chart.showLegend
+        return self.show_legend_chk.isChecked()
 
     def handle_title_text_changed(self, new_text):
         self.chart.setPlotTitle(new_text)
 
     def handle_change_axis_settings_clicked(self):
+        from .axis_settings_display import AxisSettingsDisplay
+
         self.axis_settings_disp = AxisSettingsDisplay(self)
         self.axis_settings_disp.show()
 
@@ -990,14 +1386,174 @@ class TimeChartDisplay(Display):
         try:
             new_buffer_size = int(self.chart_ring_buffer_size_edt.text())
             if new_buffer_size and int(new_buffer_size) >= MINIMUM_BUFFER_SIZE:
+                memory_budget = self.chart.getMemoryBudget()
+                memory_usage = self.chart.estimateMemoryUsage(new_buffer_size)
+                if memory_budget and memory_usage > memory_budget:
+                    # Refuse the buffer size before allocating anything
+                    display_message_box(QMessageBox.Warning, "Memory Budget Exceeded",
+                                        "A ring buffer size of {0} would use {1} for the current curves, over the "
+                                        "memory budget of {2}.".format(new_buffer_size, format_bytes(memory_usage),
+                                                                       format_bytes(memory_budget)))
+                    self.chart_ring_buffer_size_edt.setText(str(self.chart.getBufferSize()))
+                    return
+                self.chart_memory_budget_warning_lbl.hide()
                 self.chart.setBufferSize(new_buffer_size)
         except ValueError:
             display_message_box(QMessageBox.Critical, "Invalid Values",
                                 "Only integer values are accepted.")
 
+    def handle_storage_backend_changed(self):
+        backend = self.chart_storage_backend_cmb.currentData()
+        is_memmap = backend == MEMMAP_STORAGE
+        self.chart_cache_dir_lbl.setVisible(is_memmap)
+        self.chart_cache_dir_edt.setVisible(is_memmap)
+        self.chart_cache_dir_btn.setVisible(is_memmap)
+
+        cache_dir = self.chart_cache_dir_edt.text().strip() or DEFAULT_CACHE_DIR
+        self.chart.setStorageBackend(backend, os.path.expanduser(cache_dir))
+
+    def handle_cache_dir_button_clicked(self):
+        cache_dir = QFileDialog.getExistingDirectory(
+            self, "Select the Cache Directory", self.chart_cache_dir_edt.text())
+        if cache_dir:
+            self.chart_cache_dir_edt.setText(cache_dir)
+            self.handle_storage_backend_changed()
+
+    def set_storage_backend(self, backend, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Select a storage backend from the Buffer Storage combo box, and apply it to the chart.
+
+        Parameters
+        ----------
+        backend : int
+            Either MEMORY_STORAGE or MEMMAP_STORAGE.
+        cache_dir : str
+            The directory to create the memory-mapped ring buffer files in.
+        """
+        self.build_settings_tabs()
+        self.chart_cache_dir_edt.setText(cache_dir)
+        index = self.chart_storage_backend_cmb.findData(backend)
+        if index >= 0:
+            self.chart_storage_backend_cmb.blockSignals(True)
+            self.chart_storage_backend_cmb.setCurrentIndex(index)
+            self.chart_storage_backend_cmb.blockSignals(False)
+            self.handle_storage_backend_changed()
+
+    def handle_value_precision_changed(self):
+        self.chart_memory_budget_warning_lbl.hide()
+        self.chart.setValuePrecision(self.chart_value_precision_cmb.currentData())
+        self.chart_ring_buffer_size_edt.setText(str(self.chart.getBufferSize()))
+        self.refresh_memory_usage()
+
+    def set_value_precision(self, precision):
+        """
+        Select a value precision from the Value Precision combo box, and apply it to the chart.
+
+        Parameters
+        ----------
+        precision : int
+            Either DOUBLE_PRECISION_VALUES or SINGLE_PRECISION_VALUES.
+        """
+        self.build_settings_tabs()
+        index = self.chart_value_precision_cmb.findData(precision)
+        if index >= 0:
+            self.chart_value_precision_cmb.blockSignals(True)
+            self.chart_value_precision_cmb.setCurrentIndex(index)
+            self.chart_value_precision_cmb.blockSignals(False)
+            self.handle_value_precision_changed()
+
+    def handle_memory_budget_changed(self):
+        self.chart_memory_budget_warning_lbl.hide()
+        self.chart.setMemoryBudget(self.chart_memory_budget_spin.value() * 1024 * 1024)
+        self.chart_ring_buffer_size_edt.setText(str(self.chart.getBufferSize()))
+        self.refresh_memory_usage()
+
+    def handle_memory_budget_exceeded(self, requested_buffer_size, applied_buffer_size):
+        """
+        Warn that the chart's buffer size was reduced to fit within the memory budget.
+        """
+        if not self._settings_tabs_built:
+            # The Data tab shows the buffer size of the chart once built
+            return
+        self.chart_memory_budget_warning_lbl.setText(
+            "The ring buffer size was reduced from {0} to {1} to fit within the memory budget.".format(
+                requested_buffer_size, applied_buffer_size))
+        self.chart_memory_budget_warning_lbl.show()
+        self.chart_ring_buffer_size_edt.setText(str(applied_buffer_size))
+
+    def refresh_memory_usage(self):
+        """
+        Refresh the memory used by the buffers of each curve, and by all the curves, if shown in the Data tab.
+        """
+        if not self._settings_tabs_built or not self.chart_memory_usage_lst.isVisible():
+            return
+
+        memory_usage = self.chart.getMemoryUsage()
+        total = sum(memory_usage.values())
+        memory_budget = self.chart.getMemoryBudget()
+        if memory_budget:
+            self.chart_memory_usage_value_lbl.setText("{0} of {1}".format(format_bytes(total),
+                                                                         format_bytes(memory_budget)))
+        else:
+            self.chart_memory_usage_value_lbl.setText(format_bytes(total))
+
+        items = ["{0}: {1}".format(address, format_bytes(nbytes)) for address, nbytes in memory_usage.items()]
+        if items != [self.chart_memory_usage_lst.item(i).text() for i in range(self.chart_memory_usage_lst.count())]:
+            self.chart_memory_usage_lst.clear()
+            self.chart_memory_usage_lst.addItems(items)
+
+    def refresh_ingestion_statistics(self):
+        """
+        Refresh the measurements of the reception of the values in the Capture All Updates mode, if shown in the Data
+        tab.
+        """
+        if not self._settings_tabs_built or not self.chart_ingestion_statistics_lbl.isVisible():
+            return
+
+        statistics = self.chart.getIngestionStatistics()
+        self.chart_ingestion_statistics_lbl.setText(
+            "{0:.0f} updates/s. Up to {1} updates queued per curve, for up to {2:.0f} ms. {3:.2f} ms per write, up to "
+            "{4:.2f} ms.".format(statistics["received_per_second"], statistics["max_backlog"],
+                                 statistics["max_latency"] * 1000, statistics["mean_flush_time"] * 1000,
+                                 statistics["max_flush_time"] * 1000))
+
+    def set_memory_budget(self, memory_budget_mb):
+        """
+        Set the memory budget of the chart from the Memory Budget spin box.
+
+        Parameters
+        ----------
+        memory_budget_mb : int
+            The memory budget in MB, or 0 for no limit.
+        """
+        self.build_settings_tabs()
+        self.chart_memory_budget_spin.setValue(int(memory_budget_mb))
+        self.handle_memory_budget_changed()
+
     def handle_redraw_rate_changed(self):
         self.chart.maxRedrawRate = self.chart_redraw_rate_spin.value()
 
+    def handle_curve_status_refresh_rate_changed(self):
+        self.curve_status_refresh_timer.start(
+            int(1000 / self.curve_status_refresh_rate_spin.value()))
+
+    def handle_render_mode_changed(self):
+        self.chart.setRenderMode(self.chart_render_mode_cmb.currentData())
+
+    def set_render_mode(self, mode):
+        """
+        Select a render mode from the Render Mode combo box, which applies the mode to the chart.
+
+        Parameters
+        ----------
+        mode : int
+            Either ALL_POINTS_RENDERING or MIN_MAX_DECIMATION_RENDERING.
+        """
+        self.build_settings_tabs()
+        index = self.chart_render_mode_cmb.findData(mode)
+        if index >= 0:
+            self.chart_render_mode_cmb.setCurrentIndex(index)
+
     def handle_data_sampling_rate_changed(self):
         # The chart expects the value in milliseconds
         sampling_rate_seconds = 1.0 / self.chart_data_async_sampling_rate_spin.value()
@@ -1044,6 +1600,10 @@ class TimeChartDisplay(Display):
         self.chart.setShowLegend(is_checked)
 
     def handle_export_data_btn_clicked(self):
+        # Export all the curves, even those still waiting to be added
+        self.curve_loader.finish()
+        from .chart_data_export_display import ChartDataExportDisplay
+
         self.chart_data_export_disp = ChartDataExportDisplay(self)
         self.chart_data_export_disp.show()
 
@@ -1072,8 +1632,12 @@ class TimeChartDisplay(Display):
 
     def handle_sync_mode_radio_toggle(self, radio_btn):
         if radio_btn.isChecked():
-            if radio_btn.text() == "Synchronous":
-                self.data_sampling_mode = SYNC_DATA_SAMPLING
+            if radio_btn.text() in ("Synchronous", "Capture All Updates"):
+                # Both modes record the values as they're received, so the buffer size isn't derived from a rate
+                if radio_btn.text() == "Synchronous":
+                    self.data_sampling_mode = SYNC_DATA_SAMPLING
+                else:
+                    self.data_sampling_mode = CAPTURE_DATA_SAMPLING
 
                 self.chart_data_sampling_rate_lbl.hide()
                 self.chart_data_async_sampling_rate_spin.hide()
@@ -1084,6 +1648,8 @@ class TimeChartDisplay(Display):
                 self.chart_limit_time_span_chk.hide()
 
                 self.chart.setUpdatesAsynchronously(False)
+                self.chart.setCapturesUpdates(self.data_sampling_mode == CAPTURE_DATA_SAMPLING)
+                self.chart_ingestion_statistics_lbl.setVisible(self.data_sampling_mode == CAPTURE_DATA_SAMPLING)
             elif radio_btn.text() == "Asynchronous":
                 self.data_sampling_mode = ASYNC_DATA_SAMPLING
 
@@ -1091,6 +1657,8 @@ class TimeChartDisplay(Display):
                 self.chart_data_async_sampling_rate_spin.show()
                 self.chart_limit_time_span_chk.show()
 
+                self.chart.setCapturesUpdates(False)
+                self.chart_ingestion_statistics_lbl.hide()
                 self.chart.setUpdatesAsynchronously(True)
 
     def handle_zoom_in_btn_clicked(self, axis, is_zoom_in):
@@ -1146,11 +1714,22 @@ class TimeChartDisplay(Display):
 
     @Slot()
     def handle_reset_data_settings_btn_clicked(self):
+        # Reset the buffers of all the curves at once, rather than of those loaded so far
+        self.curve_loader.finish()
         self.chart_ring_buffer_size_edt.setText(str(DEFAULT_BUFFER_SIZE))
 
         self.chart_redraw_rate_spin.setValue(DEFAULT_REDRAW_RATE_HZ)
         self.handle_redraw_rate_changed()
 
+        self.curve_status_refresh_rate_spin.setValue(
+            DEFAULT_CURVE_STATUS_REFRESH_RATE_HZ)
+        self.handle_curve_status_refresh_rate_changed()
+
+        self.set_render_mode(ALL_POINTS_RENDERING)
+        self.set_storage_backend(MEMORY_STORAGE)
+        self.set_value_precision(DOUBLE_PRECISION_VALUES)
+        self.set_memory_budget(DEFAULT_MEMORY_BUDGET_MB)
+
         self.chart_data_async_sampling_rate_spin.setValue(
             DEFAULT_DATA_SAMPLING_RATE_HZ)
         self.chart_data_sampling_rate_lbl.hide()
@@ -1207,6 +1786,39 @@ class TimeChartDisplay(Display):
         self.chart.setLabel("bottom", text=new_label)
 
     def update_curve_data(self, curve):
+        """
+        Mark the status of a curve just redrawn as outdated. The curve status will be refreshed by the curve status
+        refresh timer, at a rate much lower than the chart's redraw rate.
+
+        Parameters
+        ----------
+        curve : PlotItem
+           A PlotItem, i.e. a plot, to draw on the chart.
+        """
+        self.outdated_curve_status_pvs.add(curve.address)
+
+    def handle_curve_status_refresh_timer_timeout(self):
+        """
+        Refresh the status of the curves marked as outdated since the last refresh, but only for the curves whose
+        controls are currently visible in the Curves tab. The other curves stay marked as outdated until they are
+        scrolled into view, or the Curves tab is shown.
+        """
+        if not self.outdated_curve_status_pvs or not self.curve_settings_scroll.isVisible():
+            return
+
+        for pv_name in list(self.outdated_curve_status_pvs):
+            curve = self.channel_map.get(pv_name)
+            controls = self.pv_controls.get(pv_name)
+            if curve is None or controls is None:
+                self.outdated_curve_status_pvs.discard(pv_name)
+                continue
+            if controls.data_label.visibleRegion().isEmpty():
+                continue
+
+            self.refresh_curve_status(curve, controls)
+            self.outdated_curve_status_pvs.discard(pv_name)
+
+    def refresh_curve_status(self, curve, controls):
         """
         Determine if the PV is active. If not, disable the related PV controls.
         If the PV is active, update the PV controls' states.
@@ -1215,32 +1827,23 @@ class TimeChartDisplay(Display):
         ----------
         curve : PlotItem
            A PlotItem, i.e. a plot, to draw on the chart.
+        controls : PvControls
+           The widgets managing the curve from the Curves tab.
         """
-        pv_name = curve.address
         min_y = curve.minY if curve.minY else 0
         max_y = curve.maxY if curve.maxY else 0
-        current_y = curve.data_buffer[1, -1]
+        current_y = curve.get_latest_y()
 
-        grb = self.findChild(QGroupBox, pv_name + "_grb")
-
-        lbl = grb.findChild(QLabel, pv_name + "_lbl")
-        lbl.setText("(yMin = {0:.3f}, yMax = {1:.3f}) y = {2:.3f}".format(
+        controls.data_label.setText("(yMin = {0:.3f}, yMax = {1:.3f}) y = {2:.3f}".format(
             min_y, max_y, current_y))
 
-        chb = grb.findChild(QCheckBox, pv_name + "_chb")
-
         connected = curve.connected
-        if connected and chb.isEnabled():
+        if connected and controls.checkbox.isEnabled():
             return
 
-        chb.setEnabled(connected)
-        btn_modify = grb.findChild(QPushButton, pv_name + "_btn_modify")
-        btn_modify.setEnabled(connected)
-        btn_focus = grb.findChild(QPushButton, pv_name + "_btn_focus")
-        btn_focus.setEnabled(connected)
-
-        # btn_ann = grb.findChild(QPushButton, pv_name + "_btn_ann")
-        # btn_ann.setEnabled(connected)
+        controls.checkbox.setEnabled(connected)
+        controls.modify_btn.setEnabled(connected)
+        controls.focus_btn.setEnabled(connected)
 
     @staticmethod
     def get_current_datetime():
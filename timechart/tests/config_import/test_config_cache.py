@@ -0,0 +1,90 @@
+"""
+Unit Test for the Cache of the Parsed Config Files
+"""
+
+import os
+import json
+import shutil
+import time
+
+from qtpy.QtGui import QColor
+
+from timechart.data_io.config_cache import ConfigCache
+from timechart.data_io.settings_importer import SettingsImporter
+
+STP_FILENAME = os.path.join(os.path.dirname(__file__), os.pardir, 'striptool_config_import', 'data', 'strip.stp')
+
+
+def test_config_cache_skips_parsing(tmp_path, monkeypatch):
+    config_filename = str(tmp_path / "config.json")
+    with open(config_filename, 'w') as config_file:
+        json.dump(dict(pvs=dict(), chart_settings=dict(title="First")), config_file)
+
+    parsed = []
+    parse_settings = SettingsImporter._parse_settings
+    monkeypatch.setattr(SettingsImporter, "_parse_settings",
+                        lambda *args: parsed.append(args[1]) or parse_settings(*args))
+
+    importer = SettingsImporter(config_cache=ConfigCache(str(tmp_path / "cache")))
+    assert importer.read_settings(config_filename)["chart_settings"]["title"] == "First"
+    assert importer.read_settings(config_filename)["chart_settings"]["title"] == "First"
+    assert len(parsed) == 1
+    assert os.stat(tmp_path / "cache").st_mode & 0o777 == 0o700
+
+    # A changed file is parsed again
+    with open(config_filename, 'w') as config_file:
+        json.dump(dict(pvs=dict(), chart_settings=dict(title="Second")), config_file)
+    assert importer.read_settings(config_filename)["chart_settings"]["title"] == "Second"
+    assert len(parsed) == 2
+
+    # So is a file read without the cache
+    assert SettingsImporter().read_settings(config_filename)["chart_settings"]["title"] == "Second"
+    assert len(parsed) == 3
+
+
+def test_config_cache_keeps_striptool_colors(tmp_path, monkeypatch):
+    stp_filename = str(tmp_path / "strip.stp")
+    shutil.copy(STP_FILENAME, stp_filename)
+    importer = SettingsImporter(config_cache=ConfigCache(str(tmp_path / "cache")))
+    parsed_settings = importer.read_settings(stp_filename)
+
+    colors = []
+    monkeypatch.setattr("timechart.data_io.settings_importer.add_striptool_color", colors.append)
+    cached_settings = importer.read_settings(stp_filename)
+    assert cached_settings == parsed_settings
+    assert cached_settings["chart_settings"]["background_color"] == QColor("white")
+    assert len(colors) == 13
+
+
+def test_config_cache_refuses_shared_directory(tmp_path):
+    config_filename = str(tmp_path / "config.json")
+    with open(config_filename, 'w') as config_file:
+        json.dump(dict(pvs=dict(), chart_settings=dict()), config_file)
+    os.makedirs(tmp_path / "cache", mode=0o777)
+    os.chmod(tmp_path / "cache", 0o777)
+
+    cache = ConfigCache(str(tmp_path / "cache"))
+    cache.store(config_filename, b"{}", ({}, []))
+    assert os.listdir(tmp_path / "cache") == []
+    assert cache.load(config_filename, b"{}") is None
+
+
+def test_config_cache_evicts_old_and_least_recent_entries(tmp_path):
+    cache = ConfigCache(str(tmp_path / "cache"), max_bytes=10 ** 6, max_age_s=3600)
+    filenames = []
+    for i in range(3):
+        filename = str(tmp_path / "config{0}.json".format(i))
+        with open(filename, 'w') as config_file:
+            config_file.write("{}")
+        filenames.append(filename)
+        cache.store(filename, b"{}", ("x" * 1000, []))
+
+    entry_filenames = [cache._entry_filename(filename) for filename in filenames]
+    now = time.time()
+    os.utime(entry_filenames[0], (now - 7200, now - 7200))
+    os.utime(entry_filenames[1], (now - 60, now - 60))
+    cache.max_bytes = os.path.getsize(entry_filenames[2]) + 1
+    cache.evict()
+
+    assert [os.path.exists(entry_filename) for entry_filename in entry_filenames] == [False, False, True]
+    assert cache.load(filenames[2], b"{}") == ("x" * 1000, [])
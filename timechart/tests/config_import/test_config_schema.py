@@ -0,0 +1,158 @@
+"""
+Unit Test for Validating and Migrating the TimeChart Configs
+"""
+
+import json
+import time
+from collections import OrderedDict
+
+import pytest
+from qtpy.QtCore import Qt
+
+from timechart.data_io.config_schema import (validate_settings, ConfigSchemaError, CONFIG_SCHEMA_VERSION,
+                                             SCHEMA_VERSION_KEY, CHART_FIELDS)
+from timechart.data_io.importers.timechart_config_importer import TimeChartConfigImporter
+from timechart.data_io.settings_exporter import SettingsExporter
+from timechart.displays.defaults import MEMORY_STORAGE
+from timechart.displays.main_display import TimeChartDisplay
+
+PV_NAME = "loc://CONFIG_SCHEMA?type=float&init=0"
+
+
+def version_1_config():
+    return {
+        "__version__": "1.2.1",
+        "pvs": {PV_NAME: {"color": "red", "y_channel": PV_NAME, "line_style": Qt.DashLine, "line_width": 2,
+                          "symbol": None, "symbol_size": 10}},
+        "chart_settings": {"title": "Old Config", "x_axis_label": None, "x_axis_unit": None,
+                           "data_sampling_mode": 0, "limit_time_span": True, "time_span_limit_hours": "1",
+                           "time_span_limit_minutes": "0", "time_span_limit_seconds": "30", "buffer_size": "7200",
+                           "update_interval_hz": 1.0, "redraw_rate": 1.0, "show_legend": False,
+                           "background_color": "white", "axis_color": "#bebebe", "show_x_grid": True,
+                           "show_y_grid": True, "grid_alpha": 5}
+    }
+
+
+def test_migrate_version_1_config():
+    config = version_1_config()
+    settings = validate_settings(config)
+
+    assert settings[SCHEMA_VERSION_KEY] == CONFIG_SCHEMA_VERSION
+    assert list(settings["chart_settings"]) == list(version_1_config()["chart_settings"]) + [
+        name for name in CHART_FIELDS if name not in version_1_config()["chart_settings"]]
+    assert settings["chart_settings"]["time_span_limit_hours"] == 1
+    assert settings["chart_settings"]["buffer_size"] == 7200
+    assert settings["chart_settings"]["storage_backend"] == MEMORY_STORAGE
+    assert settings["pvs"][PV_NAME]["is_visible"]
+    assert settings["pvs"][PV_NAME]["buffer_size"] is None
+
+    # The config itself is left untouched, and migrating the migrated config changes nothing
+    assert config == version_1_config()
+    assert validate_settings(settings) == settings
+
+
+def test_validation_reports_every_problem():
+    config = version_1_config()
+    config["chart_settings"]["buffer_size"] = "many"
+    config["chart_settings"]["show_legend"] = "yes"
+    config["pvs"][PV_NAME]["line_style"] = 12
+    config["pvs"]["no channel"] = {"line_width": 1}
+
+    with pytest.raises(ConfigSchemaError) as error_info:
+        validate_settings(config)
+    assert error_info.value.problems == [
+        "pvs.{0}.line_style: expected one of 0, 1, 2, 3, 4, 5, 6, got 12".format(PV_NAME),
+        "pvs.no channel.y_channel: missing",
+        "chart_settings.buffer_size: expected an integer from 1 to 100000000, got 'many'",
+        "chart_settings.show_legend: expected true or false, got 'yes'",
+    ]
+
+    # The current version is checked as it is, without filling in the missing settings
+    config = validate_settings(version_1_config())
+    del config["chart_settings"]["render_mode"]
+    with pytest.raises(ConfigSchemaError, match="chart_settings.render_mode: missing"):
+        validate_settings(config)
+
+    with pytest.raises(ConfigSchemaError, match="newer TimeChart"):
+        validate_settings({SCHEMA_VERSION_KEY: CONFIG_SCHEMA_VERSION + 1, "pvs": {}, "chart_settings": {}})
+    with pytest.raises(ConfigSchemaError, match="JSON object"):
+        validate_settings([])
+
+
+def test_validation_is_fast():
+    pvs = OrderedDict(("ca://PV:{0}".format(i), dict(version_1_config()["pvs"][PV_NAME], y_channel="ca://PV:{0}"
+                                                     .format(i))) for i in range(1000))
+    settings = validate_settings(dict(version_1_config(), pvs=pvs))
+
+    start = time.perf_counter()
+    validate_settings(settings)
+    assert time.perf_counter() - start < 0.1
+
+
+def test_invalid_config_changes_nothing(qtbot):
+    display = TimeChartDisplay()
+    qtbot.addWidget(display)
+    display.add_curve(PV_NAME)
+    title = display.chart.getPlotTitle()
+
+    config = version_1_config()
+    config["pvs"] = {"ca://NEW:PV": {"y_channel": "ca://NEW:PV"}}
+    config["chart_settings"]["update_interval_hz"] = 0
+    with pytest.raises(ConfigSchemaError):
+        TimeChartConfigImporter(display).apply_settings(config)
+    assert list(display.channel_map) == [PV_NAME]
+    assert not display.curve_loader.is_loading
+    assert display.chart.getPlotTitle() == title
+
+    display.remove_curve(PV_NAME)
+    display.close()
+
+
+def test_exported_config_is_valid(qtbot, tmp_path):
+    display = TimeChartDisplay()
+    qtbot.addWidget(display)
+    display.add_curve(PV_NAME)
+    display.build_settings_tabs()
+    display.chart_limit_time_span_hours_spin_box.setValue(2)
+
+    filename = str(tmp_path / "config.json")
+    SettingsExporter(display, True, True).export_settings(filename)
+    with open(filename) as config_file:
+        config = json.load(config_file)
+    assert config[SCHEMA_VERSION_KEY] == CONFIG_SCHEMA_VERSION
+    assert config["chart_settings"]["time_span_limit_hours"] == 2
+    assert validate_settings(config) == config
+
+    display.remove_curve(PV_NAME)
+    display.close()
+
+
+def test_curve_sampling_rate_below_one_hz(qtbot, tmp_path):
+    display = TimeChartDisplay()
+    qtbot.addWidget(display)
+    display.add_curve(PV_NAME)
+    curve = display.chart.findCurve(PV_NAME)
+
+    display.display_curve_settings_dialog(PV_NAME)
+    curve_settings = display.curve_settings_disp
+    curve_settings.sampling_rate_spin.setValue(0.25)
+    curve_settings.handle_sampling_rate_changed()
+    assert curve.own_update_interval == 4
+
+    filename = str(tmp_path / "config.json")
+    SettingsExporter(display, True, True).export_settings(filename)
+    with open(filename) as config_file:
+        config = json.load(config_file)
+    assert config["pvs"][PV_NAME]["update_interval_hz"] == 0.25
+
+    # The exported rate is shown as it is when the dialog is opened again
+    curve_settings.set_widgets_to_current_curve_settings()
+    assert curve_settings.sampling_rate_spin.value() == 0.25
+    curve_settings.sampling_rate_spin.setValue(0)
+    curve_settings.handle_sampling_rate_changed()
+    assert curve.own_update_interval is None
+
+    curve_settings.close()
+    curve_settings.deleteLater()
+    display.remove_curve(PV_NAME)
+    display.close()
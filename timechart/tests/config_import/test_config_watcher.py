@@ -0,0 +1,73 @@
+"""
+Unit Test for Applying the Changes of a Watched Config File
+"""
+
+import json
+from collections import OrderedDict
+
+from qtpy.QtCore import Qt
+
+from timechart.data_io.config_watcher import ConfigWatcher
+from timechart.data_io.importers.timechart_config_importer import TimeChartConfigImporter
+from timechart.displays.main_display import TimeChartDisplay
+
+PV_NAMES = ["loc://WATCHED_CONFIG_{0}?type=float&init=0".format(i) for i in range(3)]
+
+
+def curve_config(pv_name, color, line_width=2):
+    return {"y_channel": pv_name, "color": color, "line_style": Qt.SolidLine, "line_width": line_width,
+            "symbol": None, "symbol_size": 10}
+
+
+def test_config_watcher_signals_changes(qtbot, tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text("{}")
+    watcher = ConfigWatcher(str(path), delay_ms=10)
+
+    # The file is replaced rather than written into, as many generators do
+    new_path = tmp_path / "config.json.new"
+    new_path.write_text('{"pvs": {}}')
+    with qtbot.waitSignal(watcher.configChanged, timeout=2000) as blocker:
+        new_path.replace(path)
+    assert blocker.args == [str(path)]
+    assert str(path) in watcher._watcher.files()
+
+
+def test_update_settings_only_changes_the_curves_that_changed(qtbot):
+    display = TimeChartDisplay()
+    qtbot.addWidget(display)
+    importer = TimeChartConfigImporter(display)
+
+    pvs = OrderedDict((pv_name, curve_config(pv_name, "#ff0000")) for pv_name in PV_NAMES[:2])
+    importer.update_settings({"pvs": pvs, "chart_settings": dict()})
+    assert list(display.channel_map) == PV_NAMES[:2]
+    kept_curve = display.channel_map[PV_NAMES[0]]
+    kept_buffer = kept_curve._ring_buffer
+
+    pvs = OrderedDict([(PV_NAMES[0], curve_config(PV_NAMES[0], "#00ff00", line_width=4)),
+                       (PV_NAMES[2], curve_config(PV_NAMES[2], None))])
+    importer.update_settings({"pvs": pvs, "chart_settings": dict()})
+    assert sorted(display.channel_map) == sorted([PV_NAMES[0], PV_NAMES[2]])
+    assert display.channel_map[PV_NAMES[0]] is kept_curve
+    assert kept_curve._ring_buffer is kept_buffer
+    assert kept_curve.color.name() == "#00ff00"
+    assert kept_curve.lineWidth == 4
+
+    for pv_name in list(display.channel_map):
+        display.remove_curve(pv_name)
+    display.close()
+
+
+def test_display_applies_the_watched_config(qtbot, tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"pvs": {PV_NAMES[0]: curve_config(PV_NAMES[0], "#ff0000")}, "chart_settings": {}}))
+    display = TimeChartDisplay(config_file=str(path))
+    qtbot.addWidget(display)
+    display.watch_config_file(str(path))
+    display.config_watcher._timer.setInterval(10)
+
+    path.write_text(json.dumps({"pvs": {PV_NAMES[1]: curve_config(PV_NAMES[1], "#ff0000")}, "chart_settings": {}}))
+    qtbot.waitUntil(lambda: list(display.channel_map) == [PV_NAMES[1]], timeout=3000)
+
+    display.remove_curve(PV_NAMES[1])
+    display.close()
@@ -0,0 +1,63 @@
+"""
+Unit Test for Applying the Chart Settings of a Config With a Single Buffer Allocation
+"""
+
+from timechart.data_io.importers.timechart_config_importer import TimeChartConfigImporter
+from timechart.displays.defaults import ASYNC_DATA_SAMPLING
+from timechart.displays.main_display import TimeChartDisplay
+
+PV_NAME = "loc://STAGED_IMPORT?type=float&init=0"
+
+CHART_SETTINGS = {
+    "title": "Staged Import",
+    "x_axis_label": None,
+    "x_axis_unit": None,
+    "data_sampling_mode": ASYNC_DATA_SAMPLING,
+    "show_legend": False,
+    "grid_alpha": 7.0,
+    "limit_time_span": True,
+    "time_span_limit_hours": 0,
+    "time_span_limit_minutes": 1,
+    "time_span_limit_seconds": 0,
+    "buffer_size": "1200",
+    "update_interval_hz": 20.0,
+    "redraw_rate": 1.0,
+    "background_color": "white",
+    "axis_color": "#bebebe",
+    "show_x_grid": True,
+    "show_y_grid": False,
+}
+
+
+def test_plan_sampling():
+    importer = TimeChartConfigImporter(None)
+    plan = importer.plan_sampling(CHART_SETTINGS)
+    assert plan.data_sampling_mode == ASYNC_DATA_SAMPLING
+    assert plan.update_interval == 0.05
+    assert plan.time_span == 60
+    assert plan.buffer_size == 1200
+
+    plan = importer.plan_sampling(dict(CHART_SETTINGS, update_interval_hz=0.2, limit_time_span=False))
+    assert plan.update_interval == 1.0
+    assert plan.time_span is None
+
+
+def test_chart_settings_resize_buffers_once(qtbot, monkeypatch):
+    display = TimeChartDisplay()
+    qtbot.addWidget(display)
+    display.add_curve(PV_NAME)
+    curve = display.channel_map[PV_NAME]
+
+    resized = []
+    resize_buffer = curve._resize_buffer
+    monkeypatch.setattr(curve, "_resize_buffer", lambda size: resized.append(size) or resize_buffer(size))
+
+    TimeChartConfigImporter(display).apply_settings({"pvs": dict(), "chart_settings": CHART_SETTINGS})
+    assert resized == [1200]
+    assert display.chart.getBufferSize() == 1200
+    assert display.chart.getTimeSpan() == 60
+    assert display.grid_opacity_slr.value() == 7
+    assert display.chart_ring_buffer_size_edt.text() == "1200"
+
+    display.remove_curve(PV_NAME)
+    display.close()
@@ -0,0 +1,40 @@
+"""
+Unit Test for Converting StripTool Config Files from the Command Line
+"""
+
+import os
+import json
+import shutil
+
+import pytest
+
+from timechart_launcher import convert
+
+INPUT_DIR_PATH = os.path.join(os.path.dirname(__file__), os.pardir, 'striptool_config_import', 'data')
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_convert_directory_tree(tmp_path, monkeypatch, capsys, jobs):
+    source_dir = tmp_path / "stp"
+    shutil.copytree(INPUT_DIR_PATH, source_dir / "nested")
+    (source_dir / "broken.stp").write_text("Strip.Curve.7.Units    Torr\n")
+    (source_dir / "notes.txt").write_text("Not a StripTool file\n")
+
+    monkeypatch.setattr("sys.argv", ["timechart-convert", "--output-dir", str(tmp_path / "json"),
+                                     "--jobs", str(jobs), str(source_dir)])
+    with pytest.raises(SystemExit) as exit_info:
+        convert.main()
+    assert exit_info.value.code == 1
+
+    output = capsys.readouterr().out
+    assert "FAILED     {0}".format(source_dir / "broken.stp") in output
+    assert "Converted 2 of 3 files" in output
+    assert sorted(os.listdir(tmp_path / "json" / "nested")) == ["strip.json", "twocurves.json"]
+
+    with open(tmp_path / "json" / "nested" / "twocurves.json") as json_file:
+        assert list(json.load(json_file)["pvs"]) == ["ca://MTEST:SinVal", "ca://MTEST:CosVal"]
+
+
+def test_find_conversions_next_to_files(tmp_path):
+    stp_filename = str(tmp_path / "config.stp")
+    assert list(convert.find_conversions([stp_filename])) == [(stp_filename, str(tmp_path / "config.json"))]
@@ -0,0 +1,123 @@
+"""
+Unit Test for the Curves Added a Batch at a Time After the Display Shows Up
+"""
+
+from qtpy.QtGui import QColor
+
+from timechart.displays.curve_loader import CurveLoader
+from timechart.displays.main_display import TimeChartDisplay
+
+PV_NAMES = ["loc://CURVE_LOADER_{0}?type=float&init=0".format(i) for i in range(3)]
+
+
+def test_curve_loader_adds_in_batches(qtbot):
+    batches = []
+    progress = []
+    loader = CurveLoader(batches.append, batch_time_ms=0)
+    loader.progressChanged.connect(lambda done, total: progress.append((done, total)))
+
+    loader.queue(range(3))
+    assert loader.is_loading
+    assert batches == []
+    with qtbot.waitSignal(loader.finished, timeout=1000):
+        pass
+    assert sum(batches, []) == [0, 1, 2]
+    assert progress[0] == (0, 3)
+    assert progress[-1] == (3, 3)
+    assert not loader.is_loading
+
+    loader.queue(["cancelled"] * 2)
+    loader.cancel()
+    qtbot.wait(10)
+    assert "cancelled" not in sum(batches, [])
+
+    # The curves left are added with a single call
+    loader.queue(range(3, 6))
+    loader.finish()
+    assert batches[-1] == [3, 4, 5]
+
+
+def test_curve_loader_completes_or_drops_curves(qtbot):
+    batches = []
+    completed = []
+    loader = CurveLoader(batches.append, batch_time_ms=0)
+
+    loader.queue(range(4), on_finished=lambda: completed.append("first"))
+    loader.discard(lambda curve: curve % 2)
+    assert completed == []
+    with qtbot.waitSignal(loader.finished, timeout=1000):
+        pass
+    assert sum(batches, []) == [0, 2]
+    assert completed == ["first"]
+
+    # What was to be done once the curves were added is dropped with them
+    loader.queue(range(2), on_finished=lambda: completed.append("cancelled"))
+    loader.cancel()
+    qtbot.wait(10)
+    assert completed == ["first"]
+
+    # Without any curve left to add, it's done right away
+    loader.queue([], on_finished=lambda: completed.append("empty"))
+    assert completed == ["first", "empty"]
+
+
+def test_curve_loader_grows_fast_batches(qtbot):
+    batches = []
+    loader = CurveLoader(batches.append, batch_time_ms=1000)
+    loader.queue(range(10))
+    with qtbot.waitSignal(loader.finished, timeout=1000):
+        pass
+    assert [len(batch) for batch in batches] == [1, 2, 4, 3]
+
+
+def test_display_loads_curves_after_showing(qtbot):
+    display = TimeChartDisplay()
+    qtbot.addWidget(display)
+
+    display.load_curves(PV_NAMES)
+    assert display.channel_map == dict()
+    display.show()
+    qtbot.waitUntil(lambda: len(display.channel_map) == len(PV_NAMES), timeout=2000)
+    assert not display.curve_loading_bar.isVisible()
+
+    for pv_name in PV_NAMES:
+        display.remove_curve(pv_name)
+    display.close()
+
+
+def test_display_adds_curves_at_once(qtbot):
+    display = TimeChartDisplay()
+    qtbot.addWidget(display)
+
+    pv_names = ["loc://CURVE_BATCH_{0}?type=float&init=0".format(i) for i in range(3)]
+    display.add_y_channels([dict(pv_name=pv_name, curve_name=pv_name, color=QColor("red"), is_visible=(i != 1))
+                            for i, pv_name in enumerate(pv_names + pv_names[:1])])
+    assert list(display.channel_map) == pv_names
+    assert set(display.pv_controls) == set(pv_names)
+    assert not display.pv_controls[pv_names[1]].checkbox.isChecked()
+    assert len(display.chart.plotItem.legend.items) == len(pv_names)
+    assert display.chart.plotItem.legend.size is None
+
+    for pv_name in pv_names:
+        display.remove_curve(pv_name)
+    display.close()
+
+
+def test_display_drops_removed_curves_still_loading(qtbot):
+    display = TimeChartDisplay()
+    qtbot.addWidget(display)
+
+    display.load_curves(PV_NAMES)
+    display.remove_curve(PV_NAMES[1])
+    display.curve_loader.finish()
+    assert list(display.channel_map) == [PV_NAMES[0], PV_NAMES[2]]
+
+    # Closing the window drops the curves still waiting to be added
+    display.load_curves(PV_NAMES[1:2])
+    display.close()
+    qtbot.wait(10)
+    assert not display.curve_loader.is_loading
+    assert PV_NAMES[1] not in display.channel_map
+
+    for pv_name in list(display.channel_map):
+        display.remove_curve(pv_name)
@@ -0,0 +1,52 @@
+"""
+Unit Test for the Data and Graph Tabs Built on First Use
+"""
+
+from timechart.displays.main_display import TimeChartDisplay
+
+PV_NAME = "loc://LAZY_TABS?type=float&init=0"
+
+
+def test_settings_tabs_are_built_on_first_use(qtbot, monkeypatch):
+    display = TimeChartDisplay()
+    qtbot.addWidget(display)
+    assert not display._settings_tabs_built
+    assert "chart_redraw_rate_spin" not in display.__dict__
+
+    display.add_curve(PV_NAME)
+    display.show()
+    qtbot.waitExposed(display)
+    assert not display._settings_tabs_built
+    assert display.is_legend_checked() == display.chart.showLegend
+
+    # Applying the data sampling mode again would clear the data of the curves
+    sampling_mode_changes = []
+    monkeypatch.setattr(display.chart, "setUpdatesAsynchronously", sampling_mode_changes.append)
+    monkeypatch.setattr(display.chart, "setCapturesUpdates", sampling_mode_changes.append)
+    display.tab_panel.setCurrentWidget(display.data_settings_tab)
+    assert display._settings_tabs_built
+    assert display.chart_sync_mode_async_radio.isChecked()
+    # The widgets added to the shown tab are shown from the event loop
+    qtbot.waitUntil(lambda: display.chart_limit_time_span_chk.isVisible(), timeout=1000)
+    assert not display.chart_ingestion_statistics_lbl.isVisible()
+    assert display.show_legend_chk.isChecked() == display.chart.showLegend
+    assert sampling_mode_changes == []
+
+    monkeypatch.undo()
+    display.remove_curve(PV_NAME)
+
+
+def test_settings_tabs_are_only_built_on_request(qtbot):
+    display = TimeChartDisplay()
+    qtbot.addWidget(display)
+
+    # Probing, or mistyping, a widget name doesn't build the tabs as a side effect
+    assert not hasattr(display, "chart_redraw_rate_spin")
+    assert not hasattr(display, "no_such_widget")
+    assert not display._settings_tabs_built
+
+    display.set_render_mode(display.chart.getRenderMode())
+    assert display._settings_tabs_built
+    assert display.chart_redraw_rate_spin.value() > 0
+    assert display.data_settings_tab.layout() is display.data_tab_layout
+    assert display.chart_ring_buffer_size_edt.text() == str(display.chart.getBufferSize())
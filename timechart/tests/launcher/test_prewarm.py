@@ -0,0 +1,81 @@
+"""
+Unit Test for the Prewarmed Process Forking TimeChart Processes
+"""
+
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+from timechart.utilities.prewarm import (PrewarmServer, can_prewarm, forwarded_environment, request_prewarmed_process,
+                                        prewarm_socket_path)
+
+
+@pytest.mark.skipif(not can_prewarm(), reason="Forking processes isn't supported on this platform")
+def test_prewarmed_process_forks_requested_process(tmp_path, monkeypatch):
+    path = str(tmp_path / "prewarm" / "prewarm.sock")
+    output = tmp_path / "forked.json"
+
+    def run(argv, requested_at):
+        output.write_text(json.dumps({"argv": argv, "cwd": os.getcwd(), "env": os.environ.get("TIMECHART_PREWARM_TEST"),
+                                      "requested_at": requested_at}))
+        return 3
+
+    server = PrewarmServer(run, path=path)
+    assert server.listen()
+    assert not PrewarmServer(run, path=path).listen()
+    # Created private to the current user, rather than changed once bound
+    assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(path).st_mode) & 0o077 == 0
+
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    monkeypatch.chdir(work_dir)
+    monkeypatch.setenv("TIMECHART_PREWARM_TEST", "requester")
+    pids = []
+    requester = threading.Thread(target=lambda: pids.append(request_prewarmed_process(["--pvs", "PV:1"], path=path)))
+    requester.start()
+    try:
+        # The first connection is the check of the second server, which sends no request
+        for _ in range(2):
+            connection, _ = server._socket.accept()
+            with connection:
+                server._handle_request(connection)
+        requester.join(timeout=10)
+    finally:
+        server.close()
+
+    assert pids and pids[0]
+    _, status = os.waitpid(pids[0], 0)
+    assert os.WEXITSTATUS(status) == 3
+    forked = json.loads(output.read_text())
+    assert forked["argv"] == ["--pvs", "PV:1"]
+    assert forked["cwd"] == str(work_dir)
+    assert forked["env"] == "requester"
+    assert forked["requested_at"] > 0
+
+    assert not os.path.exists(path)
+    assert request_prewarmed_process([], path=path) is None
+
+
+@pytest.mark.skipif(not can_prewarm(), reason="Forking processes isn't supported on this platform")
+def test_socket_outside_private_directory_is_not_used(tmp_path, monkeypatch):
+    shared_dir = tmp_path / "shared"
+    shared_dir.mkdir()
+    os.chmod(str(shared_dir), 0o777)
+    path = str(shared_dir / "prewarm.sock")
+
+    assert not PrewarmServer(lambda argv, requested_at: 0, path=path).listen()
+    assert request_prewarmed_process([], path=path) is None
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    assert os.path.basename(os.path.dirname(prewarm_socket_path())).startswith("timechart-prewarm-")
+
+
+def test_only_timechart_environment_is_forwarded():
+    environment = {"DISPLAY": ":1", "EPICS_CA_ADDR_LIST": "10.0.0.1", "PYDM_DEFAULT_PROTOCOL": "ca",
+                   "AWS_SECRET_ACCESS_KEY": "secret", "GITHUB_TOKEN": "token"}
+    assert forwarded_environment(environment) == {"DISPLAY": ":1", "EPICS_CA_ADDR_LIST": "10.0.0.1",
+                                                  "PYDM_DEFAULT_PROTOCOL": "ca"}
@@ -0,0 +1,34 @@
+"""
+Unit Test for the Handoff of PVs to the Running TimeChart Window
+"""
+
+import os
+import stat
+import threading
+
+from timechart.utilities.single_instance import InstanceServer, send_pvs_to_running_instance
+
+SERVER_NAME = "timechart-test-instance"
+
+
+def test_pvs_are_handed_to_running_instance(qtbot):
+    server = InstanceServer(name=SERVER_NAME)
+    assert server.listen()
+    assert not InstanceServer(name=SERVER_NAME).listen()
+    # Other users can neither connect to the socket, nor replace it
+    assert stat.S_IMODE(os.stat(server._server.fullServerName()).st_mode) & 0o077 == 0
+
+    received = []
+    server.pvsReceived.connect(received.append)
+    results = []
+    # The handoff waits for the reply, which the server only sends from the event loop of this thread
+    sender = threading.Thread(target=lambda: results.append(
+        send_pvs_to_running_instance(["ca://PV:1", "ca://PV:2"], name=SERVER_NAME)))
+    sender.start()
+    qtbot.waitUntil(lambda: bool(results), timeout=5000)
+    sender.join()
+    assert results == [True]
+    assert received == [["ca://PV:1", "ca://PV:2"]]
+
+    server.close()
+    assert not send_pvs_to_running_instance(["ca://PV:1"], name=SERVER_NAME)
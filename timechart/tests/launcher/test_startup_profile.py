@@ -0,0 +1,57 @@
+"""
+Unit Test for the Profiling of the TimeChart Startup
+"""
+
+import json
+import sys
+
+from timechart.utilities.startup_profile import StartupProfiler, startup_phase
+
+
+def test_profiler_records_phases_and_imports(tmp_path, monkeypatch):
+    package = tmp_path / "profiled_package"
+    package.mkdir()
+    (package / "__init__.py").write_text("from . import child\n")
+    (package / "child.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    with startup_phase("unprofiled"):
+        pass
+
+    profiler = StartupProfiler()
+    profiler.activate()
+    try:
+        profiler.start_timing_imports()
+        with startup_phase("module imports"):
+            import profiled_package  # noqa: F401
+        profiler.stop_timing_imports()
+        with startup_phase("display"):
+            with startup_phase("setup_ui"):
+                pass
+        end_first_paint = profiler.start_phase("first paint")
+        end_first_paint()
+        end_first_paint()
+    finally:
+        profiler.deactivate()
+        sys.modules.pop("profiled_package", None)
+        sys.modules.pop("profiled_package.child", None)
+
+    with startup_phase("after profiling"):
+        pass
+
+    phases = [(phase["name"], phase["depth"]) for phase in profiler.phases]
+    assert phases == [("module imports", 0), ("display", 0), ("setup_ui", 1), ("first paint", 0)]
+    assert all(phase["duration_s"] >= 0 for phase in profiler.phases)
+
+    report_path, tree_path = profiler.write(str(tmp_path / "startup.json"))
+    with open(report_path) as report_file:
+        report = json.load(report_file)
+    imports = [(record["module"], record["depth"]) for record in report["imports"]]
+    assert imports == [("profiled_package.child", 1), ("profiled_package", 0)]
+    assert report["imports"][1]["cumulative_us"] >= report["imports"][0]["cumulative_us"]
+
+    with open(tree_path) as tree_file:
+        tree = tree_file.read().splitlines()
+    assert tree[0] == "import time: self [us] | cumulative | imported package"
+    assert tree[1].endswith("|   profiled_package.child")
+    assert tree[2].endswith("| profiled_package")
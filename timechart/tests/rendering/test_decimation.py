@@ -0,0 +1,63 @@
+"""
+Unit Test for the Peak-Preserving Decimation of Curve Data
+"""
+
+import pytest
+
+import numpy as np
+
+from timechart.buffers.ring_buffer import RingBuffer
+from timechart.utilities.decimation import min_max_decimate
+
+
+def test_too_few_points_are_not_decimated():
+    x = np.arange(10, dtype=float)
+    y = np.sin(x)
+
+    decimated_x, decimated_y = min_max_decimate(x, y, 0, 10, columns=100)
+
+    assert decimated_x is x
+    assert decimated_y is y
+
+
+@pytest.mark.parametrize("columns", [1, 7, 100])
+def test_decimation_keeps_spikes_and_endpoints(columns):
+    x = np.linspace(0, 100, 100001)
+    y = np.zeros_like(x)
+    y[12345] = 50.0
+    y[67890] = -20.0
+
+    decimated_x, decimated_y = min_max_decimate(x, y, 0, 100, columns)
+
+    assert len(decimated_x) <= 2 * columns + 2
+    assert decimated_y.max() == 50.0
+    assert decimated_y.min() == -20.0
+    assert (decimated_x[0], decimated_x[-1]) == (x[0], x[-1])
+    assert np.all(np.diff(decimated_x) >= 0)
+
+
+def test_decimation_ignores_nan_unless_whole_column_is_nan():
+    x = np.arange(1000, dtype=float)
+    y = np.ones_like(x)
+    y[150:160] = np.nan
+    y[300:400] = np.nan
+
+    decimated_x, decimated_y = min_max_decimate(x, y, 0, 1000, columns=10)
+
+    # A column holding only NaN values stays a gap in the curve
+    assert np.array_equal(np.isnan(decimated_y), (decimated_x >= 300) & (decimated_x < 400))
+
+
+def test_ring_buffer_between_clips_to_time_range():
+    ring_buffer = RingBuffer(10)
+    for i in range(15):
+        ring_buffer.append(float(i), float(i))
+
+    # The oldest samples, 0 to 4, have been overwritten, and the newest ones wrap around the end of the storage
+    timestamps = ring_buffer.between(8.5, 11.5)[0]
+    assert timestamps[0] <= 8.0 and timestamps[-1] >= 12.0
+    assert set(np.arange(9.0, 12.0)).issubset(timestamps)
+    assert len(timestamps) <= 7
+    assert np.all(np.diff(timestamps) >= 0)
+
+    assert np.array_equal(ring_buffer.between(0, 100)[0], np.arange(5.0, 15.0))
@@ -0,0 +1,83 @@
+"""
+Unit Test for the Multi-Resolution History of Curve Data
+"""
+
+import pytest
+
+import numpy as np
+
+from timechart.buffers.lod_pyramid import LodPyramid
+from timechart.buffers.ring_buffer import RingBuffer
+from timechart.displays.defaults import LOD_MIN_BUCKET_SIZE
+
+
+def _fill(ring_buffer, pyramid, values, start=0):
+    for i, value in enumerate(values, start):
+        ring_buffer.append(float(i), value)
+        if ring_buffer.total_appended % LOD_MIN_BUCKET_SIZE == 0:
+            pyramid.update(ring_buffer)
+
+
+def test_levels_aggregate_raw_samples():
+    capacity = 1024
+    ring_buffer = RingBuffer(capacity)
+    pyramid = LodPyramid(capacity)
+    values = np.random.RandomState(0).normal(size=capacity)
+    _fill(ring_buffer, pyramid, values)
+
+    assert pyramid.bucket_sizes[0] == LOD_MIN_BUCKET_SIZE
+    assert pyramid.bucket_sizes[-1] <= capacity
+
+    for index, size in enumerate(pyramid.bucket_sizes):
+        buckets = pyramid.level(index).unrolled()
+        grouped = values.reshape(-1, size)
+
+        assert np.array_equal(buckets[0], np.arange(0, capacity, size))
+        assert np.array_equal(buckets[1], grouped.min(axis=1))
+        assert np.array_equal(buckets[2], grouped.max(axis=1))
+        assert np.allclose(buckets[3], grouped.mean(axis=1))
+
+
+def test_levels_follow_overwritten_and_cleared_samples():
+    capacity = 256
+    ring_buffer = RingBuffer(capacity)
+    pyramid = LodPyramid(capacity)
+    _fill(ring_buffer, pyramid, np.arange(5 * capacity, dtype=float))
+
+    finest = pyramid.level(0).unrolled()
+    assert finest[0, -1] == 5 * capacity - LOD_MIN_BUCKET_SIZE
+    assert finest[0, 0] <= ring_buffer.first()[0]
+
+    ring_buffer.clear()
+    _fill(ring_buffer, pyramid, np.ones(LOD_MIN_BUCKET_SIZE) * 7)
+
+    assert np.array_equal(pyramid.level(0).unrolled(), [[0], [7], [7], [7]])
+    assert len(pyramid.level(1)) == 0
+
+
+@pytest.mark.parametrize("columns", [10, 100])
+def test_render_keeps_spikes(columns):
+    capacity = 100000
+    ring_buffer = RingBuffer(capacity)
+    pyramid = LodPyramid(capacity)
+    values = np.zeros(capacity + 5)
+    values[12345] = 50.0
+    values[-3] = -20.0
+    _fill(ring_buffer, pyramid, values)
+
+    x, y = pyramid.render(ring_buffer, ring_buffer.first()[0], ring_buffer.last()[0], columns)
+
+    assert len(x) <= 8 * columns + 10
+    assert np.all(np.diff(x) >= 0)
+    assert y.max() == 50.0
+    assert y.min() == -20.0
+    assert x[-1] == ring_buffer.last()[0]
+
+
+def test_render_falls_back_to_raw_data_for_narrow_ranges():
+    capacity = 1000
+    ring_buffer = RingBuffer(capacity)
+    pyramid = LodPyramid(capacity)
+    _fill(ring_buffer, pyramid, np.zeros(capacity))
+
+    assert pyramid.render(ring_buffer, 100, 200, columns=800) is None
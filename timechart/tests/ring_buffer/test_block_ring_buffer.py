@@ -0,0 +1,86 @@
+"""
+Unit Test for the Ring Buffer Made of Blocks
+"""
+
+import pytest
+
+import numpy as np
+
+from timechart.buffers.block_ring_buffer import BlockRingBuffer, MIN_BLOCK_SIZE
+from timechart.buffers.ring_buffer import RingBuffer
+from timechart.widgets.time_chart_plot import TimeChartCurveItem
+
+
+def _samples(start, count):
+    timestamps = np.arange(start, start + count, dtype=float)
+    return np.vstack((timestamps, timestamps * 10))
+
+
+@pytest.mark.parametrize("capacity", [1, 100, 1000, 5000])
+def test_block_ring_buffer_matches_ring_buffer(capacity):
+    ring_buffer = RingBuffer(capacity)
+    block_ring_buffer = BlockRingBuffer(capacity)
+
+    for start, count in [(0, 3), (3, 700), (703, 1), (704, 6000)]:
+        for buffer in (ring_buffer, block_ring_buffer):
+            buffer.extend(_samples(start, count))
+            buffer.append(float(start + count), 0.0)
+
+        assert len(block_ring_buffer) == len(ring_buffer)
+        assert block_ring_buffer.total_appended == ring_buffer.total_appended
+        assert np.array_equal(block_ring_buffer.unrolled(), ring_buffer.unrolled())
+        assert block_ring_buffer.first() == ring_buffer.first()
+        assert block_ring_buffer.last() == ring_buffer.last()
+        assert np.array_equal(block_ring_buffer.newest(300), ring_buffer.newest(300))
+        assert np.array_equal(block_ring_buffer.between(500, 3000), ring_buffer.between(500, 3000))
+        assert block_ring_buffer.count_between(500, 3000) == ring_buffer.count_between(500, 3000)
+
+
+def test_blocks_are_allocated_and_reused_as_needed():
+    ring_buffer = BlockRingBuffer(100 * MIN_BLOCK_SIZE)
+    assert ring_buffer.nbytes == 0
+
+    ring_buffer.extend(_samples(0, 1))
+    assert len(ring_buffer.segments()) == 1
+    nbytes = ring_buffer.nbytes
+    ring_buffer.extend(_samples(1, ring_buffer.capacity * 3))
+    assert ring_buffer.nbytes <= nbytes * (ring_buffer.capacity // MIN_BLOCK_SIZE + 2)
+
+    # Keep the blocks referenced, so that new blocks cannot be allocated at the same addresses
+    blocks = [timestamps for timestamps, _ in ring_buffer._blocks]
+    ring_buffer.extend(_samples(ring_buffer.capacity * 3 + 1, ring_buffer.capacity // 2))
+    assert all(any(timestamps is block for block in blocks) for timestamps, _ in ring_buffer._blocks)
+
+    ring_buffer.clear()
+    assert ring_buffer.nbytes == 0
+
+
+def test_resize_does_not_copy_samples():
+    ring_buffer = BlockRingBuffer(10 * MIN_BLOCK_SIZE)
+    ring_buffer.extend(_samples(0, 10 * MIN_BLOCK_SIZE))
+    segments = ring_buffer.segments()
+
+    ring_buffer.resize(40 * MIN_BLOCK_SIZE)
+    assert all(np.shares_memory(timestamps, old) for (timestamps, _), (old, _) in zip(ring_buffer.segments(), segments))
+    ring_buffer.extend(_samples(10 * MIN_BLOCK_SIZE, 10 * MIN_BLOCK_SIZE))
+    assert len(ring_buffer) == 20 * MIN_BLOCK_SIZE
+    assert ring_buffer.first()[0] == 0
+
+    nbytes = ring_buffer.nbytes
+    ring_buffer.resize(3 * MIN_BLOCK_SIZE)
+    assert ring_buffer.nbytes < nbytes
+    assert np.array_equal(ring_buffer.unrolled(), _samples(17 * MIN_BLOCK_SIZE, 3 * MIN_BLOCK_SIZE))
+
+
+def test_curve_keeps_data_when_resized(qapp):
+    curve = TimeChartCurveItem()
+    curve.setBufferSize(1000)
+    for value in range(600):
+        curve.receiveNewValue(float(value))
+    assert isinstance(curve._ring_buffer, BlockRingBuffer)
+
+    curve.setBufferSize(100000)
+    assert np.array_equal(curve.data_buffer[1], np.arange(600))
+
+    curve.setBufferSize(200)
+    assert np.array_equal(curve.data_buffer[1], np.arange(400, 600))
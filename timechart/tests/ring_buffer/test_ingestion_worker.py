@@ -0,0 +1,66 @@
+"""
+Unit Test for the Reception of Channel Updates on the Ingestion Thread
+"""
+
+import numpy as np
+
+from qtpy.QtCore import QObject, Signal
+
+from timechart.widgets.ingestion_worker import IngestionWorker
+from timechart.widgets.time_chart_plot import TimeChartCurveItem, TimeChartPlot
+
+
+class _Emitter(QObject):
+    new_value_signal = Signal(float)
+
+
+def test_values_received_on_ingestion_thread(qapp, qtbot):
+    curve = TimeChartCurveItem()
+    curve.setBufferSize(1000)
+    curve.set_capture(True)
+
+    worker = IngestionWorker()
+    worker.attach(curve)
+    assert worker.is_running
+
+    emitter = _Emitter()
+    emitter.new_value_signal.connect(worker._ingestors[curve].receiveNewValue)
+    for value in range(500):
+        emitter.new_value_signal.emit(float(value))
+    qtbot.waitUntil(lambda: len(curve.staging_buffer) == 500)
+
+    worker.flush([curve])
+    assert np.array_equal(curve.data_buffer[1], np.arange(500))
+    assert curve.minY == 0 and curve.maxY == 499
+
+    statistics = worker.statistics()
+    assert statistics["received"] == statistics["flushed"] == 500
+    assert statistics["max_backlog"] == 500
+    assert statistics["flush_count"] == 1
+
+    worker.stop()
+    assert not worker.is_running
+
+
+def test_chart_receives_values_on_ingestion_thread(qapp, qtbot):
+    chart = TimeChartPlot()
+    curve = chart.addYChannel(y_channel="loc://INGESTION:1?type=float&init=0", color="red")
+    assert curve.channel.value_slot == curve.receiveNewValue
+    qtbot.waitUntil(lambda: curve._channel_connection() is not None)
+    channel, connection = curve.channel, curve._channel_connection()
+
+    chart.setCapturesUpdates(True)
+    # The existing connection is rerouted to the ingestion thread, rather than the channel being connected again
+    assert curve.channel is channel and curve._channel_connection() is connection
+    assert curve.channel.value_slot != curve.receiveNewValue
+    assert chart.getIngestionStatistics()["received"] == 0
+    connection.new_value_signal[float].emit(1.5)
+    qtbot.waitUntil(lambda: chart.getIngestionStatistics()["received"] == 1)
+
+    chart.setCapturesUpdates(False)
+    assert curve.channel is channel
+    assert curve.channel.value_slot == curve.receiveNewValue
+
+    chart.removeYChannel(curve)
+    chart.close()
+    chart.deleteLater()
@@ -0,0 +1,45 @@
+"""
+Unit Test for the Disk-Backed Ring Buffer
+"""
+
+import numpy as np
+
+from timechart.buffers.memmap_ring_buffer import MemmapRingBuffer
+from timechart.displays.defaults import MEMORY_STORAGE, MEMMAP_STORAGE
+from timechart.widgets.time_chart_plot import TimeChartCurveItem
+
+
+def test_memmap_ring_buffer(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    ring_buffer = MemmapRingBuffer(4, cache_dir, name="TEST:PV/1")
+
+    for i in range(6):
+        ring_buffer.append(float(i), float(i) * 10)
+
+    assert isinstance(ring_buffer._timestamps, np.memmap)
+    assert isinstance(ring_buffer._values, np.memmap)
+    assert all(np.shares_memory(values, ring_buffer._values) for _, values in ring_buffer.segments())
+    assert np.array_equal(ring_buffer.unrolled(), [[2, 3, 4, 5], [20, 30, 40, 50]])
+
+    ring_buffer.resize(8)
+    ring_buffer.append(6.0, 60.0)
+    assert np.array_equal(ring_buffer.unrolled()[0], [2, 3, 4, 5, 6])
+
+    ring_buffer.close()
+    assert not list((tmp_path / "cache").iterdir())
+
+
+def test_curve_moves_data_between_storages(qapp, tmp_path):
+    curve = TimeChartCurveItem()
+    curve.setBufferSize(3)
+    for value in range(5):
+        curve.receiveNewValue(float(value))
+
+    curve.set_storage(MEMMAP_STORAGE, str(tmp_path))
+    assert isinstance(curve._ring_buffer, MemmapRingBuffer)
+    assert np.array_equal(curve.data_buffer[1], [2.0, 3.0, 4.0])
+
+    curve.receiveNewValue(5.0)
+    curve.set_storage(MEMORY_STORAGE)
+    assert not isinstance(curve._ring_buffer, MemmapRingBuffer)
+    assert np.array_equal(curve.data_buffer[1], [3.0, 4.0, 5.0])
@@ -0,0 +1,84 @@
+"""
+Unit Test for the Memory Budget of the Curve Buffers
+"""
+
+import numpy as np
+import pytest
+
+from timechart.buffers.block_ring_buffer import BlockRingBuffer, block_size
+from timechart.buffers.lod_pyramid import LodPyramid
+from timechart.buffers.memory_budget import MemoryBudget, estimate_curve_nbytes
+from timechart.buffers.ring_buffer import RingBuffer
+from timechart.widgets.time_chart_plot import TimeChartPlot
+
+
+@pytest.mark.parametrize("capacity", [16, 1000, 18000])
+def test_estimate_covers_allocation(capacity):
+    assert estimate_curve_nbytes(capacity) >= RingBuffer(capacity).nbytes
+    assert estimate_curve_nbytes(capacity, with_lod=True) - estimate_curve_nbytes(capacity) == LodPyramid(capacity).nbytes
+
+    # The blocks allocated by a full block ring buffer depend on how its oldest and newest blocks are filled
+    ring_buffer = BlockRingBuffer(capacity, value_dtype=np.float32)
+    ring_buffer.extend(np.vstack((np.arange(capacity, dtype=float), np.zeros(capacity))))
+    for i in range(2 * block_size(capacity)):
+        ring_buffer.append(float(capacity + i), 0.0)
+        assert estimate_curve_nbytes(capacity, value_dtype=np.float32) >= ring_buffer.nbytes
+
+
+@pytest.mark.parametrize("with_lod", [False, True])
+def test_max_buffer_size_fits(with_lod):
+    budget = MemoryBudget(10 * 1024 * 1024)
+    max_buffer_size = budget.max_buffer_size(7, with_lod=with_lod)
+
+    assert budget.fits(7 * estimate_curve_nbytes(max_buffer_size, with_lod=with_lod))
+    assert not budget.fits(7 * estimate_curve_nbytes(max_buffer_size + 1, with_lod=with_lod))
+    assert MemoryBudget().max_buffer_size(7) is None
+
+
+def test_chart_stays_within_budget(qapp):
+    chart = TimeChartPlot()
+    exceeded = []
+    chart.memoryBudgetExceeded.connect(lambda requested, applied: exceeded.append((requested, applied)))
+
+    chart.setBufferSize(100000)
+    for i in range(3):
+        chart.addYChannel(y_channel="loc://BUDGET:{0}?type=float&init=0".format(i), color="red")
+    chart.setMemoryBudget(3 * 1024 * 1024)
+
+    assert chart.getBufferSize() < 100000
+    assert sum(chart.getMemoryUsage().values()) <= 3 * 1024 * 1024
+    assert exceeded[-1] == (100000, chart.getBufferSize())
+
+    buffer_size = chart.getBufferSize()
+    chart.addYChannel(y_channel="loc://BUDGET:3?type=float&init=0", color="red")
+    assert chart.getBufferSize() < buffer_size
+    assert sum(chart.getMemoryUsage().values()) <= 3 * 1024 * 1024
+    chart.close()
+    chart.deleteLater()
+
+
+def test_curves_with_own_buffer_size(qapp):
+    chart = TimeChartPlot()
+    chart.setBufferSize(10000)
+    slow = chart.addYChannel(y_channel="loc://BUDGET:SLOW?type=float&init=0", color="red")
+    fast = chart.addYChannel(y_channel="loc://BUDGET:FAST?type=float&init=0", color="red")
+
+    chart.setCurveBufferSize(slow, 2000)
+    chart.setBufferSize(50000)
+    assert slow.getBufferSize() == 2000
+    assert fast.getBufferSize() == 50000
+    assert chart.estimateMemoryUsage() >= sum(chart.getMemoryUsage().values())
+    assert chart.estimateMemoryUsage(own_buffer_sizes={slow: None}) == 2 * estimate_curve_nbytes(50000)
+
+    chart.setMemoryBudget(estimate_curve_nbytes(2000) + estimate_curve_nbytes(30000))
+    assert slow.getBufferSize() == 2000
+    assert fast.getBufferSize() == 30000
+
+    chart.setCurveUpdateInterval(slow, 0.5)
+    assert slow.own_update_interval == 0.5
+    chart.setCurveBufferSize(slow, None)
+    chart.setCurveUpdateInterval(slow, None)
+    assert slow.own_update_interval is None
+    assert slow.getBufferSize() == chart.getBufferSize()
+    chart.close()
+    chart.deleteLater()
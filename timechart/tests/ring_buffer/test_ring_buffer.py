@@ -0,0 +1,137 @@
+"""
+Unit Test for the Ring Buffer and the Ring Buffer-Backed Curves
+"""
+
+import pytest
+
+import numpy as np
+
+from timechart.buffers.ring_buffer import RingBuffer
+from timechart.displays.defaults import SINGLE_PRECISION_VALUES
+from timechart.widgets.time_chart_plot import TimeChartCurveItem
+
+
+def _fill(ring_buffer, count, start=0):
+    for i in range(start, start + count):
+        ring_buffer.append(float(i), float(i) * 10)
+
+
+def test_empty_ring_buffer():
+    ring_buffer = RingBuffer(5)
+
+    assert len(ring_buffer) == 0
+    assert ring_buffer.first() is None
+    assert ring_buffer.last() is None
+    assert ring_buffer.unrolled().shape == (2, 0)
+
+
+@pytest.mark.parametrize("count", [1, 4, 5, 6, 12])
+def test_append_keeps_newest_samples(count):
+    capacity = 5
+    ring_buffer = RingBuffer(capacity)
+    _fill(ring_buffer, count)
+
+    expected_timestamps = np.arange(max(count - capacity, 0), count, dtype=float)
+    data = ring_buffer.unrolled()
+
+    assert len(ring_buffer) == min(count, capacity)
+    assert np.array_equal(data[0], expected_timestamps)
+    assert np.array_equal(data[1], expected_timestamps * 10)
+    assert ring_buffer.first() == (expected_timestamps[0], expected_timestamps[0] * 10)
+    assert ring_buffer.last() == (count - 1, (count - 1) * 10)
+
+
+def test_segments_are_views():
+    ring_buffer = RingBuffer(4)
+    _fill(ring_buffer, 6)
+
+    segments = ring_buffer.segments()
+
+    assert len(segments) == 2
+    assert all(np.shares_memory(timestamps, ring_buffer._timestamps) for timestamps, _ in segments)
+    assert all(np.shares_memory(values, ring_buffer._values) for _, values in segments)
+    assert np.array_equal(np.concatenate([timestamps for timestamps, _ in segments]), ring_buffer.unrolled()[0])
+    assert np.array_equal(np.concatenate([values for _, values in segments], axis=1), ring_buffer.unrolled()[1:])
+
+
+@pytest.mark.parametrize("new_capacity", [2, 4, 8])
+def test_resize_keeps_newest_samples(new_capacity):
+    ring_buffer = RingBuffer(4)
+    _fill(ring_buffer, 7)
+    before = ring_buffer.unrolled()
+
+    ring_buffer.resize(new_capacity)
+
+    assert ring_buffer.capacity == new_capacity
+    assert np.array_equal(ring_buffer.unrolled(), before[:, -new_capacity:])
+
+    _fill(ring_buffer, 1, start=7)
+    assert ring_buffer.last() == (7.0, 70.0)
+
+
+def test_load_and_truncate():
+    ring_buffer = RingBuffer(3)
+    ring_buffer.load(np.array([[1, 2, 3, 4], [10, 20, 30, 40]], dtype=float))
+
+    assert np.array_equal(ring_buffer.unrolled(), [[2, 3, 4], [20, 30, 40]])
+
+    ring_buffer.truncate(1)
+    assert np.array_equal(ring_buffer.unrolled(), [[4], [40]])
+
+
+def test_curve_records_into_ring_buffer(qapp):
+    curve = TimeChartCurveItem()
+    curve.setBufferSize(3)
+
+    for value in range(5):
+        curve.receiveNewValue(float(value))
+
+    assert curve.points_accumulated == 3
+    assert curve.get_latest_y() == 4.0
+    assert np.array_equal(curve.data_buffer[1], [2.0, 3.0, 4.0])
+    assert curve.min_x() <= curve.max_x()
+
+    curve.redrawCurve()
+    _, y = curve.getData()
+    assert np.array_equal(y, [2.0, 3.0, 4.0])
+
+    curve.initialize_buffer()
+    assert curve.points_accumulated == 0
+    assert curve.get_latest_y() == 0.0
+
+
+@pytest.mark.parametrize("count", [3, 5, 11])
+def test_extend_matches_append(count):
+    appended = RingBuffer(5)
+    extended = RingBuffer(5)
+    _fill(appended, 3)
+    _fill(appended, count, start=3)
+    _fill(extended, 3)
+
+    timestamps = np.arange(3, 3 + count, dtype=float)
+    extended.extend(np.vstack((timestamps, timestamps * 10)))
+
+    assert np.array_equal(extended.unrolled(), appended.unrolled())
+    assert extended.total_appended == appended.total_appended == 3 + count
+    assert np.array_equal(extended.newest(2), appended.unrolled()[:, -2:])
+    assert extended.count_between(4, 6) == appended.unrolled()[0].searchsorted(6, side="right") - \
+        appended.unrolled()[0].searchsorted(4)
+
+
+def test_single_precision_values(qapp):
+    ring_buffer = RingBuffer(4, value_dtype=np.float32)
+    _fill(ring_buffer, 6)
+
+    assert ring_buffer.nbytes == RingBuffer(4).nbytes * 3 // 4
+    assert ring_buffer.unrolled().dtype == np.float64
+    assert np.array_equal(ring_buffer.unrolled(), [[2, 3, 4, 5], [20, 30, 40, 50]])
+
+    curve = TimeChartCurveItem()
+    curve.setBufferSize(3)
+    for value in range(5):
+        curve.receiveNewValue(value + 0.1)
+    curve.set_value_precision(SINGLE_PRECISION_VALUES)
+
+    assert curve._ring_buffer.value_dtype == np.float32
+    assert curve.data_buffer.dtype == np.float64
+    assert np.allclose(curve.data_buffer[1], [2.1, 3.1, 4.1])
@@ -0,0 +1,206 @@
+"""
+Unit Test for the Ring Buffers Shared with the Collector Process
+"""
+
+import os
+import stat
+
+import pytest
+
+import numpy as np
+
+from timechart.buffers.ring_buffer import ReadOnlyRingBufferError, RingBuffer
+from timechart.buffers.shared_memory_ring_buffer import SharedMemoryRingBuffer, SharedMemoryRingBufferView
+from timechart.collector.client import CollectorClient
+from timechart.collector.server import CollectedChannel, CollectorServer
+from timechart.widgets.time_chart_plot import TimeChartCurveItem, TimeChartPlot
+
+
+def _samples(start, count):
+    timestamps = np.arange(start, start + count, dtype=float)
+    return np.vstack((timestamps, timestamps * 10))
+
+
+@pytest.fixture
+def shared_buffers():
+    ring_buffer = SharedMemoryRingBuffer(100)
+    view = SharedMemoryRingBufferView(ring_buffer.name)
+    yield ring_buffer, view
+    view.close()
+    ring_buffer.close()
+
+
+def test_view_reads_samples_written_by_writer(shared_buffers):
+    ring_buffer, view = shared_buffers
+    reference = RingBuffer(100)
+
+    for start, count in [(0, 3), (3, 70), (73, 500)]:
+        ring_buffer.extend(_samples(start, count))
+        reference.extend(_samples(start, count))
+
+        assert len(view) == len(reference)
+        assert view.total_appended == reference.total_appended
+        assert np.array_equal(view.unrolled(), reference.unrolled())
+        assert view.first() == reference.first()
+        assert view.last() == reference.last()
+        assert np.array_equal(view.between(520, 540), reference.between(520, 540))
+
+    with pytest.raises(ValueError):
+        view.segments()[0][0][0] = 0.0
+    with pytest.raises(ReadOnlyRingBufferError):
+        view.append(0.0, 0.0)
+    with pytest.raises(ReadOnlyRingBufferError):
+        view.resize(200)
+    with pytest.raises(ReadOnlyRingBufferError):
+        ring_buffer.resize(200)
+    view.resize(100)
+
+    view.clear()
+    assert len(view) == 0
+    ring_buffer.append(1000.0, 1.0)
+    assert np.array_equal(view.unrolled(), [[1000.0], [1.0]])
+
+
+def test_view_leaves_out_samples_overwritten_while_copying(shared_buffers):
+    ring_buffer, view = shared_buffers
+    ring_buffer.extend(_samples(0, 100))
+
+    with ring_buffer._write(10):
+        # The writer is about to overwrite the 10 oldest samples, which the view is copying from a previous snapshot
+        view._snapshot = (ring_buffer._head, len(ring_buffer), ring_buffer.total_appended)
+        view._frozen = True
+        data = view.newest(100)
+        view._frozen = False
+    assert np.array_equal(data, _samples(10, 90))
+
+
+def test_curve_reads_collected_channel(qapp):
+    collected = CollectedChannel("loc://COLLECTED?type=float&init=0", 100)
+    view = SharedMemoryRingBufferView(collected.ring_buffer.name)
+    curve = TimeChartCurveItem(channel_address=collected.address, collector_buffer=view)
+    try:
+        assert curve.channel is None
+        assert curve.address == collected.address
+
+        collected.connectionStateChanged(True)
+        for value in range(5):
+            collected.receiveNewValue(float(value))
+        curve.poll_collector_buffer()
+        assert curve.connected
+        assert np.array_equal(curve.data_buffer[1], np.arange(5))
+        assert (curve.minY, curve.maxY) == (0, 4)
+
+        curve.setUpdatesAsynchronously(True)
+        curve.asyncUpdate()
+        assert len(curve.data_buffer[1]) == 0
+
+        # The collector process sets the capacity of its ring buffers
+        curve.setBufferSize(1000)
+        curve.set_own_buffer_size(1000)
+        curve.initialize_buffer()
+        assert curve.own_buffer_size is None
+        assert view.capacity == 100
+    finally:
+        curve.release_buffer()
+        collected.close()
+
+
+def test_server_shares_channel_between_windows(qapp):
+    server = CollectorServer(name="timechart-test-collector")
+    address = "loc://SHARED_COLLECTED?type=float&init=0"
+    first_window, second_window = object(), object()
+
+    name = server.subscribe(first_window, address, 100)["name"]
+    assert server.subscribe(second_window, address, 1000)["name"] == name
+    assert server.addresses == [address]
+
+    server.unsubscribe(first_window, address)
+    assert server.addresses == [address]
+    server.unsubscribe(second_window, address)
+    assert server.addresses == []
+    with pytest.raises(FileNotFoundError):
+        SharedMemoryRingBufferView(name)
+
+
+def test_collector_socket_is_private(qapp):
+    server = CollectorServer(name="timechart-test-private-collector")
+    assert server.listen()
+    try:
+        # Other users can neither attach to the collector, nor replace its socket
+        assert stat.S_IMODE(os.stat(server._server.fullServerName()).st_mode) & 0o077 == 0
+    finally:
+        server.close()
+
+
+def test_chart_falls_back_to_own_channels(qapp):
+    client = CollectorClient(name="timechart-test-no-collector")
+    assert not client.connect_to_collector(timeout_ms=100)
+    assert client.subscribe("loc://NO_COLLECTOR?type=float&init=0", 100) is None
+
+    chart = TimeChartPlot()
+    chart.setCollectorClient(client)
+    curve = chart.addYChannel(y_channel="loc://NO_COLLECTOR?type=float&init=0", color="red")
+    assert curve.collector_buffer is None
+    assert curve.channel is not None
+    assert not chart.collector_timer.isActive()
+    chart.removeYChannel(curve)
+    chart.close()
+    chart.deleteLater()
+
+
+class _BatchCollectorClient(object):
+    """
+    A collector client attaching to channels collected in this process, counting the round trips.
+    """
+    def __init__(self):
+        self.channels = dict()
+        self.round_trips = 0
+        self.unsubscribed = []
+
+    def subscribe_all(self, addresses, buffer_size):
+        self.round_trips += 1
+        views = []
+        for address in addresses:
+            if address not in self.channels:
+                self.channels[address] = CollectedChannel(address, buffer_size)
+            views.append(SharedMemoryRingBufferView(self.channels[address].ring_buffer.name))
+        return views
+
+    def subscribe(self, address, buffer_size):
+        return self.subscribe_all([address], buffer_size)[0]
+
+    def unsubscribe(self, address):
+        self.unsubscribed.append(address)
+
+
+def test_chart_subscribes_curves_at_once(qapp, monkeypatch):
+    client = _BatchCollectorClient()
+    chart = TimeChartPlot()
+    chart.setCollectorClient(client)
+    addresses = ["loc://BATCH_COLLECTED_{0}?type=float&init=0".format(i) for i in range(3)]
+
+    # Refuse the curve before its base class is constructed
+    init_curve = TimeChartCurveItem.__init__
+
+    def refuse_bad_curve(curve, *args, **kwargs):
+        if kwargs.get("lineWidth") == "not a width":
+            raise ValueError("Invalid line width")
+        init_curve(curve, *args, **kwargs)
+    monkeypatch.setattr(TimeChartCurveItem, "__init__", refuse_bad_curve)
+
+    curves = chart.addYChannels([dict(y_channel=address, color="red") for address in addresses] +
+                                [dict(y_channel=addresses[0], color="red", lineWidth="not a width")])
+    try:
+        assert client.round_trips == 1
+        assert all(curve.collector_buffer is not None for curve in curves[:3])
+        # The channel subscribed to for the curve that couldn't be added is unsubscribed
+        assert curves[3] is None
+        assert client.unsubscribed == [addresses[0]]
+        assert chart._collector_buffers == dict()
+    finally:
+        for curve in curves[:3]:
+            chart.removeYChannel(curve)
+        for channel in client.channels.values():
+            channel.close()
+        chart.close()
+        chart.deleteLater()
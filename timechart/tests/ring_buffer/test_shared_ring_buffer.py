@@ -0,0 +1,119 @@
+"""
+Unit Test for the Ring Buffer Shared by the Curves Sampled at the Same Times
+"""
+
+import numpy as np
+import pytest
+
+from timechart.buffers.memory_budget import MemoryBudget, estimate_curve_nbytes, estimate_shared_nbytes
+from timechart.buffers.ring_buffer import ReadOnlyRingBufferError
+from timechart.buffers.shared_ring_buffer import SharedRingBuffer
+from timechart.widgets.time_chart_plot import TimeChartPlot
+
+
+def test_shared_ring_buffer_rows():
+    shared_buffer = SharedRingBuffer(4)
+    first, second = shared_buffer.add_rows(2)
+    for i in range(3):
+        shared_buffer.append(float(i), [i * 10.0, i * 100.0])
+
+    third, = shared_buffer.add_rows(1)
+    for i in range(3, 6):
+        shared_buffer.append(float(i), [i * 10.0, i * 100.0, -i])
+
+    assert np.array_equal(first.unrolled(), [[2, 3, 4, 5], [20, 30, 40, 50]])
+    assert np.array_equal(second.unrolled(), [[2, 3, 4, 5], [200, 300, 400, 500]])
+    assert np.array_equal(third.unrolled(), [[3, 4, 5], [-3, -4, -5]])
+    assert np.isnan(shared_buffer.matrix()[3, 0])
+
+    second.clear()
+    shared_buffer.remove_rows([first])
+    assert first.shared_buffer is None
+    assert len(second) == 0
+    assert np.array_equal(third.unrolled(), [[3, 4, 5], [-3, -4, -5]])
+
+    shared_buffer.append(6.0, [600.0, -6.0])
+    assert np.array_equal(second.unrolled(), [[6], [600]])
+    assert np.array_equal(shared_buffer.matrix()[:, -1], [6, 600, -6])
+
+    with pytest.raises(ReadOnlyRingBufferError):
+        second.append(7.0, 700.0)
+
+
+def test_shared_ring_buffer_reuses_free_rows():
+    shared_buffer = SharedRingBuffer(4)
+    rows = [shared_buffer.add_rows(1)[0] for _ in range(5)]
+    assert shared_buffer.allocated_rows == 8
+    shared_buffer.append(0.0, [0.0, 1.0, 2.0, 3.0, 4.0])
+
+    # A removed row is freed, and reused by the next row added without reallocating the matrix
+    ring_buffer = shared_buffer.ring_buffer
+    shared_buffer.remove_rows([rows[1]])
+    new_row, = shared_buffer.add_rows(1)
+    assert shared_buffer.ring_buffer is ring_buffer
+    assert new_row.index == 2
+    assert len(new_row) == 0
+    assert np.isnan(shared_buffer.matrix()[5, 0])
+
+    shared_buffer.append(1.0, [10.0, 12.0, 13.0, 14.0, 11.0])
+    assert np.array_equal(new_row.unrolled(), [[1.0], [11.0]])
+    assert np.array_equal(rows[4].unrolled(), [[0.0, 1.0], [4.0, 14.0]])
+
+    # The matrix shrinks once fewer than half of its rows are used
+    shared_buffer.remove_rows(rows[2:])
+    assert shared_buffer.allocated_rows == 2
+    assert np.array_equal(shared_buffer.matrix(), [[0.0, 1.0], [0.0, 10.0], [np.nan, 11.0]], equal_nan=True)
+    assert sum(row.nbytes for row in shared_buffer.rows) <= shared_buffer.nbytes
+
+
+def test_shared_estimate_matches_allocation():
+    shared_buffer = SharedRingBuffer(1000)
+    shared_buffer.add_rows(5)
+    assert estimate_shared_nbytes(1000, 5) >= shared_buffer.nbytes
+    assert estimate_shared_nbytes(1000, 5) < 5 * estimate_curve_nbytes(1000)
+
+    budget = MemoryBudget(1024 * 1024)
+    max_buffer_size = budget.max_buffer_size(2, shared_curve_count=5)
+    assert budget.fits(2 * estimate_curve_nbytes(max_buffer_size) + estimate_shared_nbytes(max_buffer_size, 5))
+    assert not budget.fits(2 * estimate_curve_nbytes(max_buffer_size + 1) +
+                           estimate_shared_nbytes(max_buffer_size + 1, 5))
+
+
+def test_chart_shares_ring_buffer_at_fixed_rate(qapp):
+    chart = TimeChartPlot()
+    chart.setUpdatesAsynchronously(True)
+    curves = [chart.addYChannel(y_channel="loc://SHARED:{0}?type=float&init=0".format(i), color="red")
+              for i in range(3)]
+    assert all(curve.shared_row is not None for curve in curves)
+
+    for i in range(5):
+        for index, curve in enumerate(curves):
+            curve.latest_value = index * 10.0 + i
+        chart._record_shared_samples()
+
+    addresses, samples = chart.getSharedSamples()
+    assert addresses == [curve.address for curve in curves]
+    assert np.array_equal(samples[1:, -1], [4.0, 14.0, 24.0])
+    assert np.array_equal(curves[1].data_buffer, samples[[0, 2]])
+    assert sum(chart.getMemoryUsage().values()) <= chart.estimateMemoryUsage()
+
+    # A curve with its own sampling rate leaves the shared ring buffer, keeping its data
+    chart.setCurveUpdateInterval(curves[2], 0.5)
+    assert curves[2].shared_row is None
+    assert np.array_equal(curves[2].data_buffer[1], [20.0, 21.0, 22.0, 23.0, 24.0])
+    assert chart.getSharedSamples()[0] == [curves[0].address, curves[1].address]
+
+    # Replacing the data of a curve moves the curve out of the shared ring buffer too
+    curves[1].data_buffer = np.array([[1.0, 2.0], [3.0, 4.0]])
+    assert curves[1].shared_row is None
+    assert np.array_equal(curves[1].data_buffer, [[1.0, 2.0], [3.0, 4.0]])
+    assert chart.getSharedSamples()[0] == [curves[0].address]
+
+    chart.setUpdatesAsynchronously(False)
+    assert all(curve.shared_row is None for curve in curves)
+
+    for curve in curves:
+        chart.removeYChannel(curve)
+    chart.close()
+    chart.deleteLater()
+    assert not chart.getSharedSamples()[0]
@@ -0,0 +1,64 @@
+"""
+Unit Test for the Capture of Every Value Received by the Curves
+"""
+
+import numpy as np
+
+from timechart.buffers.staging_buffer import StagingBuffer
+from timechart.widgets.time_chart_plot import TimeChartCurveItem, TimeChartPlot
+
+
+def test_staging_buffer_drain():
+    staging_buffer = StagingBuffer()
+    assert staging_buffer.drain().shape == (2, 0)
+
+    for i in range(3):
+        staging_buffer.append(float(i), i * 10.0)
+    assert len(staging_buffer) == 3
+    assert np.array_equal(staging_buffer.drain(), [[0, 1, 2], [0, 10, 20]])
+    assert len(staging_buffer) == 0
+
+
+def test_curve_captures_every_value(qapp):
+    curve = TimeChartCurveItem()
+    curve.setBufferSize(100)
+    curve.set_capture(True)
+
+    for value in range(250):
+        curve.receiveNewValue(float(value))
+    assert len(curve.data_buffer[1]) == 0
+
+    assert curve.flush_staged_samples() == 250
+    data = curve.data_buffer
+    assert np.array_equal(data[1], np.arange(150, 250))
+    assert np.all(np.diff(data[0]) >= 0)
+
+    curve.receiveNewValue(250.0)
+    curve.set_capture(False)
+    assert curve.get_latest_y() == 250.0
+
+
+def test_chart_capture_mode(qapp):
+    chart = TimeChartPlot()
+    chart.setUpdatesAsynchronously(True)
+    curves = [chart.addYChannel(y_channel="loc://CAPTURE:{0}?type=float&init=0".format(i), color="red")
+              for i in range(2)]
+    assert all(curve.shared_row is not None for curve in curves)
+
+    chart.setCapturesUpdates(True)
+    assert chart.capture_timer.isActive()
+    assert all(curve.captures_updates and curve.shared_row is None for curve in curves)
+
+    for value in range(5):
+        curves[0].receiveNewValue(float(value))
+    chart._flush_staged_samples()
+    assert np.array_equal(curves[0].data_buffer[1][-5:], np.arange(5))
+
+    chart.setCapturesUpdates(False)
+    assert not chart.capture_timer.isActive()
+    assert all(not curve.captures_updates and curve.shared_row is not None for curve in curves)
+
+    for curve in curves:
+        chart.removeYChannel(curve)
+    chart.close()
+    chart.deleteLater()
@@ -151,3 +151,27 @@ def _make_output_dir():
         # It's OK if the directory exists. This is to be compatible with Python 2.7
         if err.errno != errno.EEXIST:
             raise err
+
+
+def test_striptool_conversions_are_independent():
+    """
+    Convert two StripTool files at the same time, making sure that the line width and the colors of one file do not
+    leak into the other.
+    """
+    importer = SettingsImporter().striptool_importer
+    first_data = importer.import_to_dict(["Strip.Option.GraphLineWidth   3\n",
+                                          "Strip.Color.Color1            65535     0         0         \n",
+                                          "Strip.Curve.0.Name            FIRST:PV\n"])
+    second_data = importer.import_to_dict(iter(["", "   Strip.Curve.0.Name   SECOND:PV   \n",
+                                                "Strip.Curve.0.Units\n"]))
+
+    first_colors = list()
+    first_settings = importer.convert_to_timechart_setting(first_data, first_colors)
+    second_colors = list()
+    second_settings = importer.convert_to_timechart_setting(second_data, second_colors)
+
+    assert first_settings["pvs"]["ca://FIRST:PV"]["line_width"] == 3
+    assert first_colors == [QColor(255, 0, 0)]
+    assert second_settings["pvs"]["ca://SECOND:PV"]["line_width"] == 1
+    assert second_settings["pvs"]["ca://SECOND:PV"]["unit"] is None
+    assert second_colors == []
@@ -5,6 +5,9 @@ import threading
 
 from qtpy import QtWidgets
 
+from .utilities.prewarm import request_prewarmed_process
+from .utilities.single_instance import send_pvs_to_running_instance
+
 
 def run_timechart(*pvs: str) -> subprocess.Popen:
     """
@@ -58,7 +61,9 @@ class PydmTimeChartTool(ExternalTool):
 
     def call(self, channels: Optional[List], sender: QtWidgets.QWidget):
         """
-        This method is invoked when the tool is selected at the menu.
+        This method is invoked when the tool is selected at the menu. The PVs are handed to the running TimeChart
+        window if there is one. Otherwise, a new TimeChart process is forked from the prewarmed process if there is
+        one, and started from scratch as a last resort.
 
         Parameters
         ----------
@@ -71,7 +76,10 @@ class PydmTimeChartTool(ExternalTool):
             ch.address for ch in channels or []
             if ch is not None and ch.address
         ]
-        run_timechart_in_thread(*pv_names)
+        if send_pvs_to_running_instance(pv_names):
+            return
+        if request_prewarmed_process(["--pvs"] + pv_names if pv_names else []) is None:
+            run_timechart_in_thread(*pv_names)
 
     def to_json(self):
         """
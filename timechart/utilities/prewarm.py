@@ -0,0 +1,318 @@
+"""
+A Process Keeping the TimeChart Modules Imported, Forking Ready-to-Start TimeChart Processes
+"""
+
+import getpass
+import json
+import logging
+import os
+import signal
+import socket
+import stat
+import struct
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+# These settings are kept out of the display defaults, which import Qt, so that the launcher can reach the prewarmed
+# process without importing Qt first.
+# The UNIX socket the prewarmed TimeChart process listens on, followed by the user name
+PREWARM_SOCKET_NAME = "timechart-prewarm"
+# How long to wait for the prewarmed TimeChart process to fork a new TimeChart process
+PREWARM_TIMEOUT_S = 5
+# The environment variables handed from the requester to the forked TimeChart process, by name or by prefix. The other
+# variables, e.g. credentials and tokens, are kept from the prewarmed process.
+PREWARM_ENV_NAMES = ("DISPLAY", "WAYLAND_DISPLAY", "XAUTHORITY", "XDG_RUNTIME_DIR", "DBUS_SESSION_BUS_ADDRESS", "HOME",
+                     "PATH", "LANG", "TZ", "TERM")
+PREWARM_ENV_PREFIXES = ("EPICS_", "PYEPICS_", "PYDM_", "QT_", "LC_")
+
+
+def prewarm_socket_path():
+    """
+    Provide the path to the UNIX socket the prewarmed process of the current user listens on, in a directory only the
+    current user can access.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, "{0}-{1}".format(PREWARM_SOCKET_NAME, getpass.getuser()), "prewarm.sock")
+
+
+def is_private_directory(path):
+    """
+    Check whether a directory is owned by the current user, and closed to the other users, so that no other user can
+    create or replace the socket in it.
+
+    Parameters
+    ----------
+    path : str
+        The directory to check
+
+    Returns
+    -------
+    bool
+        True if the directory is private; False if it isn't, or doesn't exist.
+    """
+    try:
+        status = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(status.st_mode) and status.st_uid == os.getuid() and not status.st_mode & 0o077
+
+
+def peer_uid(connected_socket):
+    """
+    Provide the user ID of the process at the other end of a UNIX socket.
+
+    Parameters
+    ----------
+    connected_socket : socket.socket
+        A connected UNIX socket
+
+    Returns
+    -------
+    int
+        The user ID, or None if the platform doesn't tell, in which case only the permissions of the socket directory
+        keep the other users out.
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials = connected_socket.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", credentials)[1]
+
+
+def forwarded_environment(environment):
+    """
+    Select the environment variables the forked TimeChart process takes from the requester.
+
+    Parameters
+    ----------
+    environment : dict
+        The environment of the requester
+
+    Returns
+    -------
+    dict
+        The variables in PREWARM_ENV_NAMES, or starting with one of PREWARM_ENV_PREFIXES.
+    """
+    return {name: str(value) for name, value in environment.items()
+            if name in PREWARM_ENV_NAMES or name.startswith(PREWARM_ENV_PREFIXES)}
+
+
+def can_prewarm():
+    """
+    Check whether processes can be forked on this platform, which prewarming relies on.
+    """
+    return hasattr(os, "fork") and hasattr(socket, "AF_UNIX")
+
+
+def request_prewarmed_process(argv, path=None, timeout_s=PREWARM_TIMEOUT_S):
+    """
+    Have the prewarmed process start TimeChart with some command arguments, in the current directory and environment.
+
+    Parameters
+    ----------
+    argv : list
+        The command arguments, without the program name
+    path : str, optional
+        The path to the socket of the prewarmed process. The socket of the current user by default.
+    timeout_s : float
+        How long to wait for the prewarmed process to fork, in seconds
+
+    Returns
+    -------
+    int
+        The process ID of the new TimeChart process, or None if no prewarmed process is running, or it didn't answer in
+        time.
+    """
+    if not can_prewarm():
+        return None
+
+    path = path or prewarm_socket_path()
+    if not is_private_directory(os.path.dirname(path)):
+        # Another user may have put the socket there, so nothing is sent to it
+        if os.path.exists(path):
+            logger.warning("Not using the prewarmed TimeChart process at '{0}', as its directory isn't private to the "
+                           "current user.".format(path))
+        return None
+
+    request = {"argv": list(argv), "cwd": os.getcwd(), "env": forwarded_environment(os.environ),
+               "requested_at": time.time()}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout_s)
+            client.connect(path)
+            if peer_uid(client) not in (None, os.getuid()):
+                logger.warning("Not using the prewarmed TimeChart process at '{0}', as it's run by another user."
+                               .format(path))
+                return None
+            client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            reply = json.loads(client.makefile("r", encoding="utf-8").readline())
+    except (OSError, ValueError) as error:
+        if os.path.exists(path):
+            logger.debug("Cannot reach the prewarmed TimeChart process at '{0}': {1}".format(path, error))
+        return None
+    return reply.get("pid")
+
+
+class PrewarmServer(object):
+    """
+    A process keeping the modules of TimeChart imported, and forking a new TimeChart process for every request, so that
+    the new process starts with all the modules loaded already.
+
+    The modules are imported, but no Qt application is created, as a Qt application cannot be used in a forked process.
+    Each request is a JSON object, {"argv": [...], "cwd": ..., "env": {...}, "requested_at": ...}, sent on a single
+    line, and answered by {"pid": ...} once the TimeChart process is forked. The forked process runs in the directory
+    of the requester, with the requester's variables of the environment TimeChart depends on, e.g. its DISPLAY and
+    EPICS settings. The socket is created in a directory only the current user can access, and the requests of the
+    other users are refused.
+    """
+    def __init__(self, run, path=None):
+        """
+        Parameters
+        ----------
+        run : callable
+            Run TimeChart in the forked process from the command arguments and the time the process was requested,
+            returning the exit code.
+        path : str, optional
+            The path of the socket to listen on. The socket of the current user by default.
+        """
+        self._run = run
+        self._path = path or prewarm_socket_path()
+        self._socket = None
+
+    @property
+    def path(self):
+        return self._path
+
+    def listen(self):
+        """
+        Start listening for requests, unless another prewarmed process already listens.
+
+        Returns
+        -------
+        bool
+            True if listening; False otherwise.
+        """
+        if not can_prewarm():
+            logger.error("Prewarming TimeChart needs to fork processes, which this platform doesn't support.")
+            return False
+        if self._is_running():
+            logger.error("Another prewarmed TimeChart process is already listening at '{0}'.".format(self._path))
+            return False
+
+        directory = os.path.dirname(self._path)
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+        except OSError as error:
+            logger.error("Cannot create the directory '{0}': {1}".format(directory, error))
+            return False
+        if not is_private_directory(directory):
+            logger.error("Not listening at '{0}', as its directory isn't private to the current user.".format(
+                self._path))
+            return False
+
+        try:
+            # Remove the socket left behind by a process that didn't exit cleanly
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Create the socket with its final permissions, rather than changing them once another user may have opened it
+        umask = os.umask(0o177)
+        try:
+            self._socket.bind(self._path)
+            self._socket.listen()
+        except OSError as error:
+            logger.error("Cannot listen at '{0}': {1}".format(self._path, error))
+            self.close()
+            return False
+        finally:
+            os.umask(umask)
+        return True
+
+    def _is_running(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(self._path)
+            except OSError:
+                return False
+        return True
+
+    def close(self):
+        if self._socket is None:
+            return
+        self._socket.close()
+        self._socket = None
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+
+    def serve_forever(self):
+        """
+        Fork a TimeChart process for every request, until interrupted.
+        """
+        # The forked processes are reaped automatically
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        try:
+            while True:
+                connection, _ = self._socket.accept()
+                with connection:
+                    self._handle_request(connection)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def _handle_request(self, connection):
+        connection.settimeout(PREWARM_TIMEOUT_S)
+        uid = peer_uid(connection)
+        if uid not in (None, os.getuid()):
+            logger.error("Refused the request of user {0} to the prewarmed TimeChart process.".format(uid))
+            return
+        try:
+            line = connection.makefile("r", encoding="utf-8").readline()
+            if not line:
+                # Another prewarmed process checking whether this one is running
+                return
+            request = json.loads(line)
+            argv = [str(arg) for arg in request["argv"]]
+        except (OSError, ValueError, TypeError, KeyError) as error:
+            logger.error("Invalid request to the prewarmed TimeChart process: {0}".format(error))
+            return
+
+        pid = os.fork()
+        if pid == 0:
+            self._start_forked(connection, argv, request)
+        logger.info("Started TimeChart process {0} with the arguments {1}.".format(pid, argv))
+        try:
+            connection.sendall((json.dumps({"pid": pid}) + "\n").encode("utf-8"))
+        except OSError as error:
+            logger.error("Cannot reply to the TimeChart process request: {0}".format(error))
+
+    def _start_forked(self, connection, argv, request):
+        """
+        Run TimeChart in the forked process, which never returns.
+        """
+        exit_code = 1
+        try:
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            self._socket.close()
+            connection.close()
+            # Outlive the prewarmed process, and don't get its terminal signals
+            os.setsid()
+            os.chdir(request.get("cwd") or os.getcwd())
+            # Take the requester's values of the variables forwarded, dropping those the requester doesn't set
+            for name in forwarded_environment(os.environ):
+                del os.environ[name]
+            os.environ.update(forwarded_environment(request.get("env") or dict()))
+            exit_code = self._run(argv, request.get("requested_at"))
+        except SystemExit as error:
+            exit_code = error.code if isinstance(error.code, int) else 1
+        except Exception:
+            logger.exception("The forked TimeChart process failed.")
+        finally:
+            # Skip the cleanup of the prewarmed process, e.g. removing its socket
+            os._exit(exit_code or 0)
@@ -0,0 +1,164 @@
+"""
+The Handoff of PVs to an Already Running TimeChart Window
+"""
+
+import getpass
+import json
+import logging
+
+from qtpy.QtCore import QObject, Signal, Slot
+from qtpy.QtNetwork import QLocalServer, QLocalSocket
+
+from ..displays.defaults import INSTANCE_SERVER_NAME, INSTANCE_TIMEOUT_MS
+
+logger = logging.getLogger(__name__)
+
+
+def user_server_name(prefix):
+    """
+    Provide the name of a local socket of the current user, so that the sockets of different users don't clash.
+
+    Parameters
+    ----------
+    prefix : str
+        The name of the socket, without the user name
+
+    Returns
+    -------
+    str
+        The name of the socket.
+    """
+    return "{0}-{1}".format(prefix, getpass.getuser())
+
+
+def listen_unless_running(server, name, timeout_ms=INSTANCE_TIMEOUT_MS):
+    """
+    Make a local server listen on a socket only the current user can connect to, unless another server already
+    listens on it.
+
+    Parameters
+    ----------
+    server : QLocalServer
+        The server to start
+    name : str
+        The name of the socket
+    timeout_ms : int
+        How long to wait for another server to accept a connection, in milliseconds
+
+    Returns
+    -------
+    bool
+        True if the server is listening; False if another server is, or if the socket cannot be created.
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(name)
+    if socket.waitForConnected(timeout_ms):
+        socket.disconnectFromServer()
+        logger.debug("Another server is already listening on '{0}'.".format(name))
+        return False
+
+    # Remove the socket left behind by a server that didn't exit cleanly
+    QLocalServer.removeServer(name)
+    # Only let the processes of the current user connect, rather than any local user
+    server.setSocketOptions(QLocalServer.UserAccessOption)
+    if not server.listen(name):
+        logger.error("Cannot listen on '{0}': {1}".format(name, server.errorString()))
+        return False
+    return True
+
+
+def send_pvs_to_running_instance(pv_names, name=None, timeout_ms=INSTANCE_TIMEOUT_MS):
+    """
+    Have the running TimeChart window of the current user plot some PVs, instead of starting a new TimeChart process.
+
+    Parameters
+    ----------
+    pv_names : list
+        The addresses of the PVs to plot
+    name : str, optional
+        The name of the socket the running window listens on. The instance socket of the current user by default.
+    timeout_ms : int
+        How long to wait for each step of the handoff, in milliseconds
+
+    Returns
+    -------
+    bool
+        True if the running window took the PVs; False if no window is running, or it didn't answer in time.
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(name or user_server_name(INSTANCE_SERVER_NAME))
+    if not socket.waitForConnected(timeout_ms):
+        return False
+
+    socket.write((json.dumps({"command": "add_pvs", "pvs": list(pv_names)}) + "\n").encode("utf-8"))
+    socket.flush()
+    while not socket.canReadLine():
+        if not socket.waitForReadyRead(timeout_ms):
+            logger.error("The running TimeChart window didn't take the PVs in time: {0}".format(socket.errorString()))
+            socket.abort()
+            return False
+
+    reply = json.loads(bytes(socket.readLine()).decode("utf-8"))
+    socket.disconnectFromServer()
+    return "error" not in reply
+
+
+class InstanceServer(QObject):
+    """
+    A local server letting other processes, e.g. the PyDM external tool, hand PVs to the running TimeChart window
+    instead of starting another TimeChart process. Only the first TimeChart window of a user listens.
+
+    The requests are sent one JSON object per line, {"command": "add_pvs", "pvs": [...]}, and answered by
+    {"pvs": N} once the PVs are handed to the window through pvsReceived, or by {"error": ...}.
+    """
+    pvsReceived = Signal(list)
+
+    def __init__(self, name=None, parent=None):
+        """
+        Parameters
+        ----------
+        name : str, optional
+            The name of the socket to listen on. The instance socket of the current user by default.
+        parent : QObject, optional
+            The parent of the server
+        """
+        super(InstanceServer, self).__init__(parent)
+        self._name = name or user_server_name(INSTANCE_SERVER_NAME)
+        self._server = QLocalServer(self)
+        self._server.newConnection.connect(self._accept_connections)
+
+    def listen(self):
+        """
+        Start listening for PVs, unless another TimeChart window already does.
+
+        Returns
+        -------
+        bool
+            True if the server is listening; False otherwise.
+        """
+        return listen_unless_running(self._server, self._name)
+
+    def close(self):
+        self._server.close()
+
+    @Slot()
+    def _accept_connections(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            socket.readyRead.connect(lambda socket=socket: self._read_requests(socket))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def _read_requests(self, socket):
+        while socket.canReadLine():
+            line = bytes(socket.readLine()).decode("utf-8", "replace")
+            try:
+                request = json.loads(line)
+                if request["command"] != "add_pvs":
+                    raise ValueError("Unknown command '{0}'".format(request["command"]))
+                pv_names = [str(pv_name) for pv_name in request["pvs"]]
+            except (ValueError, TypeError, KeyError) as error:
+                reply = {"error": "Invalid request '{0}': {1}".format(line.strip(), error)}
+            else:
+                self.pvsReceived.emit(pv_names)
+                reply = {"pvs": len(pv_names)}
+            socket.write((json.dumps(reply) + "\n").encode("utf-8"))
@@ -0,0 +1,266 @@
+"""
+The Wall Time of Each Startup Phase of TimeChart, and of Each Module Imported Meanwhile
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import platform
+import sys
+import time
+
+# The profiler of the current startup, if it's being profiled
+_active_profiler = None
+
+
+@contextmanager
+def startup_phase(name):
+    """
+    Record the wall time of a startup phase, if the startup is being profiled. Nothing is recorded otherwise, so the
+    phases can be marked wherever they happen, e.g. in the display.
+
+    Parameters
+    ----------
+    name : str
+        The name of the phase
+    """
+    if _active_profiler is None:
+        yield
+    else:
+        with _active_profiler.phase(name):
+            yield
+
+
+class _ImportTimer(object):
+    """
+    A meta path finder timing the execution of every module imported, the way -X importtime does. The modules are
+    found by the other finders, and their loaders are timed until the module is executed.
+    """
+    def __init__(self):
+        # (module, self time in us, cumulative time in us, nesting depth), in the order the imports complete
+        self.records = []
+        # The time spent in the nested imports of each import in progress
+        self._nested_times = []
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+        # The built-in and frozen modules are loaded by classes shared between the modules, which are left untimed
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            depth = len(self._nested_times)
+            self._nested_times.append(0.0)
+            started_at = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                cumulative = time.perf_counter() - started_at
+                nested = self._nested_times.pop()
+                if self._nested_times:
+                    self._nested_times[-1] += cumulative
+                self.records.append((fullname, int((cumulative - nested) * 1e6), int(cumulative * 1e6), depth))
+                try:
+                    del loader.exec_module
+                except AttributeError:
+                    pass
+
+        try:
+            loader.exec_module = timed_exec_module
+        except AttributeError:
+            pass
+        return spec
+
+
+class StartupProfiler(object):
+    """
+    Record the wall time of the startup phases of TimeChart, and of the modules imported while the imports are timed.
+
+    The report lists the phases in the order they start, each with its start time since the profiler was created, its
+    duration, and its depth, as the phases may be nested, e.g. setting up the widgets while creating the display.
+    """
+    def __init__(self):
+        self._created_at = time.perf_counter()
+        self._phases = []
+        self._depth = 0
+        self._import_timer = None
+
+    @property
+    def phases(self):
+        return list(self._phases)
+
+    def activate(self):
+        """
+        Have startup_phase record the phases into this profiler.
+        """
+        global _active_profiler
+        _active_profiler = self
+
+    def deactivate(self):
+        """
+        Stop recording the phases marked by startup_phase, and stop timing the imports.
+        """
+        global _active_profiler
+        if _active_profiler is self:
+            _active_profiler = None
+        self.stop_timing_imports()
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Record the wall time of a phase. The phases started meanwhile are nested in it.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase
+        """
+        end_phase = self.start_phase(name)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            end_phase()
+
+    def start_phase(self, name):
+        """
+        Start a phase ending in a later call, e.g. the first paint of the display, which ends in the event loop. The
+        phases started meanwhile aren't nested in it, as they may run concurrently.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase
+
+        Returns
+        -------
+        callable
+            End the phase when called. Only the first call counts.
+        """
+        record = {"name": name, "start_s": time.perf_counter() - self._created_at, "duration_s": None,
+                  "depth": self._depth}
+        self._phases.append(record)
+
+        def end_phase():
+            if record["duration_s"] is None:
+                record["duration_s"] = time.perf_counter() - self._created_at - record["start_s"]
+        return end_phase
+
+    def start_timing_imports(self):
+        """
+        Time the modules imported from now on. The modules imported already are not imported again, so aren't timed.
+        """
+        if self._import_timer is None:
+            self._import_timer = _ImportTimer()
+            sys.meta_path.insert(0, self._import_timer)
+
+    def stop_timing_imports(self):
+        if self._import_timer is not None and self._import_timer in sys.meta_path:
+            sys.meta_path.remove(self._import_timer)
+
+    def report(self):
+        """
+        Provide the phases and the imports recorded.
+
+        Returns
+        -------
+        dict
+            The report, with the versions of the main dependencies, so that the reports before and after an upgrade can
+            be told apart.
+        """
+        versions = dict()
+        for module_name in ("timechart", "pydm", "pyqtgraph", "qtpy", "numpy"):
+            module = sys.modules.get(module_name)
+            version = getattr(module, "__version__", None)
+            versions[module_name] = None if version is None else str(version)
+
+        imports = list()
+        if self._import_timer is not None:
+            imports = [{"module": module, "self_us": self_us, "cumulative_us": cumulative_us, "depth": depth}
+                       for module, self_us, cumulative_us, depth in self._import_timer.records]
+
+        return {
+            "created_at": time.time() - (time.perf_counter() - self._created_at),
+            "total_s": max([phase["start_s"] + (phase["duration_s"] or 0.0) for phase in self._phases] or [0.0]),
+            "python": platform.python_version(),
+            "versions": versions,
+            "phases": self.phases,
+            "imports": imports,
+        }
+
+    def import_tree(self):
+        """
+        Provide the imports recorded in the format of -X importtime, the nested imports preceding the module importing
+        them.
+
+        Returns
+        -------
+        str
+            The import tree, one module per line.
+        """
+        lines = ["import time: self [us] | cumulative | imported package"]
+        if self._import_timer is not None:
+            for module, self_us, cumulative_us, depth in self._import_timer.records:
+                lines.append("import time: {0:>9} | {1:>10} | {2}{3}".format(self_us, cumulative_us, "  " * depth,
+                                                                              module))
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Write the report as JSON, and the import tree next to it, with the .importtime.txt extension instead.
+
+        Parameters
+        ----------
+        path : str
+            The path of the JSON report
+
+        Returns
+        -------
+        tuple
+            The paths of the JSON report and of the import tree.
+        """
+        tree_path = os.path.splitext(path)[0] + ".importtime.txt"
+        report = json.dumps(self.report(), indent=2)
+        with open(path, 'w') as report_file:
+            report_file.write(report)
+        with open(tree_path, 'w') as tree_file:
+            tree_file.write(self.import_tree())
+        return path, tree_path
+
+
+def call_after_first_paint(widget, callback):
+    """
+    Call a function once a widget is painted for the first time, e.g. to end the first paint phase.
+
+    Qt is only imported once called, so that profiling the startup doesn't import it before the imports are timed.
+
+    Parameters
+    ----------
+    widget : QWidget
+        The widget to watch
+    callback : callable
+        The function to call, without any parameter
+    """
+    from qtpy.QtCore import QEvent, QObject, QTimer
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Paint:
+                watched.removeEventFilter(self)
+                # Let the widget finish painting first
+                QTimer.singleShot(0, callback)
+                self.deleteLater()
+            return False
+
+    widget.installEventFilter(FirstPaintFilter(widget))
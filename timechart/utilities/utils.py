@@ -99,3 +99,24 @@ def display_message_box(icon, window_title, text):
 
     msg_box.exec_()
 
+
+
+def format_bytes(nbytes):
+    """
+    Format a number of bytes for display, e.g. in the memory usage of the curve buffers.
+
+    Parameters
+    ----------
+    nbytes : int
+        The number of bytes
+
+    Returns
+    -------
+    str
+        The number of bytes in the most suitable unit, e.g. "1.5 GB".
+    """
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(nbytes) < 1024:
+            return "{0:.1f} {1}".format(nbytes, unit) if unit != "B" else "{0} B".format(int(nbytes))
+        nbytes /= 1024.0
+    return "{0:.1f} TB".format(nbytes)
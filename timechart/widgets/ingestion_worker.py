@@ -0,0 +1,174 @@
+"""
+The Reception of Channel Updates off the GUI Thread
+"""
+
+from collections import OrderedDict
+import time
+
+from qtpy.QtCore import QCoreApplication, QObject, QThread, Slot
+
+
+class CurveIngestor(QObject):
+    """
+    Receive the values of a curve's channel on the ingestion thread, and queue them into the curve's staging buffer.
+    """
+    def __init__(self, staging_buffer):
+        """
+        Parameters
+        ----------
+        staging_buffer : StagingBuffer
+            The queue the curve's values are written from into its ring buffer, on the GUI thread
+        """
+        super(CurveIngestor, self).__init__()
+        self._staging_buffer = staging_buffer
+        # Only incremented on the ingestion thread
+        self.received = 0
+
+    @Slot(float)
+    @Slot(int)
+    def receiveNewValue(self, new_value):
+        self._staging_buffer.append(time.time(), new_value)
+        self.received += 1
+
+
+class IngestionWorker(QObject):
+    """
+    A thread receiving the channel updates of the curves capturing every value, so that the GUI thread doesn't handle
+    every single update.
+
+    The channel of each attached curve delivers its values to a CurveIngestor living on the ingestion thread, which
+    queues the values into the curve's staging buffer. The GUI thread then only picks up the values queued since the
+    previous tick, and writes them into the ring buffers with a single append per curve.
+
+    The staging buffers don't take any lock, so the contention between the threads shows as values waiting in the
+    queues, and as time spent by the GUI thread writing them. Both are measured by flush, and provided by statistics.
+    """
+    def __init__(self, parent=None):
+        super(IngestionWorker, self).__init__(parent)
+        self._thread = QThread()
+        self._thread.setObjectName("TimeChart Ingestion")
+        self._ingestors = OrderedDict()
+        self.reset_statistics()
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            # A thread still running when the application exits aborts it
+            app.aboutToQuit.connect(self.stop)
+
+    @property
+    def is_running(self):
+        return self._thread.isRunning()
+
+    def attach(self, curve):
+        """
+        Receive the values of a curve's channel on the ingestion thread.
+
+        Parameters
+        ----------
+        curve : TimeChartCurveItem
+            A curve capturing every value, i.e. with a staging buffer
+        """
+        if curve in self._ingestors or curve.staging_buffer is None:
+            return
+        if not self._thread.isRunning():
+            self._thread.start()
+
+        ingestor = CurveIngestor(curve.staging_buffer)
+        ingestor.moveToThread(self._thread)
+        self._ingestors[curve] = ingestor
+        curve.set_value_slot(ingestor.receiveNewValue)
+
+    def detach(self, curve):
+        """
+        Receive the values of a curve's channel on the GUI thread again.
+
+        Parameters
+        ----------
+        curve : TimeChartCurveItem
+            A curve attached to the worker
+        """
+        ingestor = self._ingestors.pop(curve, None)
+        if ingestor is None:
+            return
+
+        curve.set_value_slot(None)
+        self._received += ingestor.received
+        ingestor.deleteLater()
+
+    def stop(self):
+        """
+        Detach all the curves, and stop the ingestion thread.
+        """
+        for curve in list(self._ingestors):
+            self.detach(curve)
+        if self._thread.isRunning():
+            self._thread.quit()
+            self._thread.wait()
+
+    def flush(self, curves):
+        """
+        Write the values queued for the curves into their ring buffers, measuring the backlog of the queues, how long
+        the values waited, and how long the writes took. This is run on the GUI thread.
+
+        Parameters
+        ----------
+        curves : list
+            The curves to write the queued values of
+        """
+        started = time.perf_counter()
+        now = time.time()
+        for curve in curves:
+            staging_buffer = curve.staging_buffer
+            if staging_buffer is None:
+                continue
+            backlog = len(staging_buffer)
+            if backlog:
+                self._max_latency = max(self._max_latency, now - staging_buffer.oldest_timestamp())
+            self._max_backlog = max(self._max_backlog, backlog)
+            self._flushed += curve.flush_staged_samples()
+
+        elapsed = time.perf_counter() - started
+        self._flush_count += 1
+        self._flush_time += elapsed
+        self._max_flush_time = max(self._max_flush_time, elapsed)
+
+    def reset_statistics(self):
+        """
+        Start the measurements over.
+        """
+        self._received = 0
+        self._flushed = 0
+        self._flush_count = 0
+        self._flush_time = 0.0
+        self._max_flush_time = 0.0
+        self._max_backlog = 0
+        self._max_latency = 0.0
+        self._started_at = time.time()
+        for ingestor in self._ingestors.values():
+            # The counters of the ingestion thread are only read here, so the counts so far are deducted instead
+            self._received -= ingestor.received
+
+    def statistics(self):
+        """
+        Provide the measurements of the ingestion since the statistics were last reset.
+
+        Returns
+        -------
+        OrderedDict
+            The number of values received on the ingestion thread, and of values written into the ring buffers, the
+            number of values received per second, the number of flushes, the average and the longest time the GUI
+            thread spent per flush, in seconds, the largest number of values queued for a curve at a flush, and the
+            longest time a value waited in a queue before being written, in seconds.
+        """
+        received = self._received + sum(ingestor.received for ingestor in self._ingestors.values())
+        elapsed = max(time.time() - self._started_at, 1e-9)
+        return OrderedDict([
+            ("received", received),
+            ("flushed", self._flushed),
+            ("received_per_second", received / elapsed),
+            ("flush_count", self._flush_count),
+            ("mean_flush_time", self._flush_time / self._flush_count if self._flush_count else 0.0),
+            ("max_flush_time", self._max_flush_time),
+            ("max_backlog", self._max_backlog),
+            ("max_latency", self._max_latency),
+        ])
@@ -0,0 +1,1391 @@
+"""
+The TimeChart Plot and Its Ring Buffer-Backed Curves
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import logging
+import time
+import warnings
+
+import numpy as np
+
+from qtpy.QtCore import Qt, Signal, Slot, QTimer
+
+from pydm.data_plugins import plugin_for_address
+from pydm.widgets.timeplot import PyDMTimePlot, TimePlotCurveItem, MINIMUM_BUFFER_SIZE, DEFAULT_BUFFER_SIZE
+
+from ..buffers.block_ring_buffer import BlockRingBuffer
+from ..buffers.lod_pyramid import LodPyramid
+from ..buffers.memmap_ring_buffer import MemmapRingBuffer
+from ..buffers.memory_budget import MemoryBudget, estimate_curve_nbytes, estimate_shared_nbytes
+from ..buffers.shared_memory_ring_buffer import SharedMemoryRingBufferView
+from ..buffers.shared_ring_buffer import SharedRingBuffer, SharedRingBufferRow
+from ..buffers.staging_buffer import StagingBuffer
+from ..displays.defaults import (ALL_POINTS_RENDERING, MIN_MAX_DECIMATION_RENDERING, LOD_MIN_BUCKET_SIZE,
+                                 MEMORY_STORAGE, MEMMAP_STORAGE, DEFAULT_CACHE_DIR, DOUBLE_PRECISION_VALUES,
+                                 SINGLE_PRECISION_VALUES, CAPTURE_FLUSH_INTERVAL_MS, COLLECTOR_POLL_INTERVAL_MS)
+from ..utilities.decimation import min_max_decimate
+from .ingestion_worker import IngestionWorker
+
+logger = logging.getLogger(__name__)
+
+
+def value_dtype_for(precision):
+    """
+    Provide the type the buffered values are stored with for a value precision.
+
+    Parameters
+    ----------
+    precision : int
+        Either DOUBLE_PRECISION_VALUES or SINGLE_PRECISION_VALUES.
+
+    Returns
+    -------
+    numpy.dtype
+        float32 for single precision, or float64 otherwise.
+    """
+    return np.dtype(np.float32 if precision == SINGLE_PRECISION_VALUES else np.float64)
+
+
+def create_ring_buffer(capacity, storage_backend=MEMORY_STORAGE, cache_dir=DEFAULT_CACHE_DIR, name="curve",
+                       value_precision=DOUBLE_PRECISION_VALUES, rows=2):
+    """
+    Allocate a ring buffer with a storage backend and value precision. If the memory-mapped files cannot be created,
+    the ring buffer is kept in memory instead.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of samples the buffer can hold
+    storage_backend : int
+        Either MEMORY_STORAGE or MEMMAP_STORAGE
+    cache_dir : str
+        The directory to create the memory-mapped files in
+    name : str
+        A name to include in the names of the memory-mapped files
+    value_precision : int
+        Either DOUBLE_PRECISION_VALUES or SINGLE_PRECISION_VALUES
+    rows : int
+        The number of rows of each sample, including the timestamp row
+
+    Returns
+    -------
+    RingBuffer
+        The new ring buffer.
+    """
+    value_dtype = value_dtype_for(value_precision)
+    if storage_backend == MEMMAP_STORAGE:
+        try:
+            return MemmapRingBuffer(capacity, cache_dir, name=name, rows=rows, value_dtype=value_dtype)
+        except (OSError, ValueError) as error:
+            logger.error("Cannot create a memory-mapped ring buffer in '{0}', keeping the data in memory "
+                         "instead. Exception: {1}".format(cache_dir, error))
+    return BlockRingBuffer(capacity, rows=rows, value_dtype=value_dtype)
+
+
+class TimeChartCurveItem(TimePlotCurveItem):
+    """
+    A time plot curve that keeps its data in a RingBuffer.
+
+    PyDM's TimePlotCurveItem rolls its whole data buffer to make room for every new sample, which costs O(buffer size)
+    per sample. This curve writes each sample at the ring buffer's head instead, and only unrolls the buffer into a
+    chronological copy when the curve is redrawn.
+
+    In the min/max decimation render mode, only the data within the displayed time range is copied, and then reduced
+    to the min and max values of every pixel column before being handed to pyqtgraph. The curve also keeps a pyramid of
+    pre-aggregated levels of detail in that mode, so that rendering a wide time range reads a few buckets per pixel
+    column instead of scanning every raw sample.
+
+    The ring buffer is kept in memory by default, or in a memory-mapped file with the MEMMAP_STORAGE backend, for
+    buffers too large to fit in memory.
+
+    The values can be stored in single precision with SINGLE_PRECISION_VALUES, halving the memory taken by the values,
+    e.g. for the readbacks of 16-bit ADCs that don't need double precision. The timestamps stay in double precision,
+    and the values are only converted back to double precision when they're copied out of the buffer to be plotted.
+
+    In the capture mode, every value received is queued in a StagingBuffer with the time it was received, and the
+    queued values are written into the ring buffer at once on the chart's next capture tick, so that no monitor update
+    is lost between two ticks, whatever the update rate of the PV.
+
+    The curve follows the buffer size and update interval of its chart, unless it's given its own buffer size or
+    update interval, e.g. to keep a slow PV at a low rate and a small buffer alongside fast PVs. All the samples are
+    timestamped with the same clock, so that curves sampled at different rates still share the chart's time axis.
+
+    The curves sampled together by the chart's update timer can read their data from a row of the chart's
+    SharedRingBuffer instead of a ring buffer of their own. The chart then records their samples, for all of them at
+    once.
+
+    A curve created with a collector_buffer reads its data from the ring buffer of the collector process instead, which
+    records every value of the channel in shared memory. The curve then doesn't connect the channel itself, and its
+    buffer size, update mode, and storage settings don't apply. The chart polls the ring buffer for new samples.
+    """
+    # Emitted when the curve moved its data out of its row of the chart's shared ring buffer, for the chart to remove
+    # the row
+    shared_buffer_left = Signal()
+
+    def __init__(self, *args, **kws):
+        # The base class assigns data_buffer and points_accumulated during its initialization, so the ring buffer
+        # behind these properties must exist beforehand
+        self._storage_backend = MEMORY_STORAGE
+        self._cache_dir = DEFAULT_CACHE_DIR
+        self._value_precision = DOUBLE_PRECISION_VALUES
+        self._ring_buffer = BlockRingBuffer(MINIMUM_BUFFER_SIZE)
+        self._chart_buffer_size = MINIMUM_BUFFER_SIZE
+        self._own_buffer_size = None
+        self._own_update_timer = None
+        self._buffer_initialized_at = time.time()
+        self._render_mode = ALL_POINTS_RENDERING
+        self._lod_pyramid = None
+        self._redraw_time = None
+        self._staging_buffer = None
+        # The collector_buffer must be known before the base class connects the channel
+        self._collector_buffer = kws.pop("collector_buffer", None)
+        self._collector_address = None
+        self._collector_connected = False
+        self._collector_total_appended = 0
+        super(TimeChartCurveItem, self).__init__(*args, **kws)
+        if self._collector_buffer is not None:
+            self._ring_buffer.close()
+            self._ring_buffer = self._collector_buffer
+
+    @property
+    def address(self):
+        if self._collector_address is not None:
+            return self._collector_address
+        return super(TimeChartCurveItem, self).address
+
+    @address.setter
+    def address(self, new_address):
+        if self._collector_buffer is None:
+            TimePlotCurveItem.address.fset(self, new_address)
+            return
+        # The collector process holds the channel connection, so the curve has no channel
+        self._collector_address = new_address
+
+    @property
+    def collector_buffer(self):
+        """
+        The ring buffer of the collector process the curve reads its data from, or None if the curve connects its
+        channel itself.
+        """
+        return self._collector_buffer
+
+    def poll_collector_buffer(self):
+        """
+        Handle the samples written into the collector's ring buffer since the last poll, and any change of the channel
+        connection.
+        """
+        ring_buffer = self._collector_buffer
+        if ring_buffer is None:
+            return
+
+        if ring_buffer.connected != self._collector_connected:
+            self._collector_connected = ring_buffer.connected
+            self.connectionStateChanged(self._collector_connected)
+
+        total_appended = ring_buffer.total_appended
+        new_count = total_appended - self._collector_total_appended
+        self._collector_total_appended = total_appended
+        if new_count <= 0:
+            # Nothing new, or the collector's ring buffer was cleared
+            return
+
+        values = ring_buffer.newest(new_count)[1]
+        values = values[np.isfinite(values)]
+        if values.size:
+            self.update_min_max_y_values(values.min())
+            self.update_min_max_y_values(values.max())
+        if self._lod_pyramid is not None:
+            self._lod_pyramid.update(ring_buffer)
+        self.data_changed.emit()
+
+    @property
+    def render_mode(self):
+        return self._render_mode
+
+    @render_mode.setter
+    def render_mode(self, mode):
+        self._render_mode = mode
+        if mode == MIN_MAX_DECIMATION_RENDERING:
+            if self._lod_pyramid is None:
+                self._lod_pyramid = LodPyramid(self._ring_buffer.capacity)
+        else:
+            # The levels of detail are only needed for decimated rendering, so free their memory
+            self._lod_pyramid = None
+
+    @property
+    def captures_updates(self):
+        return self._staging_buffer is not None
+
+    @property
+    def staging_buffer(self):
+        """
+        The queue of the values received since the last flush in the capture mode, or None in the other modes.
+        """
+        return self._staging_buffer
+
+    def set_value_slot(self, value_slot=None):
+        """
+        Deliver the values of the curve's channel to another slot, e.g. a slot of an object living on another thread.
+
+        The value signal of the channel's existing connection is rerouted to the new slot, rather than the channel being
+        connected again. Disconnecting a channel takes the lock of its data plugin, which isn't reentrant, and which the
+        garbage collection of another PyDM widget may take again meanwhile.
+
+        Parameters
+        ----------
+        value_slot : callable, optional
+            The slot to receive the channel values, or None for the curve's receiveNewValue.
+        """
+        if self.channel is None:
+            # Also the case of the curves fed by the collector process
+            return
+
+        value_slot = value_slot or self.receiveNewValue
+        connection = self._channel_connection()
+        if connection is not None:
+            with warnings.catch_warnings():
+                # Disconnecting a slot that isn't connected warns, besides raising TypeError
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                for signal_type in (int, float, str, bool, object):
+                    signal = connection.new_value_signal[signal_type]
+                    try:
+                        signal.disconnect(self.channel.value_slot)
+                    except TypeError:
+                        pass
+                    try:
+                        # Queued as PyDM connects the slots, so that the slot of an object on another thread runs there
+                        signal.connect(value_slot, Qt.QueuedConnection)
+                    except TypeError:
+                        # The slot doesn't take values of this type
+                        pass
+        # A channel still waiting for its connection gets the new slot once connected, and PyDM disconnects the new
+        # slot along with the channel
+        self.channel.value_slot = value_slot
+
+    def _channel_connection(self):
+        """
+        Provide the data plugin connection of the curve's channel, or None if the channel isn't connected yet.
+        """
+        plugin = plugin_for_address(self.channel.address)
+        if plugin is None or self.channel not in plugin.channels:
+            return None
+        return plugin.connections.get(plugin.get_connection_id(self.channel))
+
+    def set_capture(self, enabled):
+        """
+        Record every value received, or only the values sampled by the update mode of the curve.
+
+        Parameters
+        ----------
+        enabled : bool
+            True to queue every value received until the next flush_staged_samples; False to go back to the update
+            mode of the curve, after writing the values already queued.
+        """
+        if enabled == self.captures_updates or self._collector_buffer is not None:
+            # The collector process records every value already
+            return
+        if enabled:
+            self._staging_buffer = StagingBuffer()
+        else:
+            self.flush_staged_samples()
+            self._staging_buffer = None
+
+    def flush_staged_samples(self):
+        """
+        Write the values queued since the last flush into the ring buffer, with a single append.
+
+        Returns
+        -------
+        int
+            The number of samples written.
+        """
+        if self._staging_buffer is None or not len(self._staging_buffer):
+            return 0
+
+        samples = self._staging_buffer.drain()
+        # The values received on another thread didn't go through receiveNewValue
+        values = samples[1][np.isfinite(samples[1])]
+        if values.size:
+            self.update_min_max_y_values(values.min())
+            self.update_min_max_y_values(values.max())
+
+        self._ring_buffer.extend(samples)
+        if self._lod_pyramid is not None:
+            self._lod_pyramid.update(self._ring_buffer)
+        self.data_changed.emit()
+        return samples.shape[1]
+
+    @property
+    def storage_backend(self):
+        return self._storage_backend
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir
+
+    def set_storage(self, backend, cache_dir=None):
+        """
+        Move the buffered data to a new storage backend.
+
+        Parameters
+        ----------
+        backend : int
+            MEMORY_STORAGE to keep the ring buffer in memory, or MEMMAP_STORAGE to keep it in a memory-mapped file.
+        cache_dir : str, optional
+            The directory to create the memory-mapped files in. The current directory is kept if not provided.
+        """
+        cache_dir = cache_dir or self._cache_dir
+        if backend == self._storage_backend and (backend != MEMMAP_STORAGE or cache_dir == self._cache_dir):
+            return
+
+        self._storage_backend = backend
+        self._cache_dir = cache_dir
+        self._reallocate_ring_buffer()
+
+    @property
+    def value_precision(self):
+        return self._value_precision
+
+    @property
+    def value_dtype(self):
+        """
+        The type the values are stored with in the ring buffer.
+        """
+        return value_dtype_for(self._value_precision)
+
+    def set_value_precision(self, precision):
+        """
+        Convert the buffered values to a new storage precision.
+
+        Parameters
+        ----------
+        precision : int
+            DOUBLE_PRECISION_VALUES to store the values as float64, or SINGLE_PRECISION_VALUES to store them as float32.
+        """
+        if precision == self._value_precision:
+            return
+
+        self._value_precision = precision
+        self._reallocate_ring_buffer()
+
+    def _reallocate_ring_buffer(self):
+        """
+        Move the buffered data to a new ring buffer created with the current storage settings.
+        """
+        if self.shared_row is not None or self._collector_buffer is not None:
+            # The chart moves the shared ring buffer to its new storage, while the collector process owns its buffers
+            return
+
+        ring_buffer = self._create_ring_buffer(self._ring_buffer.capacity)
+        ring_buffer.load(self._ring_buffer.unrolled())
+        self._ring_buffer.close()
+        self._ring_buffer = ring_buffer
+
+    def _create_ring_buffer(self, capacity):
+        """
+        Allocate a ring buffer with the current storage backend and value precision.
+        """
+        return create_ring_buffer(capacity, self._storage_backend, self._cache_dir, name=self.address or "curve",
+                                  value_precision=self._value_precision)
+
+    @property
+    def shared_row(self):
+        """
+        The row of the chart's shared ring buffer the curve reads its data from, or None if the curve has its own ring
+        buffer.
+        """
+        if isinstance(self._ring_buffer, SharedRingBufferRow):
+            return self._ring_buffer
+        return None
+
+    def join_shared_buffer(self, row):
+        """
+        Read the curve's data from a row of the chart's shared ring buffer, discarding the data of the curve's own ring
+        buffer.
+
+        Parameters
+        ----------
+        row : SharedRingBufferRow
+            The row holding the curve's samples from now on
+        """
+        self._ring_buffer.close()
+        self._ring_buffer = row
+        self._fit_lod_pyramid()
+
+    def leave_shared_buffer(self):
+        """
+        Copy the curve's data from its row of the chart's shared ring buffer into a ring buffer of its own. The row can
+        be removed from the shared ring buffer afterwards.
+        """
+        row = self.shared_row
+        if row is None:
+            return
+
+        ring_buffer = self._create_ring_buffer(self._bufferSize)
+        ring_buffer.load(row.unrolled(), total_appended=row.total_appended)
+        self._ring_buffer = ring_buffer
+        self._fit_lod_pyramid()
+
+    def handle_shared_sample(self):
+        """
+        Handle a new sample recorded by the chart into the curve's row of the shared ring buffer.
+        """
+        self._update_lod_pyramid()
+        self.data_changed.emit()
+
+    def memory_usage(self):
+        """
+        Provide the number of bytes allocated for the curve buffers, i.e. the ring buffer and the levels of detail.
+        """
+        nbytes = self._ring_buffer.nbytes
+        if self._lod_pyramid is not None:
+            nbytes += self._lod_pyramid.nbytes
+        return nbytes
+
+    @property
+    def own_buffer_size(self):
+        """
+        The buffer size of this curve only, or None if the curve follows the buffer size of its chart.
+        """
+        return self._own_buffer_size
+
+    @property
+    def own_update_interval(self):
+        """
+        The update interval of this curve only, in seconds, or None if the curve follows the update interval of its
+        chart.
+        """
+        if self._own_update_timer is None:
+            return None
+        return self._own_update_timer.interval() / 1000.0
+
+    def setBufferSize(self, value):
+        """
+        Set the buffer size of the chart for this curve, which only applies if the curve has no buffer size of its own.
+
+        Parameters
+        ----------
+        value : int
+            The chart's buffer size
+        """
+        self._chart_buffer_size = int(value)
+        self._resize_buffer(self._own_buffer_size or self._chart_buffer_size)
+
+    def resetBufferSize(self):
+        self.setBufferSize(DEFAULT_BUFFER_SIZE)
+
+    def set_own_buffer_size(self, buffer_size):
+        """
+        Give the curve its own buffer size, or make it follow the buffer size of its chart again. The newest samples
+        that fit are kept if the buffer size changes.
+
+        Parameters
+        ----------
+        buffer_size : int
+            The curve's own buffer size, or None to follow the chart's buffer size.
+        """
+        if self._collector_buffer is not None:
+            logger.warning("Cannot change the buffer size of the curve '{0}', recorded by the collector process, which "
+                           "sets the buffer size of its channels.".format(self.address))
+            return
+        self._own_buffer_size = max(int(buffer_size), MINIMUM_BUFFER_SIZE) if buffer_size else None
+        self._resize_buffer(self._own_buffer_size or self._chart_buffer_size)
+
+    def _resize_buffer(self, buffer_size):
+        """
+        Change the capacity of the ring buffer, keeping the newest samples that fit instead of discarding the buffered
+        data like PyDM does. The ring buffers kept in memory are made of blocks, so no sample is copied. The shared
+        ring buffer is resized by the chart instead, while the ring buffer of the collector process keeps the capacity
+        the collector process gave it.
+        """
+        buffer_size = max(int(buffer_size), MINIMUM_BUFFER_SIZE)
+        if buffer_size == self._bufferSize:
+            return
+        if self._collector_buffer is not None:
+            logger.debug("Keeping the buffer size of the curve '{0}', set by the collector process.".format(
+                self.address))
+            return
+
+        self._bufferSize = buffer_size
+        if self.shared_row is None:
+            self._ring_buffer.resize(buffer_size)
+        if self._lod_pyramid is not None:
+            self._lod_pyramid.resize(self._ring_buffer.capacity)
+
+    def set_own_update_interval(self, interval):
+        """
+        Give the curve its own update interval for the asynchronous mode, or make it follow the update interval of its
+        chart again.
+
+        Parameters
+        ----------
+        interval : float
+            The curve's own update interval, in seconds, or None to follow the chart's update interval.
+        """
+        if not interval:
+            if self._own_update_timer is not None:
+                self._own_update_timer.stop()
+                self._own_update_timer.deleteLater()
+                self._own_update_timer = None
+            return
+
+        if self._own_update_timer is None:
+            self._own_update_timer = QTimer(self)
+            self._own_update_timer.timeout.connect(self._record_latest_value)
+        self._own_update_timer.start(max(int(interval * 1000), 1))
+
+    def release_buffer(self):
+        """
+        Release the ring buffer storage, e.g. remove its memory-mapped file, once the curve is no longer used.
+        """
+        self.set_own_update_interval(None)
+        self._staging_buffer = None
+        # The chart removes the curve's row if the curve shares the chart's ring buffer
+        self._ring_buffer.close()
+        self._ring_buffer = BlockRingBuffer(MINIMUM_BUFFER_SIZE)
+        self._collector_buffer = None
+        self._lod_pyramid = None
+
+    @property
+    def data_buffer(self):
+        """
+        A chronological (2, N) copy of the buffered data, with N being the number of accumulated points. This is kept
+        for compatibility with the code written for TimePlotCurveItem, and must not be used in any frequently run path.
+        """
+        return self._ring_buffer.unrolled()
+
+    @data_buffer.setter
+    def data_buffer(self, data):
+        if self.shared_row is not None:
+            # The data of the curve now differs from the data of the chart's shared ring buffer
+            self.leave_shared_buffer()
+            self.shared_buffer_left.emit()
+        if self._ring_buffer.read_only:
+            logger.warning("Cannot replace the data of the curve '{0}', recorded by the collector "
+                           "process.".format(self.address))
+            return
+        self._ring_buffer.load(data)
+
+    @property
+    def points_accumulated(self):
+        return len(self._ring_buffer)
+
+    @points_accumulated.setter
+    def points_accumulated(self, count):
+        self._ring_buffer.truncate(count)
+
+    def get_latest_y(self):
+        """
+        Provide the most recent value recorded into the buffer.
+
+        Returns
+        -------
+        float
+            The most recent value, or 0 if there is no value recorded yet.
+        """
+        latest = self._ring_buffer.last()
+        return latest[1] if latest else 0.0
+
+    @Slot(float)
+    @Slot(int)
+    def receiveNewValue(self, new_value):
+        """
+        Record a new value into the ring buffer for the Synchronous mode, keep the new value until the next
+        asyncUpdate for the Asynchronous mode, or queue it until the next flush in the capture mode.
+
+        Parameters
+        ----------
+        new_value : float
+            The new y-value.
+        """
+        self.update_min_max_y_values(new_value)
+
+        if self._staging_buffer is not None:
+            self._staging_buffer.append(time.time(), new_value)
+        elif self._update_mode == PyDMTimePlot.OnValueChange:
+            self._record(time.time(), new_value)
+            self.data_changed.emit()
+        elif self._update_mode == PyDMTimePlot.AtFixedRate:
+            self.latest_value = new_value
+
+    @Slot()
+    def asyncUpdate(self):
+        """
+        Record the latest value received into the ring buffer, together with the current timestamp, unless the curve
+        has its own update interval, or shares the chart's ring buffer.
+        """
+        if self._own_update_timer is None and self.shared_row is None:
+            self._record_latest_value()
+
+    @Slot()
+    def _record_latest_value(self):
+        if (self._update_mode != PyDMTimePlot.AtFixedRate or self._staging_buffer is not None or
+                self._collector_buffer is not None):
+            return
+        self._record(time.time(), self.latest_value)
+        self.data_changed.emit()
+
+    def _record(self, timestamp, value):
+        """
+        Append a sample to the ring buffer, and update the levels of detail whenever a new bucket of the finest level
+        is complete.
+        """
+        self._ring_buffer.append(timestamp, value)
+        self._update_lod_pyramid()
+
+    def _update_lod_pyramid(self):
+        if self._lod_pyramid is not None and self._ring_buffer.total_appended % LOD_MIN_BUCKET_SIZE == 0:
+            self._lod_pyramid.update(self._ring_buffer)
+
+    def _fit_lod_pyramid(self):
+        """
+        Discard the levels of detail, and fit them to the ring buffer capacity.
+        """
+        if self._lod_pyramid is None:
+            return
+        self._lod_pyramid.resize(self._ring_buffer.capacity)
+        self._lod_pyramid.reset()
+
+    def initialize_buffer(self):
+        """
+        Discard the buffered data, and fit the ring buffer to the current buffer size if needed. The shared ring
+        buffer is resized by the chart instead.
+        """
+        self._ring_buffer.clear()
+        self._collector_total_appended = 0
+        if self._staging_buffer is not None:
+            self._staging_buffer.clear()
+        if (self.shared_row is None and self._collector_buffer is None and
+                self._ring_buffer.capacity != self._bufferSize):
+            self._ring_buffer.resize(self._bufferSize)
+        self._fit_lod_pyramid()
+        self._buffer_initialized_at = time.time()
+
+    @Slot()
+    def redrawCurve(self, min_x=None, max_x=None, redraw_time=None):
+        """
+        Redraw the curve with the buffered data, which is unrolled once per redraw. Skip rendering if the curve is not
+        visible.
+
+        Parameters
+        ----------
+        min_x : float, optional
+            The minimum x-value currently displayed, used to clip the data to render.
+        max_x : float, optional
+            The maximum x-value currently displayed, used to clip the data to render.
+        redraw_time : float, optional
+            The time the x-values are relative to if not plotting by timestamps. This is the current time by default.
+        """
+        if not self.isVisible():
+            return
+
+        self._redraw_time = time.time() if redraw_time is None else redraw_time
+        x_offset = 0 if self._plot_by_timestamps else self._redraw_time
+
+        try:
+            is_line = self.plot_style is None or self.plot_style == "Line"
+            view_box = self.getViewBox()
+            if (is_line and self._render_mode == MIN_MAX_DECIMATION_RENDERING and min_x is not None and
+                    max_x is not None and view_box is not None):
+                start_time, end_time = min_x + x_offset, max_x + x_offset
+                data = self._lod_pyramid.render(self._ring_buffer, start_time, end_time, view_box.width())
+                if data is None:
+                    x, y = self._ring_buffer.between(start_time, end_time)
+                    x, y = min_max_decimate(x, y, start_time, end_time, view_box.width())
+                else:
+                    x, y = data
+            else:
+                x, y = self._ring_buffer.unrolled()
+
+            x = x - x_offset
+
+            if is_line:
+                self.setData(y=y, x=x)
+            elif self.plot_style == "Bar":
+                min_index = np.searchsorted(x, min_x)
+                max_index = np.searchsorted(x, max_x) + 1
+                self._setBarGraphItem(x=x[min_index:max_index], y=y[min_index:max_index])
+        except (ZeroDivisionError, OverflowError):
+            # Solve an issue with pyqtgraph and initial downsampling
+            pass
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        """
+        Provide the range occupied by the data along an axis.
+
+        In the min/max decimation render mode, the data handed to pyqtgraph is clipped to the displayed time range, so
+        the x-range of the whole buffer is provided instead, letting the chart be auto-ranged to all the data.
+        """
+        if ax == 0 and self._render_mode == MIN_MAX_DECIMATION_RENDERING and self.points_accumulated:
+            x_offset = 0 if self._plot_by_timestamps or self._redraw_time is None else self._redraw_time
+            return self.min_x() - x_offset, self.max_x() - x_offset
+        return super(TimeChartCurveItem, self).dataBounds(ax, frac=frac, orthoRange=orthoRange)
+
+    def min_x(self):
+        """
+        Provide the oldest timestamp from the buffer, or the time the buffer was initialized if it's empty.
+        """
+        oldest = self._ring_buffer.first()
+        return oldest[0] if oldest else self._buffer_initialized_at
+
+    def max_x(self):
+        """
+        Provide the most recent timestamp from the buffer, or the time the buffer was initialized if it's empty.
+        """
+        latest = self._ring_buffer.last()
+        return latest[0] if latest else self._buffer_initialized_at
+
+
+class TimeChartPlot(PyDMTimePlot):
+    """
+    The PyDM time plot for TimeChart, creating ring buffer-backed curves for all the channels added to the plot.
+
+    The buffer size of the curves is kept within an optional memory budget. Any buffer size, time span, or update
+    interval change needing larger buffers than the budget allows results in the largest buffer size within the budget
+    instead, and emits memoryBudgetExceeded with the buffer sizes requested and applied.
+
+    When the curves are sampled at a fixed rate by the chart's update timer, they're all sampled at the same times. The
+    curves following the chart's buffer size and update interval then share a single ring buffer, storing their
+    timestamps once and their values as a matrix, and the chart records a sample of all of them at once.
+
+    In the capture mode, the curves queue every value they receive instead, and the chart's capture timer writes the
+    queued values into the ring buffers at every tick.
+
+    Given a CollectorClient, the chart has the collector process record the channels of the new curves, and the curves
+    read their data from the collector's ring buffers in shared memory, polled by the chart's collector timer. The
+    curves the collector process cannot record connect their channels themselves.
+    """
+    memoryBudgetExceeded = Signal(int, int)
+
+    def __init__(self, *args, **kwargs):
+        self._render_mode = ALL_POINTS_RENDERING
+        self._memory_budget = MemoryBudget()
+        self._storage_backend = MEMORY_STORAGE
+        self._cache_dir = DEFAULT_CACHE_DIR
+        self._value_precision = DOUBLE_PRECISION_VALUES
+        self._shared_buffer = SharedRingBuffer(MINIMUM_BUFFER_SIZE, self._create_shared_ring_buffer)
+        # The curves reading their data from the rows of the shared ring buffer, in the order of the rows
+        self._shared_curves = []
+        self._captures_updates = False
+        self._ingestion_worker = IngestionWorker()
+        self._collector_client = None
+        # The views of the collector's ring buffers subscribed to for the curves being added at once, by address
+        self._collector_buffers = dict()
+        # The buffer size to apply once several settings are applied, or None to apply the buffer size right away
+        self._deferred_buffer_size = None
+        super(TimeChartPlot, self).__init__(*args, **kwargs)
+        self.getViewBox().sigXRangeChanged.connect(self.handle_x_range_changed)
+        self.update_timer.timeout.connect(self._record_shared_samples)
+
+        self.capture_timer = QTimer(self)
+        self.capture_timer.setInterval(CAPTURE_FLUSH_INTERVAL_MS)
+        self.capture_timer.timeout.connect(self._flush_staged_samples)
+
+        self.collector_timer = QTimer(self)
+        self.collector_timer.setInterval(COLLECTOR_POLL_INTERVAL_MS)
+        self.collector_timer.timeout.connect(self._poll_collector_buffers)
+
+    def createCurveItem(self, *args, **kwargs):
+        address = kwargs.get("channel_address")
+        if self._collector_client is not None and address:
+            subscribed = self._collector_buffers.get(address)
+            kwargs["collector_buffer"] = (subscribed.pop(0) if subscribed else
+                                          self._collector_client.subscribe(address, self._bufferSize))
+        try:
+            curve = TimeChartCurveItem(*args, **kwargs)
+        except Exception:
+            # The view is left to be unmapped once released, as the curve may have kept arrays of its samples
+            if kwargs.get("collector_buffer") is not None:
+                self._collector_client.unsubscribe(address)
+            raise
+        if curve.collector_buffer is not None:
+            self.collector_timer.start()
+        curve.render_mode = self._render_mode
+        curve.set_storage(self._storage_backend, self._cache_dir)
+        curve.set_value_precision(self._value_precision)
+        curve.set_capture(self._captures_updates)
+        if self._captures_updates:
+            self._ingestion_worker.attach(curve)
+        curve.shared_buffer_left.connect(lambda curve=curve: self._remove_shared_curves([curve]))
+        if self._shares_buffer() and curve.collector_buffer is None:
+            # Share the chart's ring buffer right away, before the base class allocates a ring buffer for the curve
+            self._add_shared_curves([curve])
+        return curve
+
+    def addYChannel(self, *args, **kwargs):
+        # Shrink the buffers before allocating the new curve's buffer, if the new curve doesn't fit within the budget
+        self._fit_memory_budget(self._bufferSize, new_curves=1)
+        return super(TimeChartPlot, self).addYChannel(*args, **kwargs)
+
+    def addYChannels(self, channels):
+        """
+        Add several curves at once, e.g. for the curves of a config file. The buffers are fit within the memory budget,
+        the legend is laid out, and the channels are subscribed to the collector process, once for all the curves
+        instead of once per curve.
+
+        Parameters
+        ----------
+        channels : list
+            The parameters of addYChannel for each curve, as dictionaries
+
+        Returns
+        -------
+        list
+            The new curves, in the order of the parameters, or None for the curves that couldn't be added.
+        """
+        self._fit_memory_budget(self._bufferSize, new_curves=len(channels))
+
+        # The legend measures all its items whenever an item is added, unless it has a fixed size
+        legend = self.plotItem.legend
+        legend_size = None
+        if legend is not None:
+            legend_size, legend.size = legend.size, (0, 0)
+
+        if self._collector_client is not None:
+            addresses = [channel.get("y_channel") for channel in channels if channel.get("y_channel")]
+            for address, view in zip(addresses, self._collector_client.subscribe_all(addresses, self._bufferSize)):
+                self._collector_buffers.setdefault(address, []).append(view)
+
+        curves = []
+        try:
+            for channel in channels:
+                try:
+                    curves.append(super(TimeChartPlot, self).addYChannel(**channel))
+                except Exception:
+                    # Keep adding the other curves
+                    logger.exception("Cannot add a curve for '{0}'.".format(channel.get("y_channel")))
+                    curves.append(None)
+        finally:
+            if legend is not None:
+                legend.size = legend_size
+                legend.updateSize()
+            self._drop_collector_buffers()
+        return curves
+
+    def _drop_collector_buffers(self):
+        """
+        Unsubscribe from the channels subscribed to for curves that couldn't be added.
+        """
+        for address, views in self._collector_buffers.items():
+            for view in views:
+                if view is not None:
+                    view.close()
+                    self._collector_client.unsubscribe(address)
+        self._collector_buffers.clear()
+
+    def removeYChannel(self, curve):
+        self._ingestion_worker.detach(curve)
+        super(TimeChartPlot, self).removeYChannel(curve)
+        is_shared = curve.shared_row is not None
+        if curve.collector_buffer is not None:
+            self._collector_client.unsubscribe(curve.address)
+        curve.release_buffer()
+        if is_shared:
+            self._remove_shared_curves([curve])
+        if not any(other.collector_buffer is not None for other in self._curves):
+            self.collector_timer.stop()
+        # Delete the curve while the chart is alive, as collecting a removed curve together with its chart crashes
+        curve.deleteLater()
+
+    def setUpdatesAsynchronously(self, value):
+        super(TimeChartPlot, self).setUpdatesAsynchronously(value)
+        # The base class doesn't keep its updateMode property in sync, which is what new curves are given
+        self._updateMode = (self.UpdateMode.AtFixedRate if self._update_mode == PyDMTimePlot.AtFixedRate
+                            else self.UpdateMode.OnValueChange)
+        self._update_shared_buffer()
+
+    def resetUpdatesAsynchronously(self):
+        super(TimeChartPlot, self).resetUpdatesAsynchronously()
+        self._updateMode = self.UpdateMode.OnValueChange
+        self._update_shared_buffer()
+
+    def _shares_buffer(self, own_buffer_size=None, own_update_interval=None):
+        """
+        Check whether a curve shares the chart's ring buffer, i.e. if it's sampled by the chart's update timer with the
+        chart's buffer size.
+
+        Parameters
+        ----------
+        own_buffer_size : int, optional
+            The curve's own buffer size, if any
+        own_update_interval : float, optional
+            The curve's own update interval, if any
+
+        Returns
+        -------
+        bool
+            True if the curve shares the chart's ring buffer; False otherwise.
+        """
+        return (self._update_mode == PyDMTimePlot.AtFixedRate and not self._captures_updates and not own_buffer_size and
+                not own_update_interval)
+
+    def getCapturesUpdates(self):
+        """
+        Check whether the curves record every value they receive.
+
+        Returns
+        -------
+        bool
+            True if every value received is recorded; False if the values are sampled by the update mode.
+        """
+        return self._captures_updates
+
+    def setCapturesUpdates(self, enabled):
+        """
+        Record every value received by the curves, each with the time it was received, or go back to sampling the values
+        by the update mode. The values are received on the ingestion thread, and the values received between two ticks
+        of the capture timer are written into the ring buffer of each curve at once. The curves capturing every value
+        don't share the chart's ring buffer, as they're not sampled at the same times.
+
+        Parameters
+        ----------
+        enabled : bool
+            True to record every value received; False to sample the values by the update mode.
+        """
+        enabled = bool(enabled)
+        if enabled == self._captures_updates:
+            return
+
+        self._captures_updates = enabled
+        if enabled:
+            self._update_shared_buffer()
+            for curve in self._curves:
+                curve.set_capture(True)
+                self._ingestion_worker.attach(curve)
+            self._ingestion_worker.reset_statistics()
+            self.capture_timer.start()
+        else:
+            self.capture_timer.stop()
+            self._ingestion_worker.stop()
+            # Write the values still queued before the curves may join the shared ring buffer
+            for curve in self._curves:
+                curve.set_capture(False)
+            self._update_shared_buffer()
+
+    def getIngestionStatistics(self):
+        """
+        Provide the measurements of the reception of the values on the ingestion thread, and of their writing into the
+        ring buffers on the GUI thread, since the capture mode was last enabled.
+
+        Returns
+        -------
+        OrderedDict
+            The measurements, as described by IngestionWorker.statistics.
+        """
+        return self._ingestion_worker.statistics()
+
+    @Slot()
+    def _flush_staged_samples(self):
+        self._ingestion_worker.flush(self._curves)
+
+    def getCollectorClient(self):
+        """
+        Get the connection to the collector process the new curves are recorded by.
+
+        Returns
+        -------
+        CollectorClient
+            The connection to the collector process, or None if the curves connect their channels themselves.
+        """
+        return self._collector_client
+
+    def setCollectorClient(self, client):
+        """
+        Have the collector process record the channels of the curves added from now on, instead of connecting the
+        channels in this process. The curves already added keep their channels.
+
+        Parameters
+        ----------
+        client : CollectorClient
+            A connection to the collector process, or None to connect the channels of the new curves in this process.
+        """
+        self._collector_client = client
+
+    @Slot()
+    def _poll_collector_buffers(self):
+        for curve in self._curves:
+            curve.poll_collector_buffer()
+
+    def _create_shared_ring_buffer(self, capacity, rows):
+        return create_ring_buffer(capacity, self._storage_backend, self._cache_dir, name="shared",
+                                  value_precision=self._value_precision, rows=rows)
+
+    def _update_shared_buffer(self):
+        """
+        Move the curves sampled by the chart's update timer with the chart's buffer size into the shared ring buffer,
+        and the other curves out of it. The curves leaving the shared ring buffer keep their data, while the curves
+        joining it start over.
+        """
+        leaving = [curve for curve in self._shared_curves
+                   if not self._shares_buffer(curve.own_buffer_size, curve.own_update_interval)]
+        for curve in leaving:
+            curve.leave_shared_buffer()
+        self._remove_shared_curves(leaving)
+
+        joining = [curve for curve in self._curves if curve.shared_row is None and curve.collector_buffer is None and
+                   self._shares_buffer(curve.own_buffer_size, curve.own_update_interval)]
+        self._add_shared_curves(joining)
+
+    def _add_shared_curves(self, curves):
+        if not curves:
+            return
+        if not self._shared_curves:
+            self._shared_buffer.resize(self._bufferSize)
+
+        for curve, row in zip(curves, self._shared_buffer.add_rows(len(curves))):
+            curve.join_shared_buffer(row)
+        self._shared_curves.extend(curves)
+
+    def _remove_shared_curves(self, curves):
+        if not curves:
+            return
+
+        # The curves may have released their rows already, so find the rows by the order of the curves
+        self._shared_buffer.remove_rows([row for curve, row in zip(self._shared_curves, self._shared_buffer.rows)
+                                         if curve in curves])
+        self._shared_curves = [curve for curve in self._shared_curves if curve not in curves]
+        if not self._shared_curves:
+            # Free the timestamps until some curves share the ring buffer again
+            self._shared_buffer.clear()
+            self._shared_buffer.resize(MINIMUM_BUFFER_SIZE)
+
+    @Slot()
+    def _record_shared_samples(self):
+        """
+        Record the latest value of every curve sharing the chart's ring buffer, with a single timestamp.
+        """
+        if not self._shared_curves:
+            return
+
+        self._shared_buffer.append(time.time(), [curve.latest_value for curve in self._shared_curves])
+        for curve in self._shared_curves:
+            curve.handle_shared_sample()
+
+    def getSharedSamples(self):
+        """
+        Copy the samples of all the curves sharing the chart's ring buffer at once, e.g. to export or analyze them
+        together.
+
+        Returns
+        -------
+        addresses : list
+            The addresses of the curves, in the order of the value rows
+        samples : numpy.ndarray
+            A (1 + N, M) array, with the M timestamps in the first row, and the values of the N curves in the next rows.
+            The values recorded before a curve was added are NaN.
+        """
+        return [curve.address for curve in self._shared_curves], self._shared_buffer.matrix()
+
+    def getBufferSize(self):
+        if self._deferred_buffer_size is not None:
+            return self._deferred_buffer_size
+        return super(TimeChartPlot, self).getBufferSize()
+
+    def setBufferSize(self, value):
+        """
+        Set the size of the data buffer of the entire chart, within the memory budget.
+
+        Parameters
+        ----------
+        value : int
+            The new buffer size for the chart.
+        """
+        value = self._fit_memory_budget(value)
+        self._apply_buffer_size(value)
+
+    @contextmanager
+    def applying_settings(self):
+        """
+        Apply several settings at once, e.g. the settings of a config file. The buffers are only resized once, to the
+        last buffer size set, when leaving the context, instead of whenever a setting changes the buffer size, e.g. the
+        update interval, the time span, and the buffer size itself. The chart isn't repainted until then either.
+        """
+        if self._deferred_buffer_size is not None:
+            # Already applying settings
+            yield
+            return
+
+        self._deferred_buffer_size = super(TimeChartPlot, self).getBufferSize()
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            buffer_size, self._deferred_buffer_size = self._deferred_buffer_size, None
+            self._apply_buffer_size(buffer_size)
+            self.setUpdatesEnabled(True)
+            self.set_needs_redraw()
+
+    def _apply_buffer_size(self, value):
+        """
+        Reallocate the shared ring buffer to a new buffer size, before the curves discard their data.
+        """
+        if self._deferred_buffer_size is not None:
+            self._deferred_buffer_size = max(int(value), MINIMUM_BUFFER_SIZE)
+            return
+        if self._shared_curves and max(int(value), MINIMUM_BUFFER_SIZE) != self._bufferSize:
+            self._shared_buffer.resize(value)
+        super(TimeChartPlot, self).setBufferSize(value)
+
+    def _fit_memory_budget(self, buffer_size, new_curves=0):
+        """
+        Provide the largest chart buffer size within the memory budget, up to the requested size, given the memory
+        reserved by the curves having their own buffer size. If the budget would be exceeded, memoryBudgetExceeded is
+        emitted and, if the chart's buffers are larger than the budget allows, they are shrunk right away.
+
+        Only the chart's buffer size is shrunk, dropping the oldest samples. The curves having their own buffer size
+        keep it, the Curve Settings dialog refusing any size of their own not fitting within the budget instead.
+
+        Parameters
+        ----------
+        buffer_size : int
+            The requested buffer size
+        new_curves : int
+            The number of curves about to be added to the chart, following the chart's buffer size
+
+        Returns
+        -------
+        int
+            The buffer size to apply.
+        """
+        buffer_size = max(int(buffer_size), MINIMUM_BUFFER_SIZE)
+        with_lod = self._render_mode == MIN_MAX_DECIMATION_RENDERING
+        value_dtype = value_dtype_for(self._value_precision)
+        own_buffer_sizes = [curve.own_buffer_size for curve in self._curves if curve.own_buffer_size]
+        chart_curves = [curve for curve in self._curves if not curve.own_buffer_size]
+        shared_count = len([curve for curve in chart_curves if self._shares_buffer(None, curve.own_update_interval)])
+        if self._shares_buffer():
+            shared_count += new_curves
+        curve_count = len(chart_curves) + new_curves - shared_count
+        shared_allocated_rows = self._shared_buffer.allocated_rows_for(shared_count)
+        reserved_bytes = sum(estimate_curve_nbytes(size, with_lod=with_lod, value_dtype=value_dtype)
+                             for size in own_buffer_sizes)
+        max_buffer_size = self._memory_budget.max_buffer_size(curve_count, with_lod=with_lod,
+                                                              reserved_bytes=reserved_bytes, value_dtype=value_dtype,
+                                                              shared_curve_count=shared_count,
+                                                              shared_allocated_rows=shared_allocated_rows)
+        if max_buffer_size is None or buffer_size <= max_buffer_size:
+            return buffer_size
+
+        applied_size = max(max_buffer_size, MINIMUM_BUFFER_SIZE)
+        logger.warning("A buffer size of {0} for {1} curve(s) exceeds the memory budget of {2} bytes. Using a buffer "
+                       "size of {3} instead.".format(buffer_size, curve_count + shared_count,
+                                                     self._memory_budget.limit_bytes, applied_size))
+        if self.getBufferSize() > applied_size:
+            self._apply_buffer_size(applied_size)
+        self.memoryBudgetExceeded.emit(buffer_size, applied_size)
+        return applied_size
+
+    def getMemoryBudget(self):
+        """
+        Get the maximum number of bytes for the buffers of all the curves.
+
+        Returns
+        -------
+        limit_bytes : int
+            The memory budget, or 0 if there is no limit.
+        """
+        return self._memory_budget.limit_bytes
+
+    def setMemoryBudget(self, limit_bytes):
+        """
+        Set the maximum number of bytes for the buffers of all the curves, shrinking the buffers if they exceed it.
+        The oldest data is discarded first.
+
+        Parameters
+        ----------
+        limit_bytes : int
+            The memory budget, or 0 for no limit.
+        """
+        self._memory_budget.limit_bytes = limit_bytes
+        self._fit_memory_budget(self.getBufferSize())
+
+    def getMemoryUsage(self):
+        """
+        Get the number of bytes allocated for the buffers of each curve.
+
+        Returns
+        -------
+        usage : OrderedDict
+            The number of bytes, keyed by the curves' addresses.
+        """
+        return OrderedDict((curve.address, curve.memory_usage()) for curve in self._curves)
+
+    def estimateMemoryUsage(self, buffer_size=None, own_buffer_sizes=None):
+        """
+        Estimate the number of bytes the curve buffers would take, without allocating anything.
+
+        Parameters
+        ----------
+        buffer_size : int, optional
+            The chart's buffer size, applying to the curves having no buffer size of their own. The current buffer size
+            by default.
+        own_buffer_sizes : dict, optional
+            The buffer sizes of some curves, keyed by the curves, overriding their current own buffer sizes. A None
+            buffer size makes a curve follow the chart's buffer size.
+
+        Returns
+        -------
+        int
+            The estimated number of bytes for all the curve buffers.
+        """
+        buffer_size = self.getBufferSize() if buffer_size is None else buffer_size
+        own_buffer_sizes = own_buffer_sizes or dict()
+        with_lod = self._render_mode == MIN_MAX_DECIMATION_RENDERING
+        value_dtype = value_dtype_for(self._value_precision)
+
+        nbytes = 0
+        shared_count = 0
+        for curve in self._curves:
+            size = own_buffer_sizes[curve] if curve in own_buffer_sizes else curve.own_buffer_size
+            if self._shares_buffer(size, curve.own_update_interval):
+                shared_count += 1
+                continue
+            nbytes += estimate_curve_nbytes(max(int(size or buffer_size), MINIMUM_BUFFER_SIZE), with_lod=with_lod,
+                                            value_dtype=value_dtype)
+        nbytes += estimate_shared_nbytes(max(int(buffer_size), MINIMUM_BUFFER_SIZE), shared_count, with_lod=with_lod,
+                                         value_dtype=value_dtype,
+                                         allocated_rows=self._shared_buffer.allocated_rows_for(shared_count))
+        return nbytes
+
+    def setCurveBufferSize(self, curve, buffer_size):
+        """
+        Give a curve its own buffer size, instead of the chart's buffer size. The chart's buffer size is reduced if the
+        curves following it no longer fit within the memory budget.
+
+        Parameters
+        ----------
+        curve : TimeChartCurveItem
+            The curve to set the buffer size for
+        buffer_size : int
+            The curve's own buffer size, or None to follow the chart's buffer size.
+        """
+        curve.set_own_buffer_size(buffer_size)
+        self._update_shared_buffer()
+        self._fit_memory_budget(self.getBufferSize())
+
+    def setCurveUpdateInterval(self, curve, interval):
+        """
+        Give a curve its own update interval for the asynchronous mode, instead of the chart's update interval.
+
+        Parameters
+        ----------
+        curve : TimeChartCurveItem
+            The curve to set the update interval for
+        interval : float
+            The curve's own update interval, in seconds, or None to follow the chart's update interval.
+        """
+        curve.set_own_update_interval(interval)
+        self._update_shared_buffer()
+
+    def getStorageBackend(self):
+        """
+        Get where the curves' ring buffers are kept.
+
+        Returns
+        -------
+        backend : int
+            Either MEMORY_STORAGE or MEMMAP_STORAGE.
+        """
+        return self._storage_backend
+
+    def getCacheDirectory(self):
+        """
+        Get the directory the memory-mapped ring buffer files are created in.
+
+        Returns
+        -------
+        cache_dir : str
+            The path to the cache directory
+        """
+        return self._cache_dir
+
+    def setStorageBackend(self, backend, cache_dir=None):
+        """
+        Set where the ring buffers are kept, for all the current and future curves. The data already buffered is moved
+        to the new storage.
+
+        Parameters
+        ----------
+        backend : int
+            MEMORY_STORAGE to keep the ring buffers in memory, or MEMMAP_STORAGE to keep each ring buffer in a
+            memory-mapped file, letting the operating system keep only the recently used data in memory.
+        cache_dir : str, optional
+            The directory to create the memory-mapped files in. The current directory is kept if not provided.
+        """
+        self._storage_backend = backend
+        self._cache_dir = cache_dir or self._cache_dir
+        self._shared_buffer.reallocate(self._create_shared_ring_buffer)
+        for curve in self._curves:
+            curve.set_storage(backend, self._cache_dir)
+
+    def getValuePrecision(self):
+        """
+        Get the precision the curves' values are stored with.
+
+        Returns
+        -------
+        precision : int
+            Either DOUBLE_PRECISION_VALUES or SINGLE_PRECISION_VALUES.
+        """
+        return self._value_precision
+
+    def setValuePrecision(self, precision):
+        """
+        Set the precision the values are stored with, for all the current and future curves. The data already buffered
+        is converted to the new precision. As switching to double precision doubles the memory taken by the values, the
+        buffers are first shrunk if they would exceed the memory budget.
+
+        Parameters
+        ----------
+        precision : int
+            DOUBLE_PRECISION_VALUES to store the values as float64, or SINGLE_PRECISION_VALUES to store them as float32,
+            which is enough for e.g. the readbacks of 16-bit ADCs.
+        """
+        self._value_precision = precision
+        self._fit_memory_budget(self.getBufferSize())
+        self._shared_buffer.reallocate(self._create_shared_ring_buffer)
+        for curve in self._curves:
+            curve.set_value_precision(precision)
+
+    def getRenderMode(self):
+        """
+        Get how the curves' data is rendered.
+
+        Returns
+        -------
+        mode : int
+            Either ALL_POINTS_RENDERING or MIN_MAX_DECIMATION_RENDERING.
+        """
+        return self._render_mode
+
+    def setRenderMode(self, mode):
+        """
+        Set how the curves' data is rendered, for all the current and future curves.
+
+        Parameters
+        ----------
+        mode : int
+            ALL_POINTS_RENDERING to hand every buffered data point to pyqtgraph, or MIN_MAX_DECIMATION_RENDERING to
+            only hand the min and max values of each pixel column within the displayed time range.
+        """
+        self._render_mode = mode
+        self._fit_memory_budget(self.getBufferSize())
+        for curve in self._curves:
+            curve.render_mode = mode
+        self.set_needs_redraw()
+
+    def handle_x_range_changed(self, _, x_range):
+        """
+        Re-render the curves when the displayed time range changes, since decimated curves only hold the data for the
+        previously displayed range. If plotting is paused, the curves are re-rendered right away, at the time they were
+        last redrawn.
+        """
+        if self._render_mode != MIN_MAX_DECIMATION_RENDERING:
+            return
+
+        self.set_needs_redraw()
+        if not self.redraw_timer.isActive():
+            for curve in self._curves:
+                curve.redrawCurve(min_x=x_range[0], max_x=x_range[1], redraw_time=curve._redraw_time)
@@ -0,0 +1,68 @@
+import os
+import sys
+import signal
+import argparse
+import logging
+
+from qtpy import QtCore, QtWidgets
+
+import timechart
+from timechart.collector.server import CollectorServer
+
+
+def main():
+    args, extra_args = _parse_arguments()
+
+    logging.basicConfig(level=args.log_level, format="[%(asctime)s] [%(levelname)-8s] - %(message)s")
+    logger = logging.getLogger('')
+
+    # The collector has no window, so it doesn't need a display
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtWidgets.QApplication(sys.argv[:1] + extra_args)
+
+    server = CollectorServer()
+    if not server.listen():
+        sys.exit(1)
+    app.aboutToQuit.connect(server.close)
+    logger.info("TimeChart collector {0} running. Press Ctrl+C to stop.".format(timechart.__version__))
+
+    # Let Python handle the signals between the Qt events, so that the shared memory is removed on exit
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    signal.signal(signal.SIGTERM, lambda *_: app.quit())
+    timer = QtCore.QTimer()
+    timer.timeout.connect(lambda: None)
+    timer.start(200)
+
+    sys.exit(app.exec_())
+
+
+def _parse_arguments():
+    """
+    Parse the command arguments.
+
+    Returns
+    -------
+    The command arguments as a dictionary : dict
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Record the PVs plotted by all the TimeChart windows of the current user, connecting each PV once "
+                    "and keeping its data in shared memory.")
+
+    parser.add_argument(
+        '--log_level',
+        help='Configure level of log display',
+        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+        default='INFO'
+    )
+
+    parser.add_argument('--version', action='version',
+                        version='TimeChart {version}'.format(
+                            version=timechart.__version__))
+
+    args, extra_args = parser.parse_known_args()
+    return args, extra_args
+
+
+if __name__ == "__main__":
+    main()
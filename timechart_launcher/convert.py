@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import timechart
+from timechart.data_io.settings_importer import SettingsImporter
+
+
+logger = logging.getLogger('')
+
+
+def main():
+    args = _parse_arguments()
+
+    logging.basicConfig(level=args.log_level, format="[%(asctime)s] [%(levelname)-8s] - %(message)s")
+
+    conversions = list(find_conversions(args.paths, args.output_dir))
+    if not conversions:
+        logger.error("No StripTool config file found.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    results = convert_files(conversions, args.jobs)
+
+    failed = 0
+    for stp_filename, json_filename, elapsed, error in results:
+        if error:
+            failed += 1
+            print("FAILED     {0}: {1}".format(stp_filename, error))
+        else:
+            print("{0:7.1f} ms {1} -> {2}".format(elapsed * 1000, stp_filename, json_filename))
+
+    print("Converted {0} of {1} files in {2:.2f} s, {3} failed.".format(
+        len(results) - failed, len(results), time.perf_counter() - start, failed))
+    sys.exit(1 if failed else 0)
+
+
+def find_conversions(paths, output_dir=None):
+    """
+    Find the StripTool config files to convert, and the TimeChart config files to write them to.
+
+    Parameters
+    ----------
+    paths : list
+        The StripTool config files, or the directories to search for StripTool config files, recursively.
+    output_dir : str
+        The directory to write the TimeChart config files to, keeping the layout of the directories searched. If None,
+        each TimeChart config file is written next to its StripTool config file.
+
+    Yields
+    ------
+        The path of each StripTool config file, and the path of the TimeChart config file to write it to.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for dir_path, dir_names, filenames in os.walk(path):
+                dir_names.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith(".stp"):
+                        stp_filename = os.path.join(dir_path, filename)
+                        yield stp_filename, _json_filename(stp_filename, os.path.relpath(stp_filename, path),
+                                                           output_dir)
+        else:
+            yield path, _json_filename(path, os.path.basename(path), output_dir)
+
+
+def _json_filename(stp_filename, relative_filename, output_dir):
+    json_filename = os.path.splitext(stp_filename if output_dir is None else
+                                     os.path.join(output_dir, relative_filename))[0]
+    return json_filename + ".json"
+
+
+def convert_files(conversions, jobs=None):
+    """
+    Convert StripTool config files into TimeChart config files, using a pool of processes.
+
+    Parameters
+    ----------
+    conversions : list
+        The path of each StripTool config file, and the path of the TimeChart config file to write it to.
+    jobs : int
+        The number of processes to convert the files with. If None, use as many processes as there are CPUs. If 1,
+        convert the files in this process.
+
+    Returns
+    -------
+        The StripTool file, the TimeChart file, the time taken in seconds, and the error message or None, for each
+        conversion, in order : list
+    """
+    stp_filenames, json_filenames = zip(*conversions)
+    if jobs == 1:
+        return list(map(convert_file, stp_filenames, json_filenames))
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(convert_file, stp_filenames, json_filenames, chunksize=8))
+
+
+def convert_file(stp_filename, json_filename):
+    """
+    Convert a StripTool config file into a TimeChart config file.
+
+    Parameters
+    ----------
+    stp_filename : str
+        The path to the StripTool config file.
+    json_filename : str
+        The path to the TimeChart config file to write.
+
+    Returns
+    -------
+        The StripTool file, the TimeChart file, the time taken in seconds, and the error message or None : tuple
+    """
+    start = time.perf_counter()
+    try:
+        json_dir = os.path.dirname(json_filename)
+        if json_dir:
+            os.makedirs(json_dir, exist_ok=True)
+        with open(stp_filename, 'r') as stp_file:
+            SettingsImporter().convert_stp_file(stp_file, json_filename)
+        error = None
+    except Exception as exception:
+        error = "{0}: {1}".format(type(exception).__name__, exception)
+    return stp_filename, json_filename, time.perf_counter() - start, error
+
+
+def _parse_arguments():
+    """
+    Parse the command arguments.
+
+    Returns
+    -------
+    The command arguments as a dictionary : dict
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Convert StripTool config files (.stp) into TimeChart config files (.json).")
+
+    parser.add_argument(
+        'paths',
+        nargs='+',
+        help='StripTool config files, or directories to search for StripTool config files recursively'
+    )
+
+    parser.add_argument(
+        '--output-dir',
+        help='Directory to write the TimeChart config files to, keeping the layout of the directories searched. By '
+             'default, each TimeChart config file is written next to its StripTool config file'
+    )
+
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        help='Number of processes to convert the files with. Defaults to the number of CPUs'
+    )
+
+    parser.add_argument(
+        '--log_level',
+        help='Configure level of log display',
+        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+        default='WARNING'
+    )
+
+    parser.add_argument('--version', action='version',
+                        version='TimeChart {version}'.format(
+                            version=timechart.__version__))
+
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ except ImportError:
     import errno
 
 import sys
+import time
 import traceback
 import argparse
 import logging
@@ -13,17 +14,87 @@ import logging
 import warnings
 warnings.filterwarnings("ignore")
 
-from pydm.application import PyDMApplication
-
-from qtpy import QtGui, QtCore
-
 import timechart
-from timechart.displays.main_display import TimeChartDisplay
+from timechart.utilities.prewarm import PrewarmServer, request_prewarmed_process
+from timechart.utilities.startup_profile import StartupProfiler, call_after_first_paint, startup_phase
 
 
 def main():
     args, extra_args = _parse_arguments()
 
+    if args.prewarm:
+        _setup_logging(args)
+        sys.exit(_serve_prewarmed())
+
+    # Let the prewarmed process start TimeChart, with all the modules imported already
+    if not args.no_prewarm and request_prewarmed_process(sys.argv[1:]) is not None:
+        return
+
+    _setup_logging(args)
+    sys.exit(_run(args))
+
+
+def _import_display_modules():
+    """
+    Import the modules needed to show the display, which takes most of the startup time. They're imported when TimeChart
+    starts, or ahead of time by the prewarmed process.
+    """
+    import pydm.application  # noqa: F401
+    import timechart.displays.main_display  # noqa: F401
+    import timechart.utilities.single_instance  # noqa: F401
+
+
+def _serve_prewarmed():
+    """
+    Import the modules of TimeChart, and fork a new TimeChart process whenever one is requested, until interrupted.
+
+    Returns
+    -------
+    The exit code : int
+    """
+    started_at = time.time()
+    _import_display_modules()
+    server = PrewarmServer(_run_forked)
+    if not server.listen():
+        return 1
+
+    logging.info("TimeChart modules imported in {0:.2f} s. Listening for TimeChart process requests at '{1}'. "
+                 "Press Ctrl+C to stop.".format(time.time() - started_at, server.path))
+    server.serve_forever()
+    return 0
+
+
+def _run_forked(argv, requested_at):
+    """
+    Run TimeChart in a process forked by the prewarmed process.
+
+    Parameters
+    ----------
+    argv : list
+        The command arguments, without the program name
+    requested_at : float
+        The time the process was requested
+
+    Returns
+    -------
+    The exit code : int
+    """
+    sys.argv = sys.argv[:1] + argv
+    args, extra_args = _parse_arguments(argv)
+
+    # Log into the directory of the requester, instead of the prewarmed process's
+    logger = logging.getLogger('')
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    _setup_logging(args)
+
+    return _run(args, requested_at=requested_at)
+
+
+def _setup_logging(args):
+    """
+    Log into the logs directory, and to the console.
+    """
     try:
         os.makedirs("logs")
     except os.error as err:
@@ -44,11 +115,42 @@ def main():
         logger.setLevel(args.log_level)
         console_handler.setLevel(args.log_level)
 
+
+def _run(args, requested_at=None):
+    """
+    Show the TimeChart display, and run the application until the display is closed.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command arguments
+    requested_at : float, optional
+        The time the process was requested from the prewarmed process, if it was
+
+    Returns
+    -------
+    The exit code : int
+    """
+    profiler = None
+    if args.profile_startup:
+        profiler = StartupProfiler()
+        profiler.activate()
+        profiler.start_timing_imports()
+
+    with startup_phase("module imports"):
+        from pydm.application import PyDMApplication
+        from qtpy import QtGui, QtCore
+        from timechart.displays.main_display import TimeChartDisplay
+        from timechart.utilities.single_instance import InstanceServer
+    if profiler:
+        profiler.stop_timing_imports()
+
     base_path = os.path.dirname(os.path.realpath(__file__))
     icon_path_mask = os.path.join(base_path, "icons", "charts_{}.png")
 
-    app = PyDMApplication(hide_nav_bar=True, hide_menu_bar=True,
-                          hide_status_bar=True, use_main_window=False)
+    with startup_phase("PyDMApplication construction"):
+        app = PyDMApplication(hide_nav_bar=True, hide_menu_bar=True,
+                              hide_status_bar=True, use_main_window=False)
 
     app_icon = QtGui.QIcon()
     app_icon.addFile(icon_path_mask.format(16), QtCore.QSize(16, 16))
@@ -64,19 +166,73 @@ def main():
     if args.config_file:
         config_file = os.path.expandvars(os.path.expanduser(args.config_file))
 
-    display = TimeChartDisplay(config_file=config_file)
-    if args.pvs:    
-        for pv in args.pvs:    
-            display.add_curve(pv)
+    with startup_phase("TimeChartDisplay.__init__"):
+        display = TimeChartDisplay(config_file=config_file, use_collector=not args.no_collector,
+                                   use_config_cache=not args.no_config_cache)
+    if args.pvs:
+        # The curves are added a batch at a time once the display is shown
+        display.load_curves(args.pvs)
+    if args.watch_config:
+        display.watch_config_file(config_file)
+
+    if profiler:
+        _profile_until_loaded(profiler, display, args.profile_startup)
     display.show()
 
-    sys.exit(app.exec_())
+    # Let the PyDM external tool hand its PVs to this window, unless another TimeChart window is listening already
+    instance_server = InstanceServer(parent=display)
+    if instance_server.listen():
+        instance_server.pvsReceived.connect(display.add_curves)
+
+    if requested_at:
+        QtCore.QTimer.singleShot(0, lambda: logging.info("TimeChart shown {0:.2f} s after being requested."
+                                                         .format(time.time() - requested_at)))
+    return app.exec_()
+
 
+def _profile_until_loaded(profiler, display, path):
+    """
+    Keep profiling the startup until the display is painted for the first time, and all the curves queued at startup,
+    from --pvs or the config file, are added. Then write the report.
+    """
+    phases = {"first paint": profiler.start_phase("first paint")}
+    if display.curve_loader.is_loading:
+        phases["add_curve for --pvs and the config"] = profiler.start_phase("add_curve for --pvs and the config")
+
+    def end_phase(name):
+        if name not in phases:
+            return
+        phases.pop(name)()
+        if not phases:
+            _write_startup_profile(profiler, path)
+
+    call_after_first_paint(display, lambda: end_phase("first paint"))
+    display.curve_loader.finished.connect(lambda: end_phase("add_curve for --pvs and the config"))
+
+
+def _write_startup_profile(profiler, path):
+    """
+    End the profiling of the startup, and write the report.
+    """
+    profiler.deactivate()
+    try:
+        report_path, tree_path = profiler.write(path)
+    except OSError as error:
+        logging.error("Cannot write the startup profile to '{0}': {1}".format(path, error))
+        return
+    logging.info("TimeChart started in {0:.2f} s. Startup profile written to '{1}', and import tree to '{2}'."
+                 .format(profiler.report()["total_s"], report_path, tree_path))
 
-def _parse_arguments():
+
+def _parse_arguments(argv=None):
     """
     Parse the command arguments.
 
+    Parameters
+    ----------
+    argv : list, optional
+        The command arguments, without the program name. The arguments of the current process by default.
+
     Returns
     -------
     The command arguments as a dictionary : dict
@@ -99,8 +255,31 @@ def _parse_arguments():
                             version=timechart.__version__))
 
     parser.add_argument("--pvs", help="Launch TimeChart with PVs loaded from the command line.", nargs='*')
+    parser.add_argument("--watch-config", action="store_true",
+                        help="Apply the config file again whenever it changes, only adding, removing, or restyling "
+                             "the curves that changed.")
+    parser.add_argument("--no-config-cache", action="store_true",
+                        help="Always parse the config file, instead of reading it from the cache of the config files "
+                             "parsed before.")
+
+    parser.add_argument("--no-collector", action="store_true",
+                        help="Connect the PVs in this process even if the collector process (timechart-collector) "
+                             "is running.")
+
+    parser.add_argument("--profile-startup", nargs='?', const="timechart_startup.json", metavar="REPORT_FILE",
+                        help="Record the wall time of each startup phase until the first paint, and of each module "
+                             "imported, into a JSON report (timechart_startup.json by default), and an import tree "
+                             "like the one of python -X importtime next to it.")
+
+    parser.add_argument("--prewarm", action="store_true",
+                        help="Keep a process with the TimeChart modules imported, starting each TimeChart requested "
+                             "afterwards, e.g. from the command line or PyDM, in a fraction of the usual time.")
+    parser.add_argument("--no-prewarm", action="store_true",
+                        help="Start TimeChart in this process even if a prewarmed process is running.")
 
-    args, extra_args = parser.parse_known_args()
+    args, extra_args = parser.parse_known_args(argv)
+    if args.watch_config and not args.config_file:
+        parser.error("--watch-config requires --config-file")
     return args, extra_args
 
 